@@ -1,11 +1,10 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-import json
-from typing import Dict, List
+import gzip
+from asyncio import gather, Semaphore
+from typing import Awaitable, Dict, List, Union
 
-from jsonpickle import encode
-from jsonpickle.unpickler import Unpickler
 from azure.core import MatchConditions
 from azure.core.exceptions import (
     HttpResponseError,
@@ -17,7 +16,12 @@ from azure.storage.blob.aio import (
     BlobClient,
     StorageStreamDownloader,
 )
-from botbuilder.core import Storage
+from botbuilder.core import (
+    JsonPickleStoreItemSerializer,
+    Storage,
+    StoreItemSerializer,
+    get_store_item_serializer,
+)
 
 
 class BlobStorageSettings:
@@ -32,6 +36,14 @@ class BlobStorageSettings:
     :param connection_string: Connection string of the Blob Storage account.
         Required if not using account_name and account_key.
     :type connection_string: str
+    :param max_concurrency: Maximum number of blobs read, written or deleted at once by a multi-key operation.
+    :type max_concurrency: int
+    :param compression: Optional codec used to compress new blobs. Supported values: "gzip".
+        The codec is recorded in the blob metadata, so blobs are read correctly regardless of this setting.
+    :type compression: str
+    :param serializer: The serializer, or serializer name, used to write blobs. Defaults to jsonpickle.
+        The serializer is recorded in the blob metadata, so blobs are always read with the serializer that wrote them.
+    :type serializer: Union[str, :class:`botbuilder.core.StoreItemSerializer`]
     """
 
     def __init__(
@@ -40,11 +52,28 @@ class BlobStorageSettings:
         account_name: str = "",
         account_key: str = "",
         connection_string: str = "",
+        max_concurrency: int = 8,
+        compression: str = None,
+        serializer: Union[str, StoreItemSerializer] = None,
     ):
         self.container_name = container_name
         self.account_name = account_name
         self.account_key = account_key
         self.connection_string = connection_string
+        self.max_concurrency = max_concurrency
+        self.compression = compression
+        self.serializer = serializer
+
+
+# Name of the blob metadata entry that records the codec used to compress a blob.
+COMPRESSION_METADATA_KEY = "compression"
+
+# Name of the blob metadata entry that records the serializer used to write a blob.
+SERIALIZER_METADATA_KEY = "serializer"
+
+COMPRESSION_CODECS = {
+    "gzip": (gzip.compress, gzip.decompress),
+}
 
 
 # New Azure Blob SDK only allows connection strings, but our SDK allows key+name.
@@ -69,6 +98,8 @@ class BlobStorage(Storage):
     If an entity is an StoreItem, the storage object will set the entity's e_tag
     property value to the blob's e_tag upon read. Afterward, an match_condition with the ETag value
     will be generated during Write. New entities start with a null e_tag.
+    Multi-key operations run concurrently, up to settings.max_concurrency blobs at a time.
+    If settings.compression is set, new blobs are compressed and the codec is stored in the blob metadata.
 
     :param settings: Settings used to instantiate the Blob service.
     :type settings: :class:`botbuilder.azure.BlobStorageSettings`
@@ -77,6 +108,13 @@ class BlobStorage(Storage):
     def __init__(self, settings: BlobStorageSettings):
         if not settings.container_name:
             raise Exception("Container name is required.")
+        if settings.max_concurrency is not None and settings.max_concurrency < 1:
+            raise Exception("max_concurrency must be at least 1.")
+        if settings.compression and settings.compression not in COMPRESSION_CODECS:
+            raise Exception(
+                f"Unsupported compression: {settings.compression}. "
+                f"Supported values: {', '.join(COMPRESSION_CODECS)}."
+            )
 
         if settings.connection_string:
             blob_service_client = BlobServiceClient.from_connection_string(
@@ -91,6 +129,10 @@ class BlobStorage(Storage):
             settings.container_name
         )
 
+        self.__max_concurrency = settings.max_concurrency or 1
+        self.__compression = settings.compression
+        self.__serializer = get_store_item_serializer(settings.serializer)
+
         self.__initialized = False
 
     async def _initialize(self):
@@ -116,25 +158,17 @@ class BlobStorage(Storage):
 
         await self._initialize()
 
-        items = {}
+        results = await self._gather_bounded([self._read_key(key) for key in keys])
 
-        for key in keys:
-            blob_client = self.__container_client.get_blob_client(key)
-
-            try:
-                items[key] = await self._inner_read_blob(blob_client)
-            except HttpResponseError as err:
-                if err.status_code == 404:
-                    continue
-
-        return items
+        return {key: item for key, item in zip(keys, results) if item is not None}
 
     async def write(self, changes: Dict[str, object]):
         """Stores a new entity in the configured blob container.
 
         :param changes: The changes to write to storage.
         :type changes: Dict[str, object]
-        :return:
+        :return: The new e_tag of each written item.
+        :rtype: Dict[str, str]
         """
         if changes is None:
             raise Exception("Changes are required when writing")
@@ -143,26 +177,10 @@ class BlobStorage(Storage):
 
         await self._initialize()
 
-        for name, item in changes.items():
-            blob_reference = self.__container_client.get_blob_client(name)
-
-            e_tag = None
-            if isinstance(item, dict):
-                e_tag = item.get("e_tag", None)
-            elif hasattr(item, "e_tag"):
-                e_tag = item.e_tag
-            e_tag = None if e_tag == "*" else e_tag
-            if e_tag == "":
-                raise Exception("blob_storage.write(): etag missing")
-
-            item_str = self._store_item_to_str(item)
-
-            if e_tag:
-                await blob_reference.upload_blob(
-                    item_str, match_condition=MatchConditions.IfNotModified, etag=e_tag
-                )
-            else:
-                await blob_reference.upload_blob(item_str, overwrite=True)
+        new_e_tags = await self._gather_bounded(
+            [self._write_item(name, item) for name, item in changes.items()]
+        )
+        return dict(zip(changes, new_e_tags))
 
     async def delete(self, keys: List[str]):
         """Deletes entity blobs from the configured container.
@@ -175,25 +193,98 @@ class BlobStorage(Storage):
 
         await self._initialize()
 
-        for key in keys:
-            blob_client = self.__container_client.get_blob_client(key)
-            try:
-                await blob_client.delete_blob()
-            # We can't delete what's already gone.
-            except ResourceNotFoundError:
-                pass
+        await self._gather_bounded([self._delete_key(key) for key in keys])
+
+    async def _gather_bounded(self, operations: List[Awaitable]) -> List[object]:
+        semaphore = Semaphore(self.__max_concurrency)
+
+        async def run(operation: Awaitable) -> object:
+            async with semaphore:
+                return await operation
+
+        return await gather(*[run(operation) for operation in operations])
+
+    async def _read_key(self, key: str) -> object:
+        blob_client = self.__container_client.get_blob_client(key)
+
+        try:
+            return await self._inner_read_blob(blob_client)
+        except HttpResponseError:
+            return None
+
+    async def _write_item(self, name: str, item: object) -> str:
+        blob_reference = self.__container_client.get_blob_client(name)
+
+        e_tag = None
+        if isinstance(item, dict):
+            e_tag = item.get("e_tag", None)
+        elif hasattr(item, "e_tag"):
+            e_tag = item.e_tag
+        e_tag = None if e_tag == "*" else e_tag
+        if e_tag == "":
+            raise Exception("blob_storage.write(): etag missing")
+
+        data = self.__serializer.serialize(item)
+        metadata = {SERIALIZER_METADATA_KEY: self.__serializer.name}
+        if self.__compression:
+            compress, _ = COMPRESSION_CODECS[self.__compression]
+            data = compress(data)
+            metadata[COMPRESSION_METADATA_KEY] = self.__compression
+
+        if e_tag:
+            result = await blob_reference.upload_blob(
+                data,
+                match_condition=MatchConditions.IfNotModified,
+                etag=e_tag,
+                metadata=metadata,
+            )
+        else:
+            result = await blob_reference.upload_blob(
+                data, overwrite=True, metadata=metadata
+            )
+
+        new_e_tag = (result or {}).get("etag")
+        return new_e_tag.replace('"', "") if new_e_tag else None
 
-    def _store_item_to_str(self, item: object) -> str:
-        return encode(item)
+    async def _delete_key(self, key: str):
+        blob_client = self.__container_client.get_blob_client(key)
+        try:
+            await blob_client.delete_blob()
+        # We can't delete what's already gone.
+        except ResourceNotFoundError:
+            pass
 
     async def _inner_read_blob(self, blob_client: BlobClient):
         blob = await blob_client.download_blob()
 
         return await self._blob_to_store_item(blob)
 
-    @staticmethod
-    async def _blob_to_store_item(blob: StorageStreamDownloader) -> object:
-        item = json.loads(await blob.content_as_text())
-        item["e_tag"] = blob.properties.etag.replace('"', "")
-        result = Unpickler().restore(item)
+    async def _blob_to_store_item(self, blob: StorageStreamDownloader) -> object:
+        content = await blob.readall()
+        metadata = blob.properties.metadata or {}
+        codec = metadata.get(COMPRESSION_METADATA_KEY)
+        if codec:
+            if codec not in COMPRESSION_CODECS:
+                raise Exception(
+                    f"Blob is compressed with an unsupported codec: {codec}"
+                )
+            _, decompress = COMPRESSION_CODECS[codec]
+            content = decompress(content)
+
+        # blobs written before serializers were recorded are jsonpickle blobs
+        serializer_name = metadata.get(
+            SERIALIZER_METADATA_KEY, JsonPickleStoreItemSerializer.name
+        )
+        serializer = (
+            self.__serializer
+            if serializer_name == self.__serializer.name
+            else get_store_item_serializer(serializer_name)
+        )
+        result = serializer.deserialize(content)
+
+        e_tag = blob.properties.etag.replace('"', "")
+        if isinstance(result, dict):
+            result["e_tag"] = e_tag
+        else:
+            result.e_tag = e_tag
         return result
@@ -3,17 +3,23 @@
 
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
-from typing import Dict, List
-from threading import Lock
+from asyncio import gather, Lock
+from typing import Dict, List, Tuple, Union
 import json
 from hashlib import sha256
 from azure.core import MatchConditions
 from azure.cosmos import documents, http_constants
-from jsonpickle.pickler import Pickler
-from jsonpickle.unpickler import Unpickler
-import azure.cosmos.cosmos_client as cosmos_client  # pylint: disable=no-name-in-module,import-error
+import azure.cosmos.aio as cosmos_client  # pylint: disable=no-name-in-module,import-error
 import azure.cosmos.exceptions as cosmos_exceptions
-from botbuilder.core.storage import Storage
+from botbuilder.core.storage import Storage, StoreItemDelta
+from botbuilder.core.store_item_serializer import (
+    JsonPickleStoreItemSerializer,
+    StoreItemSerializer,
+    get_store_item_serializer,
+)
+
+# Cosmos DB accepts at most this many operations in a single patch.
+MAX_PATCH_OPERATIONS = 10
 
 
 class CosmosDbPartitionedConfig:
@@ -29,6 +35,7 @@ class CosmosDbPartitionedConfig:
         container_throughput: int = 400,
         key_suffix: str = "",
         compatibility_mode: bool = False,
+        serializer: Union[str, StoreItemSerializer] = None,
         **kwargs,
     ):
         """Create the Config object.
@@ -44,6 +51,8 @@ class CosmosDbPartitionedConfig:
             key characters. (e.g. not: '\\', '?', '/', '#', '*')
         :param compatibility_mode: True if keys should be truncated in order to support previous CosmosDb
             max key length of 255.
+        :param serializer: The serializer, or serializer name, used to convert store items to documents.
+            Defaults to jsonpickle. Documents are always read with the serializer that wrote them.
         :return CosmosDbPartitionedConfig:
         """
         self.__config_file = kwargs.get("filename")
@@ -61,6 +70,7 @@ class CosmosDbPartitionedConfig:
         )
         self.key_suffix = key_suffix or kwargs.get("key_suffix")
         self.compatibility_mode = compatibility_mode or kwargs.get("compatibility_mode")
+        self.serializer = serializer or kwargs.get("serializer")
 
 
 class CosmosDbKeyEscape:
@@ -107,7 +117,11 @@ class CosmosDbKeyEscape:
 
 
 class CosmosDbPartitionedStorage(Storage):
-    """A CosmosDB based storage provider using partitioning for a bot."""
+    """A CosmosDB based storage provider using partitioning for a bot.
+
+    All operations use the async Cosmos client, so a Cosmos round trip never blocks the event loop.
+    Multi-key reads, writes and deletes are issued concurrently.
+    """
 
     def __init__(self, config: CosmosDbPartitionedConfig):
         """Create the storage object.
@@ -120,8 +134,14 @@ class CosmosDbPartitionedStorage(Storage):
         self.database = None
         self.container = None
         self.compatability_mode_partition_key = False
+        self.serializer = get_store_item_serializer(config.serializer)
+        if not self.serializer.json_documents:
+            raise Exception(
+                f"The {self.serializer.name} serializer can't be used with Cosmos DB, which stores "
+                "JSON documents. Use the json or jsonpickle serializer."
+            )
         # Lock used for synchronizing container creation
-        self.__lock = Lock()
+        self.__lock = None
         if config.key_suffix is None:
             config.key_suffix = ""
         if not config.key_suffix.__eq__(""):
@@ -147,36 +167,36 @@ class CosmosDbPartitionedStorage(Storage):
 
         await self.initialize()
 
-        store_items = {}
-
-        for key in keys:
-            try:
-                escaped_key = CosmosDbKeyEscape.sanitize_key(
+        escaped_keys = list(
+            dict.fromkeys(
+                CosmosDbKeyEscape.sanitize_key(
                     key, self.config.key_suffix, self.config.compatibility_mode
                 )
+                for key in keys
+            )
+        )
 
-                read_item_response = self.container.read_item(
-                    escaped_key, self.__get_partition_key(escaped_key)
+        if self.compatability_mode_partition_key and len(escaped_keys) > 1:
+            # All items share one partition, so a single query replaces the point reads.
+            documents_read = await self.__query_items(escaped_keys)
+        else:
+            documents_read = await gather(
+                *[self.__read_item(escaped_key) for escaped_key in escaped_keys]
+            )
+
+        store_items = {}
+        for document_store_item in documents_read:
+            if document_store_item:
+                store_items[document_store_item["realId"]] = self.__create_si(
+                    document_store_item
                 )
-                document_store_item = read_item_response
-                if document_store_item:
-                    store_items[document_store_item["realId"]] = self.__create_si(
-                        document_store_item
-                    )
-            # When an item is not found a CosmosException is thrown, but we want to
-            # return an empty collection so in this instance we catch and do not rethrow.
-            # Throw for any other exception.
-            except cosmos_exceptions.CosmosResourceNotFoundError:
-                continue
-            except Exception as err:
-                raise err
         return store_items
 
     async def write(self, changes: Dict[str, object]):
         """Save storeitems to storage.
 
         :param changes:
-        :return:
+        :return dict: The new e_tag of each written item.
         """
         if changes is None:
             raise Exception("Changes are required when writing")
@@ -185,34 +205,55 @@ class CosmosDbPartitionedStorage(Storage):
 
         await self.initialize()
 
-        for key, change in changes.items():
-            e_tag = None
-            if isinstance(change, dict):
-                e_tag = change.get("e_tag", None)
-            elif hasattr(change, "e_tag"):
-                e_tag = change.e_tag
-            doc = {
-                "id": CosmosDbKeyEscape.sanitize_key(
-                    key, self.config.key_suffix, self.config.compatibility_mode
-                ),
-                "realId": key,
-                "document": self.__create_dict(change),
-            }
-            if e_tag == "":
-                raise Exception("cosmosdb_storage.write(): etag missing")
+        # Build every document first so an invalid item fails the write before any I/O.
+        documents_to_write = [
+            self.__create_document(key, change) for key, change in changes.items()
+        ]
+        new_e_tags = await gather(
+            *[self.__upsert_item(doc, e_tag) for doc, e_tag in documents_to_write]
+        )
+        return dict(zip(changes, new_e_tags))
 
-            access_condition = e_tag != "*" and e_tag and e_tag != ""
+    async def write_delta(self, changes: Dict[str, StoreItemDelta]):
+        """Save the changed properties of storeitems to storage.
 
-            try:
-                self.container.upsert_item(
-                    body=doc,
-                    etag=e_tag if access_condition else None,
-                    match_condition=(
-                        MatchConditions.IfNotModified if access_condition else None
-                    ),
+        Deltas are applied with Cosmos patch operations when the serializer supports partial
+        updates, and written as whole documents otherwise.
+
+        :param changes:
+        :return dict: The new e_tag of each written item.
+        """
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return
+
+        await self.initialize()
+
+        # Build every document and patch first so an invalid item fails the write before any I/O.
+        writes = []
+        for key, delta in changes.items():
+            operations = self.__create_patch_operations(delta)
+            if operations is None:
+                writes.append(
+                    (key, delta, None, *self.__create_document(key, delta.item))
                 )
-            except Exception as err:
-                raise err
+            else:
+                writes.append(
+                    (key, delta, operations, None, self.__get_e_tag(delta.item))
+                )
+
+        new_e_tags = await gather(
+            *[
+                (
+                    self.__upsert_item(doc, e_tag)
+                    if operations is None
+                    else self.__patch_item(key, delta, operations, e_tag)
+                )
+                for key, delta, operations, doc, e_tag in writes
+            ]
+        )
+        return dict(zip(changes, new_e_tags))
 
     async def delete(self, keys: List[str]):
         """Remove storeitems from storage.
@@ -222,19 +263,151 @@ class CosmosDbPartitionedStorage(Storage):
         """
         await self.initialize()
 
-        for key in keys:
-            escaped_key = CosmosDbKeyEscape.sanitize_key(
+        await gather(
+            *[
+                self.__delete_item(
+                    CosmosDbKeyEscape.sanitize_key(
+                        key, self.config.key_suffix, self.config.compatibility_mode
+                    )
+                )
+                for key in keys
+            ]
+        )
+
+    async def close(self):
+        """Close the underlying Cosmos client and its connections."""
+        if self.client:
+            await self.client.close()
+            self.client = None
+            self.database = None
+            self.container = None
+
+    async def __read_item(self, escaped_key: str) -> Dict:
+        try:
+            return await self.container.read_item(
+                escaped_key, self.__get_partition_key(escaped_key)
+            )
+        # When an item is not found a CosmosException is thrown, but we want to
+        # return an empty collection so in this instance we catch and do not rethrow.
+        # Throw for any other exception.
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            return None
+
+    async def __query_items(self, escaped_keys: List[str]) -> List[Dict]:
+        return [
+            item
+            async for item in self.container.query_items(
+                query="SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.id)",
+                parameters=[{"name": "@ids", "value": escaped_keys}],
+            )
+        ]
+
+    @staticmethod
+    def __get_e_tag(change: object) -> str:
+        e_tag = None
+        if isinstance(change, dict):
+            e_tag = change.get("e_tag", None)
+        elif hasattr(change, "e_tag"):
+            e_tag = change.e_tag
+        if e_tag == "":
+            raise Exception("cosmosdb_storage.write(): etag missing")
+        return e_tag
+
+    def __create_document(self, key: str, change: object) -> Tuple[Dict, str]:
+        e_tag = self.__get_e_tag(change)
+
+        doc = {
+            "id": CosmosDbKeyEscape.sanitize_key(
                 key, self.config.key_suffix, self.config.compatibility_mode
+            ),
+            "realId": key,
+            "document": self.__create_dict(change),
+            "serializer": self.serializer.name,
+        }
+        return doc, e_tag
+
+    async def __upsert_item(self, doc: Dict, e_tag: str) -> str:
+        access_condition = e_tag != "*" and e_tag and e_tag != ""
+
+        result = await self.container.upsert_item(
+            body=doc,
+            etag=e_tag if access_condition else None,
+            match_condition=(
+                MatchConditions.IfNotModified if access_condition else None
+            ),
+        )
+        return (result or {}).get("_etag")
+
+    def __create_patch_operations(self, delta: StoreItemDelta) -> List[Dict]:
+        """Return the patch operations for a delta, or None when it must be written in full."""
+        if (
+            not delta.is_partial
+            or not self.serializer.partial_updates
+            or not isinstance(delta.item, dict)
+            or self.compatability_mode_partition_key
+        ):
+            return None
+
+        def path(name: str) -> str:
+            return "/document/" + name.replace("~", "~0").replace("/", "~1")
+
+        operations = [
+            {
+                "op": "set",
+                "path": path(name),
+                "value": self.serializer.to_document({name: value})[name],
+            }
+            for name, value in delta.updated_properties.items()
+        ]
+        operations.extend(
+            {"op": "remove", "path": path(name)} for name in delta.removed_properties
+        )
+        if len(operations) > MAX_PATCH_OPERATIONS:
+            return None
+        return operations
+
+    async def __patch_item(
+        self, key: str, delta: StoreItemDelta, operations: List[Dict], e_tag: str
+    ) -> str:
+        escaped_key = CosmosDbKeyEscape.sanitize_key(
+            key, self.config.key_suffix, self.config.compatibility_mode
+        )
+        access_condition = e_tag != "*" and e_tag and e_tag != ""
+
+        try:
+            result = await self.container.patch_item(
+                escaped_key,
+                escaped_key,
+                operations,
+                # the stored document must have been written by the same serializer
+                filter_predicate=f"FROM c WHERE c.serializer = '{self.serializer.name}'",
+                etag=e_tag if access_condition else None,
+                match_condition=(
+                    MatchConditions.IfNotModified if access_condition else None
+                ),
             )
-            try:
-                self.container.delete_item(
-                    escaped_key,
-                    self.__get_partition_key(escaped_key),
-                )
-            except cosmos_exceptions.CosmosResourceNotFoundError:
-                continue
-            except Exception as err:
+        except cosmos_exceptions.CosmosHttpResponseError as err:
+            # Missing documents, documents of another serializer and removed properties that
+            # don't exist are written in full. The upsert repeats the e_tag check.
+            if err.status_code not in (
+                http_constants.StatusCodes.NOT_FOUND,
+                http_constants.StatusCodes.PRECONDITION_FAILED,
+                http_constants.StatusCodes.BAD_REQUEST,
+            ):
                 raise err
+            doc, _ = self.__create_document(key, delta.item)
+            return await self.__upsert_item(doc, e_tag)
+
+        return (result or {}).get("_etag")
+
+    async def __delete_item(self, escaped_key: str):
+        try:
+            await self.container.delete_item(
+                escaped_key,
+                self.__get_partition_key(escaped_key),
+            )
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            pass
 
     async def initialize(self):
         if not self.container:
@@ -248,31 +421,36 @@ class CosmosDbPartitionedStorage(Storage):
                 self.client = cosmos_client.CosmosClient(
                     self.config.cosmos_db_endpoint,
                     self.config.auth_key,
-                    self.config.cosmos_client_options.get("consistency_level", None),
+                    consistency_level=self.config.cosmos_client_options.get(
+                        "consistency_level", None
+                    ),
                     **{
                         "connection_policy": connection_policy,
                         "connection_verify": not connection_policy.DisableSSLVerification,
                     },
                 )
 
+            if not self.__lock:
+                self.__lock = Lock()
+
             if not self.database:
-                with self.__lock:
+                async with self.__lock:
                     if not self.database:
-                        self.database = self.client.create_database_if_not_exists(
+                        self.database = await self.client.create_database_if_not_exists(
                             self.config.database_id
                         )
 
-            self.__get_or_create_container()
+            await self.__get_or_create_container()
 
-    def __get_or_create_container(self):
-        with self.__lock:
+    async def __get_or_create_container(self):
+        async with self.__lock:
             partition_key = {
                 "paths": ["/id"],
                 "kind": documents.PartitionKind.Hash,
             }
             try:
                 if not self.container:
-                    self.container = self.database.create_container(
+                    self.container = await self.database.create_container(
                         self.config.container_id,
                         partition_key,
                         offer_throughput=self.config.container_throughput,
@@ -282,7 +460,7 @@ class CosmosDbPartitionedStorage(Storage):
                     self.container = self.database.get_container_client(
                         self.config.container_id
                     )
-                    properties = self.container.read()
+                    properties = await self.container.read()
                     if "partitionKey" not in properties:
                         self.compatability_mode_partition_key = True
                     else:
@@ -301,8 +479,7 @@ class CosmosDbPartitionedStorage(Storage):
     def __get_partition_key(self, key: str) -> str:
         return None if self.compatability_mode_partition_key else key
 
-    @staticmethod
-    def __create_si(result) -> object:
+    def __create_si(self, result) -> object:
         """Create an object from a result out of CosmosDB.
 
         :param result:
@@ -314,13 +491,19 @@ class CosmosDbPartitionedStorage(Storage):
         if result.get("_etag"):
             doc["e_tag"] = result["_etag"]
 
-        result_obj = Unpickler().restore(doc)
+        # documents written before serializers were recorded are jsonpickle documents
+        serializer_name = result.get("serializer", JsonPickleStoreItemSerializer.name)
+        serializer = (
+            self.serializer
+            if serializer_name == self.serializer.name
+            else get_store_item_serializer(serializer_name)
+        )
+        result_obj = serializer.from_document(doc)
 
         # create and return the object
         return result_obj
 
-    @staticmethod
-    def __create_dict(store_item: object) -> Dict:
+    def __create_dict(self, store_item: object) -> Dict:
         """Return the dict of an object.
 
         This eliminates non_magic attributes and the e_tag.
@@ -329,7 +512,7 @@ class CosmosDbPartitionedStorage(Storage):
         :return dict:
         """
         # read the content
-        json_dict = Pickler().flatten(store_item)
+        json_dict = self.serializer.to_document(store_item)
         if "e_tag" in json_dict:
             del json_dict["e_tag"]
 
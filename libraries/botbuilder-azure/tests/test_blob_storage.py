@@ -1,8 +1,13 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+import gzip
+import json
+from asyncio import sleep
+from types import SimpleNamespace
+
 import pytest
-from azure.core.exceptions import ResourceNotFoundError
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
 from azure.storage.blob.aio import BlobServiceClient
 from botbuilder.core import StoreItem
 from botbuilder.azure import BlobStorage, BlobStorageSettings
@@ -44,6 +49,155 @@ class SimpleStoreItem(StoreItem):
         self.e_tag = e_tag
 
 
+class FakeBlobClient:
+    def __init__(self, container: "FakeContainerClient", name: str):
+        self.container = container
+        self.name = name
+
+    async def upload_blob(self, data, **kwargs):
+        await self.container.call()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.container.e_tag += 1
+        self.container.blobs[self.name] = (
+            data,
+            kwargs.get("metadata") or {},
+            str(self.container.e_tag),
+        )
+        return {"etag": f'"{self.container.e_tag}"'}
+
+    async def download_blob(self):
+        await self.container.call()
+        if self.name not in self.container.blobs:
+            raise ResourceNotFoundError()
+        data, metadata, e_tag = self.container.blobs[self.name]
+
+        async def readall():
+            return data
+
+        return SimpleNamespace(
+            readall=readall,
+            properties=SimpleNamespace(etag=f'"{e_tag}"', metadata=metadata),
+        )
+
+    async def delete_blob(self):
+        await self.container.call()
+        if self.name not in self.container.blobs:
+            raise ResourceNotFoundError()
+        del self.container.blobs[self.name]
+
+
+class FakeContainerClient:
+    def __init__(self):
+        self.blobs = {}
+        self.e_tag = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def call(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await sleep(0.01)
+        self.in_flight -= 1
+
+    async def create_container(self):
+        raise ResourceExistsError()
+
+    def get_blob_client(self, name: str) -> FakeBlobClient:
+        return FakeBlobClient(self, name)
+
+
+def get_fake_storage(**kwargs):
+    settings = BlobStorageSettings(
+        container_name="test",
+        connection_string=BLOB_STORAGE_SETTINGS.connection_string,
+        **kwargs,
+    )
+    storage = BlobStorage(settings)
+    container = FakeContainerClient()
+    storage._BlobStorage__container_client = (  # pylint: disable=protected-access
+        container
+    )
+    return storage, container
+
+
+class TestBlobStorageConcurrencyAndCompression:
+    @pytest.mark.asyncio
+    async def test_multi_key_operations_respect_max_concurrency(self):
+        storage, container = get_fake_storage(max_concurrency=2)
+        keys = [f"key{index}" for index in range(5)]
+
+        await storage.write({key: SimpleStoreItem(counter=1) for key in keys})
+        assert container.max_in_flight == 2
+
+        container.max_in_flight = 0
+        items = await storage.read(keys + ["missing"])
+        assert container.max_in_flight == 2
+        assert sorted(items) == keys
+        assert items["key0"].counter == 1
+
+        await storage.delete(keys + ["missing"])
+        assert not container.blobs
+
+    @pytest.mark.asyncio
+    async def test_compressed_blobs_record_codec_in_metadata(self):
+        storage, container = get_fake_storage(compression="gzip")
+
+        e_tags = await storage.write({"user": SimpleStoreItem(counter=3)})
+        assert e_tags == {"user": str(container.e_tag)}
+        data, metadata, _ = container.blobs["user"]
+        assert metadata["compression"] == "gzip"
+        assert json.loads(gzip.decompress(data))["counter"] == 3
+
+        items = await storage.read(["user"])
+        assert items["user"].counter == 3
+        assert items["user"].e_tag == str(container.e_tag)
+
+    @pytest.mark.asyncio
+    async def test_reads_blobs_regardless_of_compression_setting(self):
+        uncompressed_storage, container = get_fake_storage()
+        await uncompressed_storage.write({"plain": SimpleStoreItem(counter=1)})
+
+        compressed_storage, _ = get_fake_storage(compression="gzip")
+        compressed_storage._BlobStorage__container_client = (  # pylint: disable=protected-access
+            container
+        )
+        await compressed_storage.write({"packed": SimpleStoreItem(counter=2)})
+
+        for storage in (uncompressed_storage, compressed_storage):
+            items = await storage.read(["plain", "packed"])
+            assert items["plain"].counter == 1
+            assert items["packed"].counter == 2
+
+    @pytest.mark.asyncio
+    async def test_reads_blobs_written_by_another_serializer(self):
+        jsonpickle_storage, container = get_fake_storage()
+        await jsonpickle_storage.write({"object": SimpleStoreItem(counter=1)})
+        # blobs written before the serializer was recorded in the metadata
+        container.blobs["legacy"] = (
+            b'{"py/object": "test_blob_storage.SimpleStoreItem", "counter": 2}',
+            {},
+            "1",
+        )
+
+        json_storage, _ = get_fake_storage(serializer="json")
+        json_storage._BlobStorage__container_client = (  # pylint: disable=protected-access
+            container
+        )
+        await json_storage.write({"plain": {"counter": 3}})
+        assert container.blobs["plain"][1]["serializer"] == "json"
+        assert json.loads(container.blobs["plain"][0]) == {"counter": 3}
+
+        items = await json_storage.read(["object", "legacy", "plain"])
+        assert isinstance(items["object"], SimpleStoreItem)
+        assert items["legacy"].counter == 2
+        assert items["plain"] == {"counter": 3, "e_tag": str(container.e_tag)}
+
+    def test_unsupported_compression_raises(self):
+        with pytest.raises(Exception):
+            get_fake_storage(compression="lzma")
+
+
 class TestBlobStorageConstructor:
     @pytest.mark.asyncio
     async def test_blob_storage_init_should_error_without_blob_config(self):
@@ -1,9 +1,12 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+import importlib.util
+from asyncio import sleep
 import azure.cosmos.exceptions as cosmos_exceptions
 from azure.cosmos import documents
 import pytest
+from botbuilder.core import StoreItem, StoreItemDelta
 from botbuilder.azure import CosmosDbPartitionedStorage, CosmosDbPartitionedConfig
 from botbuilder.testing import StorageBaseTests
 
@@ -27,9 +30,184 @@ async def reset():
     storage = CosmosDbPartitionedStorage(get_settings())
     await storage.initialize()
     try:
-        storage.client.delete_database(get_settings().database_id)
+        await storage.client.delete_database(get_settings().database_id)
     except cosmos_exceptions.HttpResponseError:
         pass
+    await storage.close()
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag="*"):
+        super().__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+class FakeContainer:
+    def __init__(self):
+        self.items = {}
+        self.patches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await sleep(0.01)
+        self.in_flight -= 1
+
+    async def read_item(self, item, partition_key):  # pylint: disable=unused-argument
+        await self._call()
+        if item not in self.items:
+            raise cosmos_exceptions.CosmosResourceNotFoundError()
+        return dict(self.items[item], _etag="etag")
+
+    async def upsert_item(self, body, **kwargs):  # pylint: disable=unused-argument
+        await self._call()
+        self.items[body["id"]] = body
+        return dict(body, _etag="etag")
+
+    async def patch_item(
+        self, item, partition_key, patch_operations, filter_predicate=None, **kwargs
+    ):  # pylint: disable=unused-argument
+        await self._call()
+        self.patches.append(patch_operations)
+        if item not in self.items:
+            raise cosmos_exceptions.CosmosResourceNotFoundError(status_code=404)
+        if filter_predicate and f"'{self.items[item].get('serializer')}'" not in (
+            filter_predicate
+        ):
+            raise cosmos_exceptions.CosmosAccessConditionFailedError(status_code=412)
+
+        document = self.items[item]["document"]
+        for operation in patch_operations:
+            name = operation["path"][len("/document/") :]
+            if operation["op"] == "set":
+                document[name] = operation["value"]
+            else:
+                del document[name]
+        return dict(self.items[item], _etag="patched")
+
+    async def delete_item(self, item, partition_key):  # pylint: disable=unused-argument
+        await self._call()
+        if item not in self.items:
+            raise cosmos_exceptions.CosmosResourceNotFoundError()
+        del self.items[item]
+
+
+class TestCosmosDbPartitionedStorageConcurrency:
+    @pytest.mark.asyncio
+    async def test_multi_key_operations_run_concurrently(self):
+        storage = get_storage()
+        storage.container = FakeContainer()
+
+        e_tags = await storage.write({"one": {"value": 1}, "two": {"value": 2}})
+        assert storage.container.max_in_flight == 2
+        assert e_tags == {"one": "etag", "two": "etag"}
+
+        storage.container.max_in_flight = 0
+        items = await storage.read(["one", "two", "missing"])
+        assert storage.container.max_in_flight == 3
+        assert items["one"]["value"] == 1
+        assert items["two"]["value"] == 2
+        assert items["two"]["e_tag"] == "etag"
+        assert "missing" not in items
+
+        storage.container.max_in_flight = 0
+        await storage.delete(["one", "two", "missing"])
+        assert storage.container.max_in_flight == 3
+        assert not storage.container.items
+
+    @pytest.mark.asyncio
+    async def test_reads_documents_written_by_another_serializer(self):
+        storage = get_storage()
+        storage.container = FakeContainer()
+        await storage.write({"object": SimpleStoreItem(counter=1)})
+        # documents written before the serializer was recorded
+        storage.container.items["legacy"] = {
+            "id": "legacy",
+            "realId": "legacy",
+            "document": {"counter": 2},
+        }
+
+        json_settings = get_settings()
+        json_settings.serializer = "json"
+        json_storage = CosmosDbPartitionedStorage(json_settings)
+        json_storage.container = storage.container
+        await json_storage.write({"plain": {"counter": 3, "e_tag": "*"}})
+        assert json_storage.container.items["plain"]["serializer"] == "json"
+        assert json_storage.container.items["plain"]["document"] == {"counter": 3}
+
+        items = await json_storage.read(["object", "legacy", "plain"])
+        assert isinstance(items["object"], SimpleStoreItem)
+        assert items["legacy"] == {"counter": 2, "e_tag": "etag"}
+        assert items["plain"] == {"counter": 3, "e_tag": "etag"}
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("msgpack") is None, reason="Needs msgpack."
+    )
+    def test_rejects_serializers_without_json_documents(self):
+        settings = get_settings()
+        settings.serializer = "msgpack"
+        with pytest.raises(Exception, match="msgpack serializer can't be used"):
+            CosmosDbPartitionedStorage(settings)
+
+    @pytest.mark.asyncio
+    async def test_write_validates_all_items_before_writing(self):
+        storage = get_storage()
+        storage.container = FakeContainer()
+
+        with pytest.raises(Exception):
+            await storage.write({"one": {"value": 1}, "two": {"e_tag": ""}})
+        assert not storage.container.items
+
+    @pytest.mark.asyncio
+    async def test_write_delta_patches_changed_properties(self):
+        settings = get_settings()
+        settings.serializer = "json"
+        storage = CosmosDbPartitionedStorage(settings)
+        storage.container = FakeContainer()
+        await storage.write({"state": {"dialog": {"index": 1}, "user": "name"}})
+
+        item = {"dialog": {"index": 2}, "e_tag": "etag"}
+        e_tags = await storage.write_delta(
+            {"state": StoreItemDelta(item, {"dialog": item["dialog"]}, ["user"])}
+        )
+
+        assert e_tags == {"state": "patched"}
+        assert storage.container.patches == [
+            [
+                {"op": "set", "path": "/document/dialog", "value": {"index": 2}},
+                {"op": "remove", "path": "/document/user"},
+            ]
+        ]
+        assert storage.container.items["state"]["document"] == {"dialog": {"index": 2}}
+
+    @pytest.mark.asyncio
+    async def test_write_delta_writes_whole_documents_when_patching_is_not_possible(
+        self,
+    ):
+        # jsonpickle documents can't be patched one property at a time
+        storage = get_storage()
+        storage.container = FakeContainer()
+        item = {"count": 1}
+        await storage.write_delta({"pickled": StoreItemDelta(item, {"count": 1})})
+        assert not storage.container.patches
+
+        # missing documents are created by the fallback upsert
+        settings = get_settings()
+        settings.serializer = "json"
+        json_storage = CosmosDbPartitionedStorage(settings)
+        json_storage.container = storage.container
+        e_tags = await json_storage.write_delta(
+            {"new": StoreItemDelta(item, {"count": 1})}
+        )
+        assert e_tags == {"new": "etag"}
+        assert storage.container.items["new"]["document"] == {"count": 1}
+
+        # as are documents written by another serializer
+        await json_storage.write_delta({"pickled": StoreItemDelta(item, {"count": 2})})
+        assert storage.container.items["pickled"]["serializer"] == "json"
 
 
 class TestCosmosDbPartitionedStorageConstructor:
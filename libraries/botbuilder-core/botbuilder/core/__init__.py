@@ -4,52 +4,88 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from botbuilder.schema import InvokeResponse
-
-from . import conversation_reference_extension
-
+from importlib import import_module
 from .about import __version__
-from .activity_handler import ActivityHandler
-from .auto_save_state_middleware import AutoSaveStateMiddleware
-from .bot import Bot
-from .bot_assert import BotAssert
-from .bot_adapter import BotAdapter
-from .bot_framework_adapter import BotFrameworkAdapter, BotFrameworkAdapterSettings
-from .bot_state import BotState
-from .bot_state_set import BotStateSet
-from .bot_telemetry_client import BotTelemetryClient, Severity
-from .card_factory import CardFactory
-from .channel_service_handler import BotActionNotImplementedError, ChannelServiceHandler
-from .cloud_adapter_base import CloudAdapterBase
-from .cloud_channel_service_handler import CloudChannelServiceHandler
-from .component_registration import ComponentRegistration
-from .conversation_state import ConversationState
-from .oauth.extended_user_token_provider import ExtendedUserTokenProvider
-from .oauth.user_token_provider import UserTokenProvider
-from .intent_score import IntentScore
-from .memory_storage import MemoryStorage
-from .memory_transcript_store import MemoryTranscriptStore
-from .message_factory import MessageFactory
-from .middleware_set import AnonymousReceiveMiddleware, Middleware, MiddlewareSet
-from .null_telemetry_client import NullTelemetryClient
-from .private_conversation_state import PrivateConversationState
-from .queue_storage import QueueStorage
-from .recognizer import Recognizer
-from .recognizer_result import RecognizerResult, TopIntent
-from .show_typing_middleware import ShowTypingMiddleware
-from .state_property_accessor import StatePropertyAccessor
-from .state_property_info import StatePropertyInfo
-from .storage import Storage, StoreItem, calculate_change_hash
-from .telemetry_constants import TelemetryConstants
-from .telemetry_logger_constants import TelemetryLoggerConstants
-from .telemetry_logger_middleware import TelemetryLoggerMiddleware
-from .turn_context import TurnContext
-from .transcript_logger import TranscriptLogger, TranscriptLoggerMiddleware
-from .user_state import UserState
-from .register_class_middleware import RegisterClassMiddleware
-from .adapter_extensions import AdapterExtensions
 from .serializer_helper import serializer_helper
 
+# The modules of the attributes of the package, imported when the attributes are first read,
+# since most of them import the connector and the schema models.
+_ATTRIBUTE_MODULES = {
+    "InvokeResponse": "botbuilder.schema",
+    "conversation_reference_extension": ".conversation_reference_extension",
+    "ActivityHandler": ".activity_handler",
+    "AutoSaveStateMiddleware": ".auto_save_state_middleware",
+    "Bot": ".bot",
+    "BotAssert": ".bot_assert",
+    "BotAdapter": ".bot_adapter",
+    "BotFrameworkAdapter": ".bot_framework_adapter",
+    "BotFrameworkAdapterSettings": ".bot_framework_adapter",
+    "BotState": ".bot_state",
+    "BotStateSet": ".bot_state_set",
+    "CachingStorage": ".caching_storage",
+    "BotTelemetryClient": ".bot_telemetry_client",
+    "Severity": ".bot_telemetry_client",
+    "BoundedMemoryStorage": ".bounded_memory_storage",
+    "CardFactory": ".card_factory",
+    "BotActionNotImplementedError": ".channel_service_handler",
+    "ChannelServiceHandler": ".channel_service_handler",
+    "CloudAdapterBase": ".cloud_adapter_base",
+    "CloudChannelServiceHandler": ".cloud_channel_service_handler",
+    "ComponentRegistration": ".component_registration",
+    "ConversationQueueMiddleware": ".conversation_queue_middleware",
+    "is_e_tag_conflict": ".conversation_queue_middleware",
+    "ConversationReferenceMiddleware": ".conversation_reference_store",
+    "ConversationReferenceStore": ".conversation_reference_store",
+    "ConversationState": ".conversation_state",
+    "FileTranscriptStore": ".file_transcript_store",
+    "ExtendedUserTokenProvider": ".oauth.extended_user_token_provider",
+    "UserTokenProvider": ".oauth.user_token_provider",
+    "IntentScore": ".intent_score",
+    "MemoryStorage": ".memory_storage",
+    "MemoryTranscriptStore": ".memory_transcript_store",
+    "MessageFactory": ".message_factory",
+    "AnonymousReceiveMiddleware": ".middleware_set",
+    "Middleware": ".middleware_set",
+    "MiddlewareSet": ".middleware_set",
+    "NullTelemetryClient": ".null_telemetry_client",
+    "OutboundScheduler": ".outbound_scheduler",
+    "PrivateConversationState": ".private_conversation_state",
+    "FanOutCheckpoint": ".proactive_fan_out",
+    "FanOutResult": ".proactive_fan_out",
+    "ProactiveFanOut": ".proactive_fan_out",
+    "QueueStorage": ".queue_storage",
+    "Recognizer": ".recognizer",
+    "RecognizerResult": ".recognizer_result",
+    "TopIntent": ".recognizer_result",
+    "ShardedStorage": ".sharded_storage",
+    "SendPipeline": ".send_pipeline",
+    "ShowTypingMiddleware": ".show_typing_middleware",
+    "SqliteStorage": ".sqlite_storage",
+    "StatePropertyAccessor": ".state_property_accessor",
+    "StatePropertyInfo": ".state_property_info",
+    "Storage": ".storage",
+    "StoreItem": ".storage",
+    "StoreItemDelta": ".storage",
+    "calculate_change_hash": ".storage",
+    "JsonPickleStoreItemSerializer": ".store_item_serializer",
+    "JsonStoreItemSerializer": ".store_item_serializer",
+    "MsgPackStoreItemSerializer": ".store_item_serializer",
+    "StoreItemSerializer": ".store_item_serializer",
+    "get_store_item_serializer": ".store_item_serializer",
+    "TelemetryConstants": ".telemetry_constants",
+    "TelemetryLoggerConstants": ".telemetry_logger_constants",
+    "TelemetryLoggerMiddleware": ".telemetry_logger_middleware",
+    "TurnContext": ".turn_context",
+    "TranscriptBufferFullPolicy": ".transcript_logger",
+    "TranscriptLogger": ".transcript_logger",
+    "TranscriptLoggerMiddleware": ".transcript_logger",
+    "UserState": ".user_state",
+    "RegisterClassMiddleware": ".register_class_middleware",
+    "AdapterExtensions": ".adapter_extensions",
+}
+
+# The attributes are defined by __getattr__.
+# pylint: disable=undefined-all-variable
 __all__ = [
     "ActivityHandler",
     "AdapterExtensions",
@@ -64,38 +100,59 @@ __all__ = [
     "BotState",
     "BotStateSet",
     "BotTelemetryClient",
+    "BoundedMemoryStorage",
     "calculate_change_hash",
+    "CachingStorage",
     "CardFactory",
     "ChannelServiceHandler",
     "CloudAdapterBase",
     "CloudChannelServiceHandler",
     "ComponentRegistration",
+    "ConversationQueueMiddleware",
+    "ConversationReferenceMiddleware",
+    "ConversationReferenceStore",
     "ConversationState",
     "conversation_reference_extension",
     "ExtendedUserTokenProvider",
+    "FanOutCheckpoint",
+    "FanOutResult",
+    "FileTranscriptStore",
+    "get_store_item_serializer",
     "IntentScore",
     "InvokeResponse",
+    "is_e_tag_conflict",
+    "JsonPickleStoreItemSerializer",
+    "JsonStoreItemSerializer",
     "MemoryStorage",
     "MemoryTranscriptStore",
     "MessageFactory",
     "Middleware",
     "MiddlewareSet",
+    "MsgPackStoreItemSerializer",
     "NullTelemetryClient",
+    "OutboundScheduler",
     "PrivateConversationState",
+    "ProactiveFanOut",
     "QueueStorage",
     "RegisterClassMiddleware",
     "Recognizer",
     "RecognizerResult",
+    "SendPipeline",
     "Severity",
+    "ShardedStorage",
     "ShowTypingMiddleware",
+    "SqliteStorage",
     "StatePropertyAccessor",
     "StatePropertyInfo",
     "Storage",
     "StoreItem",
+    "StoreItemDelta",
+    "StoreItemSerializer",
     "TelemetryConstants",
     "TelemetryLoggerConstants",
     "TelemetryLoggerMiddleware",
     "TopIntent",
+    "TranscriptBufferFullPolicy",
     "TranscriptLogger",
     "TranscriptLoggerMiddleware",
     "TurnContext",
@@ -104,3 +161,19 @@ __all__ = [
     "serializer_helper",
     "__version__",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _ATTRIBUTE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = import_module(module_name, __name__)
+    # Exported submodules are their own attribute.
+    value = module if module_name == f".{name}" else getattr(module, name)
+    # Later reads find the attribute without calling this function.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(globals().keys() | _ATTRIBUTE_MODULES.keys())
@@ -2,7 +2,7 @@
 # Licensed under the MIT License.
 
 from abc import ABC, abstractmethod
-from typing import List, Callable, Awaitable
+from typing import AsyncIterable, Awaitable, Callable, Iterable, List, Union
 from botbuilder.schema import (
     Activity,
     ConversationReference,
@@ -15,6 +15,7 @@ from . import conversation_reference_extension
 from .bot_assert import BotAssert
 from .turn_context import TurnContext
 from .middleware_set import MiddlewareSet
+from .proactive_fan_out import FanOutCheckpoint, ProactiveFanOut
 
 
 class BotAdapter(ABC):
@@ -113,6 +114,64 @@ class BotAdapter(ABC):
         )
         return await self.run_pipeline(context, callback)
 
+    def continue_conversations(
+        self,
+        references: Union[
+            Iterable[ConversationReference], AsyncIterable[ConversationReference]
+        ],
+        callback: Callable,
+        bot_id: str = None,
+        claims_identity: ClaimsIdentity = None,
+        audience: str = None,
+        max_concurrency: int = 32,
+        max_retries: int = 3,
+        checkpoint: FanOutCheckpoint = None,
+        on_progress: Callable[[ProactiveFanOut], None] = None,
+    ) -> ProactiveFanOut:
+        """
+        Sends proactive messages to many conversations, like :meth:`continue_conversation` does for
+        one.
+
+        :param references: The references of the conversations to continue.
+        :type references: :class:`typing.Iterable` or :class:`typing.AsyncIterable`
+        :param callback: The method to call for the bot turn of each conversation.
+        :type callback: :class:`typing.Callable`
+        :param bot_id: The application ID of the bot.
+        :param claims_identity: A :class:`botframework.connector.auth.ClaimsIdentity` for the conversations.
+        :type claims_identity: :class:`botframework.connector.auth.ClaimsIdentity`
+        :param audience: A value signifying the recipient of the proactive messages.
+        :type audience: str
+        :param max_concurrency: The number of conversations continued at the same time.
+        :param max_retries: How many times a conversation that failed with a transient error is
+        continued again.
+        :param checkpoint: Records the handled conversations, to resume an interrupted broadcast.
+        :type checkpoint: :class:`FanOutCheckpoint`
+        :param on_progress: Called with the fan-out each time a conversation completes.
+
+        :return: The fan-out. Iterate it to get the outcome of each conversation as it completes,
+        or await its `run()`.
+
+        .. remarks::
+            Connector clients are pooled by the adapters per service url, so conversations of the
+            same channel share clients and connections. An error handled by `on_turn_error`
+            doesn't reach the fan-out, so the conversation counts as succeeded.
+        """
+
+        async def continue_one(reference: ConversationReference):
+            # Positional, since adapters name the bot id differently.
+            await self.continue_conversation(
+                reference, callback, bot_id, claims_identity, audience
+            )
+
+        return ProactiveFanOut(
+            continue_one,
+            references,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            checkpoint=checkpoint,
+            on_progress=on_progress,
+        )
+
     async def create_conversation(
         self,
         reference: ConversationReference,
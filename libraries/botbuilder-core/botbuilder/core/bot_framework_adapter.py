@@ -8,11 +8,18 @@ import base64
 import json
 import os
 import uuid
+from functools import partial
 from http import HTTPStatus
-from typing import List, Callable, Awaitable, Union, Dict
+from typing import List, Callable, Awaitable, Union, Dict, Tuple
 from msrest.serialization import Model
 
-from botframework.connector import Channels, EmulatorApiClient
+from botframework.connector import (
+    AsyncBfPipeline,
+    BotFrameworkConnectorConfiguration,
+    Channels,
+    ClientPool,
+    EmulatorApiClient,
+)
 from botframework.connector.aio import ConnectorClient
 from botframework.connector.auth import (
     AuthenticationConfiguration,
@@ -62,6 +69,8 @@ from .oauth import (
 )
 from .turn_context import TurnContext
 from .conversation_reference_extension import get_continuation_activity
+from .outbound_scheduler import OutboundScheduler
+from .send_pipeline import SendPipeline
 
 USER_AGENT = f"Microsoft-BotFramework/3.1 (BotBuilder Python/{__version__})"
 OAUTH_ENDPOINT = "https://api.botframework.com"
@@ -121,6 +130,10 @@ class BotFrameworkAdapterSettings:
         auth_configuration: AuthenticationConfiguration = None,
         app_credentials: AppCredentials = None,
         credential_provider: CredentialProvider = None,
+        pipeline_sends: bool = False,
+        sequential_send_channels: Tuple[str, ...] = (Channels.ms_teams,),
+        outbound_scheduler: OutboundScheduler = None,
+        lazy_activities: bool = False,
     ):
         """
         Contains the settings used to initialize a :class:`BotFrameworkAdapter` instance.
@@ -143,6 +156,17 @@ class BotFrameworkAdapterSettings:
         :type auth_configuration: :class:`botframework.connector.auth.AuthenticationConfiguration`
         :param credential_provider: Defaults to SimpleCredentialProvider if one isn't specified.
         :param app_credentials: Allows for a custom AppCredentials.  Used, for example, for CertificateAppCredentials.
+        :param pipeline_sends: Whether send_activities sends typing activities without waiting for
+            their responses, so the next activity starts once a typing activity has been sent. Other
+            activities are always sent once the previous one arrived, to keep their order. See
+            :class:`SendPipeline`.
+        :type pipeline_sends: bool
+        :param sequential_send_channels: The channels whose activities are always sent one at a time.
+        :param outbound_scheduler: Paces the activities sent to stay under the service rate limits.
+            See :class:`OutboundScheduler`.
+        :param lazy_activities: Whether received activities are deserialized as :class:`LazyActivity`,
+            which deserializes their attachments, entities, channel data and value only when they're read.
+        :type lazy_activities: bool
         """
 
         self.app_id = app_id
@@ -159,6 +183,10 @@ class BotFrameworkAdapterSettings:
             else SimpleCredentialProvider(self.app_id, self.app_password)
         )
         self.auth_configuration = auth_configuration or AuthenticationConfiguration()
+        self.pipeline_sends = pipeline_sends
+        self.sequential_send_channels = tuple(sequential_send_channels)
+        self.outbound_scheduler = outbound_scheduler
+        self.lazy_activities = lazy_activities
 
         # If no open_id_metadata values were passed in the settings, check the
         # process' Environment Variable.
@@ -195,6 +223,10 @@ class BotFrameworkAdapter(
         """
         super(BotFrameworkAdapter, self).__init__()
         self.settings = settings or BotFrameworkAdapterSettings("", "")
+        self.pipeline_sends = self.settings.pipeline_sends
+        self.sequential_send_channels = self.settings.sequential_send_channels
+        self.outbound_scheduler = self.settings.outbound_scheduler
+        self.lazy_activities = self.settings.lazy_activities
 
         self._credentials = self.settings.app_credentials
         self._credential_provider = SimpleCredentialProvider(
@@ -212,7 +244,7 @@ class BotFrameworkAdapter(
             )
 
         # There is a significant boost in throughput if we reuse a ConnectorClient
-        self._connector_client_cache: Dict[str, ConnectorClient] = {}
+        self._connector_client_cache = ClientPool()
 
         # Cache for appCredentials to speed up token acquisition (a token is not requested unless is expired)
         self._app_credential_map: Dict[str, AppCredentials] = {}
@@ -676,10 +708,17 @@ class BotFrameworkAdapter(
         self, context: TurnContext, activities: List[Activity]
     ) -> List[ResourceResponse]:
         try:
-            responses: List[ResourceResponse] = []
+            responses = []
+            pipeline = SendPipeline()
+            proactive = (
+                context.activity is not None
+                and context.activity.type == ActivityTypes.event
+                and context.activity.name == ActivityEventNames.continue_conversation
+            )
             for activity in activities:
                 response: ResourceResponse = None
                 if activity.type == "delay":
+                    # Only sends whose order can't be seen are still in flight.
                     try:
                         delay_in_ms = float(activity.value) / 1000
                     except TypeError:
@@ -708,25 +747,52 @@ class BotFrameworkAdapter(
 
                     if activity.type == "trace" and activity.channel_id != "emulator":
                         pass
-                    elif activity.reply_to_id:
-                        client = context.turn_state[BotAdapter.BOT_CONNECTOR_CLIENT_KEY]
-                        response = await client.conversations.reply_to_activity(
-                            activity.conversation.id, activity.reply_to_id, activity
-                        )
                     else:
                         client = context.turn_state[BotAdapter.BOT_CONNECTOR_CLIENT_KEY]
-                        response = await client.conversations.send_to_conversation(
-                            activity.conversation.id, activity
+                        response = await pipeline.send(
+                            partial(self._send_activity, client, activity, proactive),
+                            self.pipeline_sends
+                            and activity.type == ActivityTypes.typing
+                            and activity.channel_id
+                            not in self.sequential_send_channels,
                         )
 
-                if not response:
-                    response = ResourceResponse(id=activity.id or "")
+                responses.append((activity, response))
 
-                responses.append(response)
-            return responses
+            await pipeline.wait()
+
+            return [
+                (response.result() if asyncio.isfuture(response) else response)
+                or ResourceResponse(id=activity.id or "")
+                for activity, response in responses
+            ]
         except Exception as error:
             raise error
 
+    async def _send_activity(
+        self,
+        client: ConnectorClient,
+        activity: Activity,
+        proactive: bool,
+        on_request_sent: Callable[[], None] = None,
+    ) -> ResourceResponse:
+        kwargs = {"on_request_sent": on_request_sent} if on_request_sent else {}
+
+        async def send() -> ResourceResponse:
+            if activity.reply_to_id:
+                return await client.conversations.reply_to_activity(
+                    activity.conversation.id, activity.reply_to_id, activity, **kwargs
+                )
+            return await client.conversations.send_to_conversation(
+                activity.conversation.id, activity, **kwargs
+            )
+
+        if self.outbound_scheduler is None:
+            return await send()
+        return await self.outbound_scheduler.send(
+            f"{activity.service_url}|{activity.conversation.id}", send, proactive
+        )
+
     async def delete_conversation_member(
         self, context: TurnContext, member_id: str
     ) -> None:
@@ -1154,9 +1220,16 @@ class BotFrameworkAdapter(
         )
         client = self._connector_client_cache.get(client_key)
         if not client:
-            client = ConnectorClient(credentials, base_url=service_url)
+            client = ConnectorClient(
+                credentials,
+                base_url=service_url,
+                pipeline_type=AsyncBfPipeline,
+                driver=self._connector_client_cache.get_http_driver(
+                    BotFrameworkConnectorConfiguration(credentials, service_url)
+                ),
+            )
             client.config.add_user_agent(USER_AGENT)
-            self._connector_client_cache[client_key] = client
+            self._connector_client_cache.set(client_key, client)
 
         return client
 
@@ -2,31 +2,147 @@
 # Licensed under the MIT License.
 
 from abc import abstractmethod
+from collections import deque
 from copy import deepcopy
-from typing import Callable, Dict, Union
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Union
 from jsonpickle.pickler import Pickler
 from botbuilder.core.state_property_accessor import StatePropertyAccessor
 from .bot_assert import BotAssert
 from .turn_context import TurnContext
-from .storage import Storage
+from .storage import Storage, StoreItemDelta
 from .property_manager import PropertyManager
 
 
+# Immutable values that can be captured by reference in a state snapshot. The type is
+# recorded alongside the value so that, for example, 1 -> True or 1 -> 1.0 is a change.
+_IMMUTABLE_TYPES = frozenset(
+    {int, float, bool, complex, bytes, Decimal, date, datetime, time, timedelta}
+)
+_SEQUENCE_TYPES = (list, tuple, set, frozenset, deque)
+_OBJECT_GETSTATE = getattr(object, "__getstate__", None)
+
+
+class _Reference:
+    """
+    Marks an object that was already visited while taking a snapshot (shared or cyclic reference).
+    """
+
+
+@lru_cache(maxsize=None)
+def _has_plain_instance_state(cls: type) -> bool:
+    # Objects whose pickled state is just their __dict__ can be walked directly. Anything
+    # with custom pickling falls back to jsonpickle so the snapshot reflects the same state.
+    return (
+        getattr(cls, "__getstate__", _OBJECT_GETSTATE) is _OBJECT_GETSTATE
+        and cls.__reduce_ex__ is object.__reduce_ex__
+        and cls.__reduce__ is object.__reduce__
+    )
+
+
+def _snapshot(obj: object, seen: Dict[int, int]) -> object:
+    obj_type = type(obj)
+    if obj_type is str or obj is None:
+        return obj
+    if obj_type in _IMMUTABLE_TYPES:
+        return (obj_type, obj)
+
+    obj_id = id(obj)
+    if obj_id in seen:
+        return (_Reference, seen[obj_id])
+    seen[obj_id] = len(seen)
+
+    if isinstance(obj, dict):
+        return (
+            obj_type,
+            tuple((key, _snapshot(value, seen)) for key, value in obj.items()),
+        )
+    if isinstance(obj, _SEQUENCE_TYPES):
+        return (obj_type, tuple(_snapshot(item, seen) for item in obj))
+    if obj_type is bytearray:
+        return (obj_type, bytes(obj))
+    if hasattr(obj, "__dict__") and _has_plain_instance_state(obj_type):
+        return (
+            obj_type,
+            tuple((key, _snapshot(value, seen)) for key, value in vars(obj).items()),
+        )
+    return (obj_type, str(Pickler().flatten(obj)))
+
+
+def _snapshot_properties(obj: object) -> object:
+    # Each top-level property gets its own snapshot, so a property shared with another one
+    # is captured in full by both and the snapshots can be compared property by property.
+    if isinstance(obj, dict):
+        return (
+            type(obj),
+            tuple((key, _snapshot(value, {})) for key, value in obj.items()),
+        )
+    return _snapshot(obj, {})
+
+
 class CachedBotState:
     """
     Internal cached bot state.
+
+    .. remarks::
+        Changes are detected by comparing a structural snapshot of the state taken when it was
+        loaded (or last saved) against a new snapshot. The snapshot walks dicts, sequences and
+        plain objects directly and only references immutable leaf values, so objects mutated in
+        place are detected without flattening and stringifying the whole state with jsonpickle.
+        Top-level properties are snapshotted separately, which lets :meth:`get_delta` report
+        which of them changed.
     """
 
     def __init__(self, state: Dict[str, object] = None):
         self.state = state if state is not None else {}
         self.hash = self.compute_hash(state)
+        # Whether the state exists in storage, so that a delta can be applied to it.
+        self.persisted = state is not None
 
     @property
     def is_changed(self) -> bool:
         return self.hash != self.compute_hash(self.state)
 
-    def compute_hash(self, obj: object) -> str:
-        return str(Pickler().flatten(obj))
+    def compute_hash(self, obj: object) -> object:
+        return _snapshot_properties(obj)
+
+    def get_delta(self) -> StoreItemDelta:
+        """
+        Gets the properties that changed since the state was loaded or last saved.
+
+        :return: A partial delta, or a delta that replaces the whole state when the state isn't
+            in storage yet, was cleared, or has no changed properties.
+        """
+        previous = self.hash
+        if not (
+            self.persisted
+            and isinstance(self.state, dict)
+            and isinstance(previous, tuple)
+            and isinstance(previous[0], type)
+            and issubclass(previous[0], dict)
+        ):
+            return StoreItemDelta(self.state)
+
+        previous_properties = dict(previous[1])
+        _, current_properties = self.compute_hash(self.state)
+
+        updated = {}
+        for key, snapshot in current_properties:
+            if key != "e_tag" and (
+                key not in previous_properties or previous_properties[key] != snapshot
+            ):
+                updated[key] = self.state[key]
+        removed = [
+            key
+            for key in previous_properties
+            if key != "e_tag" and key not in self.state
+        ]
+
+        if not updated and not removed:
+            return StoreItemDelta(self.state)
+        return StoreItemDelta(self.state, updated, removed)
 
 
 class BotState(PropertyManager):
@@ -103,13 +219,11 @@ class BotState(PropertyManager):
         """
         BotAssert.context_not_none(turn_context)
 
-        cached_state = self.get_cached_state(turn_context)
         storage_key = self.get_storage_key(turn_context)
 
-        if force or not cached_state or not cached_state.state:
+        if self._requires_load(turn_context, force):
             items = await self._storage.read([storage_key])
-            val = items.get(storage_key)
-            turn_context.turn_state[self._context_service_key] = CachedBotState(val)
+            self._set_loaded_state(turn_context, items.get(storage_key))
 
     async def save_changes(
         self, turn_context: TurnContext, force: bool = False
@@ -125,13 +239,33 @@ class BotState(PropertyManager):
         """
         BotAssert.context_not_none(turn_context)
 
-        cached_state = self.get_cached_state(turn_context)
+        cached_state = self._get_state_to_save(turn_context, force)
 
-        if force or (cached_state is not None and cached_state.is_changed):
+        if cached_state is not None:
             storage_key = self.get_storage_key(turn_context)
-            changes: Dict[str, object] = {storage_key: cached_state.state}
-            await self._storage.write(changes)
+            delta = cached_state.get_delta()
+            if delta.is_partial:
+                await self._storage.write_delta({storage_key: delta})
+            else:
+                changes: Dict[str, object] = {storage_key: cached_state.state}
+                await self._storage.write(changes)
             cached_state.hash = cached_state.compute_hash(cached_state.state)
+            cached_state.persisted = True
+
+    def _requires_load(self, turn_context: TurnContext, force: bool) -> bool:
+        cached_state = self.get_cached_state(turn_context)
+        return force or cached_state is None
+
+    def _set_loaded_state(self, turn_context: TurnContext, state: object) -> None:
+        turn_context.turn_state[self._context_service_key] = CachedBotState(state)
+
+    def _get_state_to_save(
+        self, turn_context: TurnContext, force: bool
+    ) -> Optional[CachedBotState]:
+        cached_state = self.get_cached_state(turn_context)
+        if force or (cached_state is not None and cached_state.is_changed):
+            return cached_state
+        return None
 
     async def clear_state(self, turn_context: TurnContext):
         """
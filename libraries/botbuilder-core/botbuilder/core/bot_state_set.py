@@ -1,12 +1,28 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-from typing import List
-from .bot_state import BotState
+# pylint: disable=protected-access
+
+from asyncio import gather
+from typing import Dict, List, Tuple
+
+from .bot_state import BotState, CachedBotState
+from .storage import Storage, StoreItemDelta
 from .turn_context import TurnContext
 
 
 class BotStateSet:
+    """
+    Manages a collection of :class:`BotState` objects that are loaded and saved together.
+
+    .. remarks::
+        States are loaded and saved concurrently. States that share the same :class:`Storage`
+        instance are read with a single multi-key `read` and written with a single multi-key
+        `write`, so a turn costs one storage round trip per distinct storage in each direction.
+        When any of them changed only some properties, the batch is written with
+        :meth:`Storage.write_delta`.
+    """
+
     def __init__(self, bot_states: List[BotState]):
         self.bot_states = list(bot_states)
 
@@ -18,9 +34,83 @@ class BotStateSet:
         return self
 
     async def load_all(self, turn_context: TurnContext, force: bool = False):
+        pending = []
+        batches: Dict[int, Tuple[Storage, List[Tuple[BotState, str]]]] = {}
+
         for bot_state in self.bot_states:
-            await bot_state.load(turn_context, force)
+            if not BotStateSet._can_batch(bot_state):
+                pending.append(bot_state.load(turn_context, force))
+                continue
+
+            storage_key = bot_state.get_storage_key(turn_context)
+            if bot_state._requires_load(turn_context, force):
+                _, states = batches.setdefault(
+                    id(bot_state._storage), (bot_state._storage, [])
+                )
+                states.append((bot_state, storage_key))
+
+        pending.extend(
+            BotStateSet._read_batch(turn_context, storage, states)
+            for storage, states in batches.values()
+        )
+        await gather(*pending)
 
     async def save_all_changes(self, turn_context: TurnContext, force: bool = False):
+        pending = []
+        batches: Dict[int, Tuple[Storage, List[Tuple[CachedBotState, str]]]] = {}
+
         for bot_state in self.bot_states:
-            await bot_state.save_changes(turn_context, force)
+            if not BotStateSet._can_batch(bot_state):
+                pending.append(bot_state.save_changes(turn_context, force))
+                continue
+
+            cached_state = bot_state._get_state_to_save(turn_context, force)
+            if cached_state is not None:
+                _, states = batches.setdefault(
+                    id(bot_state._storage), (bot_state._storage, [])
+                )
+                states.append((cached_state, bot_state.get_storage_key(turn_context)))
+
+        pending.extend(
+            BotStateSet._write_batch(storage, states)
+            for storage, states in batches.values()
+        )
+        await gather(*pending)
+
+    @staticmethod
+    def _can_batch(bot_state: BotState) -> bool:
+        # States that customize loading or saving keep their own implementation.
+        bot_state_type = type(bot_state)
+        return (
+            bot_state_type.load is BotState.load
+            and bot_state_type.save_changes is BotState.save_changes
+        )
+
+    @staticmethod
+    async def _read_batch(
+        turn_context: TurnContext,
+        storage: Storage,
+        states: List[Tuple[BotState, str]],
+    ):
+        items = await storage.read(
+            list(dict.fromkeys(storage_key for _, storage_key in states))
+        )
+        for bot_state, storage_key in states:
+            bot_state._set_loaded_state(turn_context, items.get(storage_key))
+
+    @staticmethod
+    async def _write_batch(storage: Storage, states: List[Tuple[CachedBotState, str]]):
+        deltas: Dict[str, StoreItemDelta] = {
+            storage_key: cached_state.get_delta()
+            for cached_state, storage_key in states
+        }
+        if any(delta.is_partial for delta in deltas.values()):
+            await storage.write_delta(deltas)
+        else:
+            changes: Dict[str, object] = {
+                storage_key: cached_state.state for cached_state, storage_key in states
+            }
+            await storage.write(changes)
+        for cached_state, _ in states:
+            cached_state.hash = cached_state.compute_hash(cached_state.state)
+            cached_state.persisted = True
@@ -0,0 +1,211 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import sys
+from collections import OrderedDict
+from heapq import heapify, heappop, heappush
+from time import monotonic
+from typing import Dict, List, Tuple
+
+from .memory_storage import MemoryStorage
+from .storage import StoreItem, StoreItemDelta
+
+
+def estimate_size(obj: object) -> int:
+    """
+    Estimates the number of bytes used by an object and everything it references.
+    :param obj:
+    :return:
+    """
+    size = 0
+    seen = set()
+    pending = [obj]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            pending.extend(current)
+        elif hasattr(current, "__dict__"):
+            pending.append(vars(current))
+    return size
+
+
+class BoundedMemoryStorage(MemoryStorage):
+    """
+    A :class:`MemoryStorage` with a bounded size and optional expiry.
+
+    .. remarks::
+        Items are evicted least recently used first once `max_items` or `max_bytes` is exceeded,
+        and expire `ttl_seconds` after they were last written. An item can set its own ttl with a
+        `ttl_seconds` property, which is stored with it, or None to use the storage's. E-tags
+        behave exactly like :class:`MemoryStorage`. `hits`, `misses`, `evictions` and
+        `expirations` count what happened to reads and stored items.
+    """
+
+    def __init__(
+        self,
+        max_items: int = None,
+        max_bytes: int = None,
+        ttl_seconds: float = None,
+        dictionary: Dict[str, StoreItem] = None,
+    ):
+        """
+        Initializes a new instance of the :class:`BoundedMemoryStorage` class.
+
+        :param max_items: The maximum number of items to keep, or None for no limit.
+        :param max_bytes: The approximate maximum number of bytes to keep, or None for no limit.
+        :param ttl_seconds: The number of seconds an item without a `ttl_seconds` property is kept
+            after it was last written, or None to keep it until it is evicted.
+        :param dictionary: Optional initial items.
+        """
+        super().__init__(OrderedDict())
+        if max_items is not None and max_items < 1:
+            raise ValueError("BoundedMemoryStorage: max_items must be at least 1.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("BoundedMemoryStorage: max_bytes must be at least 1.")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("BoundedMemoryStorage: ttl_seconds must be positive.")
+
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        # Key -> deadline, and a heap of (deadline, key) in expiry order. Rewritten and removed
+        # items leave their old entries in the heap, which are skipped.
+        self._deadlines: Dict[str, float] = {}
+        self._deadline_heap: List[Tuple[float, str]] = []
+
+        now = monotonic()
+        for key, value in (dictionary or {}).items():
+            self._store(key, value, now)
+        self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        The approximate number of bytes used by the stored items. Only measured when `max_bytes`
+        is set, and 0 otherwise.
+        """
+        return self._total_bytes
+
+    async def read(self, keys: List[str]):
+        data = {}
+        if not keys:
+            return data
+
+        self._expire(monotonic())
+        for key in keys:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                data[key] = self.memory[key]
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return data
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return
+
+        now = monotonic()
+        # Expired items must not take part in the e_tag check.
+        self._expire(now)
+        try:
+            for key, change in changes.items():
+                self._store(key, self._create_new_state(key, change), now)
+        finally:
+            self._evict()
+
+        return self._get_e_tags(changes)
+
+    async def write_delta(self, changes: Dict[str, StoreItemDelta]):
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return
+
+        now = monotonic()
+        self._expire(now)
+        try:
+            for key, delta in changes.items():
+                self._store(key, self._create_patched_state(key, delta), now)
+        finally:
+            self._evict()
+
+        return self._get_e_tags(changes)
+
+    async def delete(self, keys: List[str]):
+        for key in keys:
+            self._remove(key)
+
+    def _store(self, key: str, value: StoreItem, now: float):
+        ttl_seconds = BoundedMemoryStorage._get_ttl_seconds(value)
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        self._remove(key)
+
+        self.memory[key] = value
+        if self.max_bytes is not None:
+            size = estimate_size(value)
+            self._sizes[key] = size
+            self._total_bytes += size
+        if ttl_seconds is not None:
+            deadline = now + ttl_seconds
+            self._deadlines[key] = deadline
+            heappush(self._deadline_heap, (deadline, key))
+            if len(self._deadline_heap) > 2 * len(self._deadlines) + 16:
+                self._deadline_heap = [
+                    (deadline, key) for key, deadline in self._deadlines.items()
+                ]
+                heapify(self._deadline_heap)
+
+    def _remove(self, key: str) -> bool:
+        if key not in self.memory:
+            return False
+
+        del self.memory[key]
+        self._total_bytes -= self._sizes.pop(key, 0)
+        self._deadlines.pop(key, None)
+        return True
+
+    def _expire(self, now: float):
+        while self._deadline_heap and self._deadline_heap[0][0] <= now:
+            deadline, key = heappop(self._deadline_heap)
+            if self._deadlines.get(key) == deadline:
+                self._remove(key)
+                self.expirations += 1
+
+    @staticmethod
+    def _get_ttl_seconds(value: StoreItem) -> float:
+        if isinstance(value, dict):
+            ttl_seconds = value.get("ttl_seconds")
+        else:
+            ttl_seconds = getattr(value, "ttl_seconds", None)
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("BoundedMemoryStorage: ttl_seconds must be positive.")
+        return ttl_seconds
+
+    def _evict(self):
+        while self.memory and (
+            (self.max_items is not None and len(self.memory) > self.max_items)
+            or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self.memory)))
+            self.evictions += 1
@@ -0,0 +1,190 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from collections import OrderedDict
+from copy import deepcopy
+from time import monotonic
+from typing import Awaitable, Dict, List, Tuple
+
+from .storage import Storage, StoreItem, StoreItemDelta
+
+# Cached marker for keys that are known not to exist in the wrapped storage.
+_MISSING = object()
+
+
+class CachingStorage(Storage):
+    """
+    A read-through, write-through cache in front of another :class:`Storage`.
+
+    .. remarks::
+        Items read from or written to the wrapped storage are kept in an in-process LRU cache, so
+        consecutive turns of a conversation handled by the same process are served without a
+        backend read. After a write the cached copy carries the e_tag the wrapped storage reported
+        for it (see :meth:`Storage.write`), so the next write is still checked against the backend.
+        When the wrapped storage doesn't report e_tags for a write, or a write fails (for example on
+        an e_tag conflict caused by another process), the affected keys are dropped and revalidated
+        by the next read.
+        `max_age_seconds` bounds how long an item is served from the cache without revalidation.
+
+        Keys that don't exist are cached as well, for at most `max_missing_age_seconds`, since a
+        key another process created meanwhile looks new to the reader, whose first write with an
+        e_tag of "*" would replace the other process's item.
+
+        Cached items aren't revalidated with a conditional read of their e_tag: :class:`Storage`
+        has no read that skips items whose e_tag still matches, so revalidating would cost the
+        backend read the cache saves. A cached item another process changed instead fails the
+        e_tag check of the next write, which drops it from the cache.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        max_items: int = 1000,
+        max_age_seconds: float = None,
+        max_missing_age_seconds: float = 5,
+    ):
+        """
+        Initializes a new instance of the :class:`CachingStorage` class.
+
+        :param storage: The storage to cache.
+        :type storage: :class:`Storage`
+        :param max_items: The maximum number of keys to cache.
+        :type max_items: int
+        :param max_age_seconds: The number of seconds a cached item is served before it is read again, or None
+            to serve it until it is evicted.
+        :type max_age_seconds: float
+        :param max_missing_age_seconds: The number of seconds a key that doesn't exist is cached
+            before it is read again, or None to cache it as long as items.
+        :type max_missing_age_seconds: float
+        """
+        if storage is None:
+            raise TypeError("CachingStorage: storage can't be None.")
+        if max_items is None or max_items < 1:
+            raise ValueError("CachingStorage: max_items must be at least 1.")
+
+        super().__init__()
+        self.storage = storage
+        self.max_items = max_items
+        self.max_age_seconds = max_age_seconds
+        self.max_missing_age_seconds = max_missing_age_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._cache: Dict[str, Tuple[object, float]] = OrderedDict()
+
+    async def read(self, keys: List[str]):
+        if not keys:
+            return await self.storage.read(keys)
+
+        data = {}
+        missing = []
+        now = monotonic()
+        for key in keys:
+            cached = self._get(key, now)
+            if cached is None:
+                missing.append(key)
+                self.misses += 1
+                continue
+
+            self.hits += 1
+            if cached is not _MISSING:
+                data[key] = deepcopy(cached)
+
+        if missing:
+            items = await self.storage.read(missing)
+            now = monotonic()
+            for key in missing:
+                if key in items:
+                    data[key] = items[key]
+                    self._set(key, deepcopy(items[key]), now)
+                else:
+                    self._set(key, _MISSING, now)
+
+        return data
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        if not changes:
+            return await self.storage.write(changes)
+
+        return await self._write_through(self.storage.write(changes), changes)
+
+    async def write_delta(self, changes: Dict[str, StoreItemDelta]):
+        if not changes:
+            return await self.storage.write_delta(changes)
+
+        return await self._write_through(
+            self.storage.write_delta(changes),
+            {key: delta.item for key, delta in changes.items()},
+        )
+
+    async def delete(self, keys: List[str]):
+        try:
+            await self.storage.delete(keys)
+        except Exception:
+            self._invalidate(keys)
+            raise
+
+        now = monotonic()
+        for key in keys:
+            self._set(key, _MISSING, now)
+
+    async def _write_through(self, write: Awaitable, changes: Dict[str, StoreItem]):
+        try:
+            e_tags = await write
+        except Exception:
+            self._invalidate(changes)
+            raise
+
+        if not isinstance(e_tags, dict):
+            self._invalidate(changes)
+            return e_tags
+
+        now = monotonic()
+        for key, change in changes.items():
+            if key not in e_tags:
+                self._invalidate([key])
+                continue
+
+            cached = deepcopy(change)
+            # None means the item is stored without an e_tag
+            if e_tags[key] is not None:
+                if isinstance(cached, dict):
+                    cached["e_tag"] = e_tags[key]
+                else:
+                    cached.e_tag = e_tags[key]
+            self._set(key, cached, now)
+
+        return e_tags
+
+    def _get(self, key: str, now: float) -> object:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        value, cached_at = entry
+        max_age = self.max_age_seconds
+        if value is _MISSING and self.max_missing_age_seconds is not None:
+            max_age = (
+                self.max_missing_age_seconds
+                if max_age is None
+                else min(max_age, self.max_missing_age_seconds)
+            )
+        if max_age is not None and now - cached_at >= max_age:
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: object, now: float):
+        self._cache[key] = (value, now)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_items:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def _invalidate(self, keys):
+        for key in keys:
+            self._cache.pop(key, None)
@@ -2,10 +2,11 @@
 # Licensed under the MIT License.
 
 from abc import ABC
-from asyncio import sleep
+from asyncio import isfuture, sleep
 from copy import Error
+from functools import partial
 from http import HTTPStatus
-from typing import Awaitable, Callable, List, Union
+from typing import Awaitable, Callable, List, Tuple, Union
 from uuid import uuid4
 
 from botbuilder.core.invoke_response import InvokeResponse
@@ -35,6 +36,8 @@ from botframework.connector.auth.connector_factory import ConnectorFactory
 from botframework.connector.auth.user_token_client import UserTokenClient
 from .bot_adapter import BotAdapter
 from .conversation_reference_extension import get_continuation_activity
+from .outbound_scheduler import OutboundScheduler
+from .send_pipeline import SendPipeline
 from .turn_context import TurnContext
 
 
@@ -43,14 +46,38 @@ class CloudAdapterBase(BotAdapter, ABC):
     USER_TOKEN_CLIENT_KEY = "UserTokenClient"
 
     def __init__(
-        self, bot_framework_authentication: BotFrameworkAuthentication
+        self,
+        bot_framework_authentication: BotFrameworkAuthentication,
+        *,
+        pipeline_sends: bool = False,
+        sequential_send_channels: Tuple[str, ...] = (Channels.ms_teams,),
+        outbound_scheduler: OutboundScheduler = None,
+        lazy_activities: bool = False,
     ) -> None:
+        """
+        :param bot_framework_authentication: The authentication of the bot.
+        :param pipeline_sends: Whether send_activities sends typing activities without waiting
+            for their responses, so the next activity starts once a typing activity has been sent.
+            Other activities are always sent once the previous one arrived, to keep their order.
+            See :class:`SendPipeline`.
+        :param sequential_send_channels: The channels whose activities are always sent one at a
+            time.
+        :param outbound_scheduler: Paces the activities sent to stay under the service rate
+            limits. See :class:`OutboundScheduler`.
+        :param lazy_activities: Whether received activities are deserialized as
+            :class:`LazyActivity`, which deserializes their attachments, entities, channel data and
+            value only when they're read.
+        """
         super().__init__()
 
         if not bot_framework_authentication:
             raise TypeError("Expected BotFrameworkAuthentication but got None instead")
 
         self.bot_framework_authentication = bot_framework_authentication
+        self.pipeline_sends = pipeline_sends
+        self.sequential_send_channels = tuple(sequential_send_channels)
+        self.outbound_scheduler = outbound_scheduler
+        self.lazy_activities = lazy_activities
 
     async def send_activities(
         self, context: TurnContext, activities: List[Activity]
@@ -65,6 +92,12 @@ class CloudAdapterBase(BotAdapter, ABC):
             raise TypeError("Expecting one or more activities, but the list was empty.")
 
         responses = []
+        pipeline = SendPipeline()
+        proactive = (
+            context.activity is not None
+            and context.activity.type == ActivityTypes.event
+            and context.activity.name == ActivityEventNames.continue_conversation
+        )
 
         for activity in activities:
             activity.id = None
@@ -72,6 +105,7 @@ class CloudAdapterBase(BotAdapter, ABC):
             response = ResourceResponse()
 
             if activity.type == "delay":
+                # Only sends whose order can't be seen are still in flight.
                 delay_time = int((activity.value or 1000) / 1000)
                 await sleep(delay_time)
             elif activity.type == ActivityTypes.invoke_response:
@@ -89,22 +123,51 @@ class CloudAdapterBase(BotAdapter, ABC):
                 if not connector_client:
                     raise Error("Unable to extract ConnectorClient from turn context.")
 
-                if activity.reply_to_id:
-                    response = await connector_client.conversations.reply_to_activity(
-                        activity.conversation.id, activity.reply_to_id, activity
-                    )
-                else:
-                    response = (
-                        await connector_client.conversations.send_to_conversation(
-                            activity.conversation.id, activity
-                        )
-                    )
+                response = await pipeline.send(
+                    partial(self._send_activity, connector_client, activity, proactive),
+                    self._can_pipeline_send(activity),
+                )
+
+            responses.append((activity, response))
 
-            response = response or ResourceResponse(id=activity.id or "")
+        await pipeline.wait()
 
-            responses.append(response)
+        return [
+            (response.result() if isfuture(response) else response)
+            or ResourceResponse(id=activity.id or "")
+            for activity, response in responses
+        ]
+
+    def _can_pipeline_send(self, activity: Activity) -> bool:
+        return (
+            self.pipeline_sends
+            and activity.type == ActivityTypes.typing
+            and activity.channel_id not in self.sequential_send_channels
+        )
 
-        return responses
+    async def _send_activity(
+        self,
+        connector_client: ConnectorClient,
+        activity: Activity,
+        proactive: bool,
+        on_request_sent: Callable[[], None] = None,
+    ) -> ResourceResponse:
+        kwargs = {"on_request_sent": on_request_sent} if on_request_sent else {}
+
+        async def send() -> ResourceResponse:
+            if activity.reply_to_id:
+                return await connector_client.conversations.reply_to_activity(
+                    activity.conversation.id, activity.reply_to_id, activity, **kwargs
+                )
+            return await connector_client.conversations.send_to_conversation(
+                activity.conversation.id, activity, **kwargs
+            )
+
+        if self.outbound_scheduler is None:
+            return await send()
+        return await self.outbound_scheduler.send(
+            f"{activity.service_url}|{activity.conversation.id}", send, proactive
+        )
 
     async def update_activity(self, context: TurnContext, activity: Activity):
         if not context:
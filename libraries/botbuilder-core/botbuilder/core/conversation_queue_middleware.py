@@ -0,0 +1,120 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from asyncio import Lock
+from typing import Awaitable, Callable, Dict, List
+
+from botbuilder.schema import ActivityEventNames, ActivityTypes
+
+from .bot_state import CachedBotState
+from .middleware_set import Middleware
+from .turn_context import TurnContext
+
+
+def is_e_tag_conflict(error: Exception) -> bool:
+    """
+    Determines whether an error raised by a storage write is an e_tag conflict.
+
+    .. remarks::
+        Memory and SQLite storage raise a KeyError. The Azure storage providers raise an error with
+        HTTP status code 412 (precondition failed).
+    :param error: The error.
+    :return: True for an e_tag conflict.
+    """
+    if isinstance(error, KeyError) and "Etag conflict" in str(error):
+        return True
+    return getattr(error, "status_code", None) == 412
+
+
+class ConversationQueueMiddleware(Middleware):
+    """
+    Runs the turns of a conversation one at a time, and replays a turn when saving its state fails
+    with an e_tag conflict.
+
+    .. remarks::
+        Turns of the same conversation handled by this process wait for each other in arrival order,
+        so a double send or a channel retry no longer makes two turns load and save the same state
+        concurrently. Turns of other conversations are not affected.
+
+        Continue-conversation turns, like the replies of a skill or proactive messages, don't wait:
+        they are often started by a turn of the same conversation that waits for them, such as a
+        parent bot's turn waiting for its call to a skill, which would never end.
+
+        Another process can still change the state between a turn's load and save. When the rest of
+        the turn raises an e_tag conflict (see :func:`is_e_tag_conflict`), the cached state is
+        dropped, so it is loaded again, and the turn is replayed up to `max_retries` times. A turn
+        that already sent activities is not replayed, since the user would see its replies twice.
+
+        Add this middleware before :class:`AutoSaveStateMiddleware` and any middleware that sends
+        activities.
+    """
+
+    def __init__(self, max_retries: int = 2):
+        """
+        Initializes the middleware.
+
+        :param max_retries: How many times a turn is replayed after an e_tag conflict.
+        """
+        if max_retries is None or max_retries < 0:
+            raise ValueError("max_retries must be greater than or equal to zero")
+
+        self.max_retries = max_retries
+        self.retries = 0
+
+        # Conversation key -> [lock, number of turns holding or waiting for the lock]
+        self._queues: Dict[str, List] = {}
+
+    async def on_turn(
+        self, context: TurnContext, logic: Callable[[TurnContext], Awaitable]
+    ):
+        key = ConversationQueueMiddleware._get_conversation_key(context)
+        if key is None or (
+            context.activity.type == ActivityTypes.event
+            and context.activity.name == ActivityEventNames.continue_conversation
+        ):
+            return await self._run_turn(context, logic)
+
+        queue = self._queues.setdefault(key, [Lock(), 0])
+        queue[1] += 1
+        try:
+            async with queue[0]:
+                return await self._run_turn(context, logic)
+        finally:
+            queue[1] -= 1
+            if not queue[1]:
+                del self._queues[key]
+
+    async def _run_turn(
+        self, context: TurnContext, logic: Callable[[TurnContext], Awaitable]
+    ):
+        attempt = 0
+        while True:
+            try:
+                return await logic()
+            except Exception as error:
+                if (
+                    attempt >= self.max_retries
+                    or context.responded
+                    or not is_e_tag_conflict(error)
+                ):
+                    raise
+
+            attempt += 1
+            self.retries += 1
+            ConversationQueueMiddleware._clear_cached_state(context)
+
+    @staticmethod
+    def _get_conversation_key(context: TurnContext) -> str:
+        activity = context.activity
+        conversation_id = (
+            activity.conversation.id if activity and activity.conversation else None
+        )
+        if not conversation_id:
+            return None
+        return f"{activity.channel_id}/{conversation_id}"
+
+    @staticmethod
+    def _clear_cached_state(context: TurnContext):
+        for key, value in list(context.turn_state.items()):
+            if isinstance(value, CachedBotState):
+                del context.turn_state[key]
@@ -0,0 +1,340 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import json
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from hashlib import blake2b
+from heapq import merge
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+from botbuilder.schema import Activity, ConversationReference
+
+from .conversation_queue_middleware import is_e_tag_conflict
+from .middleware_set import Middleware
+from .storage import Storage
+from .turn_context import TurnContext
+
+
+class ConversationReferenceStore:
+    """
+    Keeps the conversation references of a bot in storage, indexed by user, tenant, channel and
+    team, to find the conversations to message proactively.
+
+    .. remarks::
+        :meth:`save` stores the reference of a turn's conversation. It writes only when the
+        reference changed since it was last saved, so saving on every turn, for example with
+        :class:`ConversationReferenceMiddleware`, costs a storage write per new or changed
+        conversation. The reference is stored without its activity id, which changes every turn
+        and isn't needed to continue a conversation.
+
+        Indexes are storage items listing the keys of their references, split into `index_shards`
+        items per indexed value. They are updated with e_tags, so the store can be shared by
+        several processes over storage that checks e_tags, like :class:`MemoryStorage`,
+        :class:`SqliteStorage` or Cosmos DB storage. Storage that fails conditional writes of
+        missing items, like blob storage, creates shards unconditionally, so concurrent first
+        writes of a shard can lose keys.
+
+        The shards of the `all` and `channel` indexes hold about 1/`index_shards` of every saved
+        key, and a save rewrites each shard it changes in full, so their size and the cost of a
+        save grow with the number of conversations. With the default 16 shards and keys of about
+        100 bytes, a Cosmos DB item, limited to 2 MB, holds the keys of about 300,000
+        conversations. Choose `index_shards` for the expected number of conversations before
+        saving any, since changing it moves the keys to other shards.
+
+        :meth:`find` returns the matching references as an async iterator, read from storage
+        `page_size` at a time, which can be passed to :meth:`BotAdapter.continue_conversations`.
+    """
+
+    INDEXES = ("user", "tenant", "channel", "team")
+
+    def __init__(
+        self,
+        storage: Storage,
+        namespace: str = "conversationReferences",
+        page_size: int = 100,
+        index_shards: int = 16,
+        max_retries: int = 5,
+        max_cached: int = 10000,
+    ):
+        """
+        :param storage: The storage the references and indexes are kept in.
+        :param namespace: The prefix of the storage keys of the store.
+        :param page_size: The number of references read from storage at a time.
+        :param index_shards: The number of storage items each indexed value is split into.
+        :param max_retries: How many times an index update is retried after an e_tag conflict.
+        :param max_cached: The number of saved references remembered, to skip their writes when
+            they didn't change.
+        """
+        if not storage:
+            raise TypeError("ConversationReferenceStore: storage can't be None.")
+        if index_shards < 1:
+            raise ValueError(
+                "ConversationReferenceStore: index_shards must be at least 1."
+            )
+
+        self.storage = storage
+        self.namespace = namespace
+        self.page_size = page_size
+        self.index_shards = index_shards
+        self.max_retries = max_retries
+        self.max_cached = max_cached
+
+        # Reference key -> hash of the reference saved last.
+        self._saved: Dict[str, str] = OrderedDict()
+
+    async def save(self, turn_context: TurnContext) -> bool:
+        """
+        Saves the conversation reference of a turn, if it changed.
+
+        :param turn_context: The context of the turn.
+        :return: True if the reference was written.
+        """
+        return await self.save_activity(turn_context.activity)
+
+    async def save_activity(self, activity: Activity) -> bool:
+        """
+        Saves the conversation reference of an incoming activity, if it changed.
+
+        :param activity: The activity.
+        :return: True if the reference was written.
+        """
+        if not activity or not activity.conversation or not activity.conversation.id:
+            return False
+
+        reference = TurnContext.get_conversation_reference(activity)
+        reference.activity_id = None
+        serialized = reference.serialize()
+        values = {
+            "user": reference.user.id if reference.user else None,
+            "tenant": reference.conversation.tenant_id,
+            "channel": reference.channel_id,
+            "team": self._get_team_id(activity),
+        }
+        reference_hash = blake2b(
+            json.dumps([serialized, values], sort_keys=True).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+
+        key = self._get_reference_key(reference.channel_id, reference.conversation.id)
+        if self._saved.get(key) == reference_hash:
+            self._saved.move_to_end(key)
+            return False
+
+        items = await self.storage.read([key])
+        stored = items.get(key)
+        if stored and stored.get("hash") == reference_hash:
+            self._remember(key, reference_hash)
+            return False
+
+        await self.storage.write(
+            {
+                key: {
+                    "reference": serialized,
+                    "indexes": values,
+                    "hash": reference_hash,
+                    "e_tag": "*",
+                }
+            }
+        )
+
+        old_values = stored.get("indexes", {}) if stored else {}
+        for name in ("all",) + self.INDEXES:
+            old_value = "" if stored and name == "all" else old_values.get(name)
+            new_value = "" if name == "all" else values[name]
+            if old_value != new_value:
+                await self._update_index(name, old_value, key, add=False)
+                await self._update_index(name, new_value, key, add=True)
+
+        self._remember(key, reference_hash)
+        return True
+
+    async def get(self, channel_id: str, conversation_id: str) -> ConversationReference:
+        """
+        Gets the saved reference of a conversation.
+
+        :param channel_id: The id of the conversation's channel.
+        :param conversation_id: The id of the conversation.
+        :return: The reference, or None if there is none.
+        """
+        key = self._get_reference_key(channel_id, conversation_id)
+        items = await self.storage.read([key])
+        item = items.get(key)
+        return ConversationReference.deserialize(item["reference"]) if item else None
+
+    async def delete(self, channel_id: str, conversation_id: str):
+        """
+        Removes the saved reference of a conversation, for example once the bot was removed from
+        it.
+
+        :param channel_id: The id of the conversation's channel.
+        :param conversation_id: The id of the conversation.
+        """
+        key = self._get_reference_key(channel_id, conversation_id)
+        items = await self.storage.read([key])
+        stored = items.get(key)
+        if not stored:
+            return
+
+        await self.storage.delete([key])
+        self._saved.pop(key, None)
+        await self._update_index("all", "", key, add=False)
+        for name, value in stored["indexes"].items():
+            await self._update_index(name, value, key, add=False)
+
+    async def find(
+        self,
+        user_id: str = None,
+        tenant_id: str = None,
+        channel_id: str = None,
+        team_id: str = None,
+    ) -> AsyncIterator[ConversationReference]:
+        """
+        Finds the saved references that match every given value, or every reference when no
+        value is given.
+
+        :param user_id: The id of the user the bot talks to.
+        :param tenant_id: The id of the conversation's tenant.
+        :param channel_id: The id of the conversation's channel.
+        :param team_id: The id of the Teams team the conversation belongs to.
+        :return: The references, in the order of their storage keys.
+        """
+        async for page in self.find_pages(user_id, tenant_id, channel_id, team_id):
+            for reference in page:
+                yield reference
+
+    async def find_pages(
+        self,
+        user_id: str = None,
+        tenant_id: str = None,
+        channel_id: str = None,
+        team_id: str = None,
+    ) -> AsyncIterator[List[ConversationReference]]:
+        """
+        Finds the saved references like :meth:`find`, a page at a time.
+
+        :return: Pages of at most `page_size` references.
+        """
+        criteria = {
+            name: value
+            for name, value in zip(
+                self.INDEXES, (user_id, tenant_id, channel_id, team_id)
+            )
+            if value is not None
+        }
+        index_name, index_value = next(iter(criteria.items()), ("all", ""))
+
+        keys = await self._read_index(index_name, index_value)
+        for start in range(0, len(keys), self.page_size):
+            page_keys = keys[start : start + self.page_size]
+            items = await self.storage.read(page_keys)
+            page = [
+                ConversationReference.deserialize(items[key]["reference"])
+                for key in page_keys
+                if key in items
+                and all(
+                    items[key]["indexes"].get(name) == value
+                    for name, value in criteria.items()
+                )
+            ]
+            if page:
+                yield page
+
+    def _remember(self, key: str, reference_hash: str):
+        self._saved[key] = reference_hash
+        self._saved.move_to_end(key)
+        while len(self._saved) > self.max_cached:
+            self._saved.popitem(last=False)
+
+    async def _read_index(self, name: str, value: str) -> List[str]:
+        shard_keys = [
+            self._get_index_key(name, value, shard)
+            for shard in range(self.index_shards)
+        ]
+        items = await self.storage.read(shard_keys)
+        return list(merge(*[item["keys"] for item in items.values()]))
+
+    async def _update_index(self, name: str, value: str, key: str, add: bool):
+        if value is None:
+            return
+
+        index_key = self._get_index_key(name, value, self._get_shard(key))
+        attempt = 0
+        create_conflicted = False
+        while True:
+            items = await self.storage.read([index_key])
+            item = items.get(index_key)
+            if item is None:
+                # A missing shard is written with an e_tag no other item has, so storage that
+                # checks e_tags fails the write when another writer created the shard first.
+                # Storage that also fails it when the shard is still missing, like blob storage,
+                # can only create it unconditionally.
+                item = {"keys": [], "e_tag": "*" if create_conflicted else uuid4().hex}
+            # Some storage returns its own copy of the item.
+            keys: List[str] = list(item["keys"])
+            position = bisect_left(keys, key)
+            exists = position < len(keys) and keys[position] == key
+            if exists == add:
+                return
+
+            if add:
+                insort(keys, key)
+            else:
+                del keys[position]
+
+            try:
+                # Empty items are kept, since deletes don't check e_tags.
+                await self.storage.write(
+                    {index_key: {"keys": keys, "e_tag": item.get("e_tag", "*")}}
+                )
+                return
+            except Exception as error:
+                if attempt >= self.max_retries or not is_e_tag_conflict(error):
+                    raise
+                create_conflicted = index_key not in items
+            attempt += 1
+
+    def _get_shard(self, key: str) -> int:
+        digest = blake2b(key.encode("utf-8"), digest_size=4).digest()
+        return int.from_bytes(digest, "little") % self.index_shards
+
+    def _get_reference_key(self, channel_id: str, conversation_id: str) -> str:
+        return f"{self.namespace}/references/{channel_id}/{conversation_id}"
+
+    def _get_index_key(self, name: str, value: str, shard: int) -> str:
+        return f"{self.namespace}/indexes/{name}/{value}/{shard}"
+
+    @staticmethod
+    def _get_team_id(activity: Activity) -> str:
+        channel_data = activity.channel_data
+        team = (
+            channel_data.get("team")
+            if isinstance(channel_data, dict)
+            else getattr(channel_data, "team", None)
+        )
+        if isinstance(team, dict):
+            return team.get("id")
+        return getattr(team, "id", None)
+
+
+class ConversationReferenceMiddleware(Middleware):
+    """
+    Saves the conversation reference of every turn to a :class:`ConversationReferenceStore`.
+    """
+
+    def __init__(self, store: ConversationReferenceStore):
+        """
+        Initializes the middleware.
+
+        :param store: The store the references are saved to.
+        """
+        if not store:
+            raise TypeError("ConversationReferenceMiddleware: store can't be None.")
+        self.store = store
+
+    async def on_turn(
+        self, context: TurnContext, logic: Callable[[TurnContext], Awaitable]
+    ):
+        await self.store.save(context)
+        await logic()
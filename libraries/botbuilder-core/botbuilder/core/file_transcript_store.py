@@ -0,0 +1,561 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""The file transcript store keeps transcripts in append-only files on the local disk."""
+
+import asyncio
+import gzip
+import json
+import os
+import re
+import shutil
+import struct
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from hashlib import blake2b
+from typing import Callable, Dict, List, Set, Tuple
+from urllib.parse import quote
+
+from botbuilder.schema import Activity
+
+from .transcript_logger import PagedResult, TranscriptInfo, TranscriptStore
+
+# Index record: sort timestamp, segment number, offset and length of the activity in the segment.
+_INDEX_RECORD = struct.Struct("<dIQI")
+_SEGMENT_PATTERN = re.compile(r"(\d{8})\.jsonl(\.gz)?")
+_INDEX_FILE = "index.bin"
+_TRANSCRIPTS_FILE = "transcripts.jsonl"
+
+# Activities without a timestamp sort as datetime.min, like in MemoryTranscriptStore.
+_MIN_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _sort_timestamp(timestamp: datetime) -> float:
+    # Naive timestamps are taken as UTC.
+    if timestamp is None:
+        return _MIN_TIMESTAMP
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _safe_name(name: str) -> str:
+    # Readable, but unique even on case-insensitive file systems.
+    digest = blake2b(name.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{quote(name, safe='')[:100]}-{digest}"
+
+
+class _Conversation:
+    """The in-memory index and open files of a conversation transcript."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # (sort timestamp, sequence number) of every activity, ascending.
+        self.keys: List[Tuple[float, int]] = []
+        # By sequence number, the order activities were logged in.
+        self.timestamps: List[float] = []
+        self.locations: List[Tuple[int, int, int]] = []
+        self.compressed: Set[int] = set()
+        self.segment = 0
+        self.segment_size = 0
+        self.segment_file = None
+        self.index_file = None
+
+    def close(self):
+        for file in (self.segment_file, self.index_file):
+            if file is not None:
+                file.close()
+        self.segment_file = None
+        self.index_file = None
+
+
+class _Channel:
+    """The transcripts of a channel, from its transcripts file."""
+
+    def __init__(self):
+        # Conversation id -> (created key, created)
+        self.conversations: Dict[str, Tuple[Tuple[float, int], datetime]] = {}
+        # (created key, conversation id) of every transcript, ascending.
+        self.created: List[Tuple[Tuple[float, int], str]] = []
+        self.count = 0
+
+    def add(self, conversation_id: str, created: datetime):
+        key = (_sort_timestamp(created), self.count)
+        self.count += 1
+        self.conversations[conversation_id] = (key, created)
+        insort(self.created, (key, conversation_id))
+
+
+class FileTranscriptStore(TranscriptStore):
+    """A transcript store that keeps every activity in append-only files on the local disk.
+
+    .. remarks::
+        Each conversation has its own folder, with the activities as JSON lines in segment files and
+        a small index of fixed size records holding the timestamp and location of every activity.
+        The index is loaded when a conversation is first used and kept ordered by timestamp, so
+        reading a page only seeks to the activities on it. Segments are closed once they reach
+        `max_segment_bytes` and, with `compress_segments`, compressed with gzip in the background.
+        Each channel keeps a list of its transcripts, which :meth:`list_transcripts` reads from.
+
+        File operations run on a dedicated worker thread. Activities logged together are written
+        with a single flush, so batching writes with :meth:`log_activities` (for example with
+        :class:`TranscriptLoggerMiddleware` in background mode) is much faster than logging them
+        one at a time. With `fsync` set, every write is also synced to disk before it completes.
+        A folder must only be used by one store at a time. Call :meth:`close` on shutdown.
+
+        Continuation tokens are the position of the last activity on the previous page, or the id of
+        the last conversation for :meth:`list_transcripts`.
+    """
+
+    page_size = 20
+
+    def __init__(
+        self,
+        folder: str,
+        max_segment_bytes: int = 4 * 1024 * 1024,
+        compress_segments: bool = True,
+        max_open_conversations: int = 128,
+        fsync: bool = False,
+    ):
+        """
+        :param folder: The folder transcripts are stored in. It is created if it doesn't exist.
+        :param max_segment_bytes: The size a segment file grows to before a new one is started.
+        :param compress_segments: Whether to compress segment files once they are full.
+        :param max_open_conversations: The number of conversations whose index and files are kept open.
+        :param fsync: Whether to sync every write to disk.
+        """
+        if not folder:
+            raise TypeError("FileTranscriptStore: folder is required.")
+        if max_segment_bytes is None or max_segment_bytes < 1:
+            raise ValueError("FileTranscriptStore: max_segment_bytes must be positive.")
+        if max_open_conversations is None or max_open_conversations < 1:
+            raise ValueError(
+                "FileTranscriptStore: max_open_conversations must be at least 1."
+            )
+
+        self.folder = folder
+        self.max_segment_bytes = max_segment_bytes
+        self.compress_segments = compress_segments
+        self.max_open_conversations = max_open_conversations
+        self.fsync = fsync
+
+        self.__executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="FileTranscriptStore"
+        )
+        self.__compressor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="FileTranscriptStoreCompressor"
+        )
+
+        # The state below is only used on the worker thread.
+        self._channels: Dict[str, _Channel] = {}
+        self._conversations: Dict[str, _Conversation] = OrderedDict()
+        self._compressions: List[Tuple[str, Future]] = []
+        # The last decompressed segment: (path, content)
+        self._decompressed: Tuple[str, bytes] = (None, None)
+
+    async def log_activity(self, activity: Activity) -> None:
+        if not activity:
+            raise TypeError("activity cannot be None for log_activity()")
+
+        await self._run(self._append, [activity])
+
+    async def log_activities(self, activities: List[Activity]) -> None:
+        if activities:
+            await self._run(self._append, list(activities))
+
+    async def get_transcript_activities(
+        self,
+        channel_id: str,
+        conversation_id: str,
+        continuation_token: str = None,
+        start_date: datetime = datetime.min,
+    ) -> "PagedResult[Activity]":
+        if not channel_id:
+            raise TypeError("Missing channel_id")
+
+        if not conversation_id:
+            raise TypeError("Missing conversation_id")
+
+        return await self._run(
+            self._read_page, channel_id, conversation_id, continuation_token, start_date
+        )
+
+    async def delete_transcript(self, channel_id: str, conversation_id: str) -> None:
+        if not channel_id:
+            raise TypeError("channel_id should not be None")
+
+        if not conversation_id:
+            raise TypeError("conversation_id should not be None")
+
+        await self._run(self._delete, channel_id, conversation_id)
+
+    async def list_transcripts(
+        self, channel_id: str, continuation_token: str = None
+    ) -> "PagedResult[TranscriptInfo]":
+        if not channel_id:
+            raise TypeError("Missing channel_id")
+
+        return await self._run(self._list, channel_id, continuation_token)
+
+    async def close(self):
+        """
+        Closes open files and waits for segments being compressed.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.__executor, self._close_all)
+        await loop.run_in_executor(None, self.__compressor.shutdown)
+        # Compressed segments are finished on the worker thread.
+        await loop.run_in_executor(self.__executor, self._close_all)
+        self.__executor.shutdown(wait=False)
+
+    async def _run(self, operation: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__executor, operation, *args
+        )
+
+    # The methods below run on the worker thread.
+
+    def _append(self, activities: List[Activity]):
+        written: Dict[int, _Conversation] = {}
+        for activity in activities:
+            conversation = self._get_conversation(
+                activity.channel_id, activity.conversation.id, activity.timestamp
+            )
+            line = (
+                json.dumps(activity.serialize(), separators=(",", ":")).encode("utf-8")
+                + b"\n"
+            )
+            if (
+                conversation.segment_size
+                and conversation.segment_size + len(line) > self.max_segment_bytes
+            ):
+                self._roll_over(conversation)
+            if conversation.segment_file is None:
+                conversation.segment_file = open(
+                    self._segment_path(conversation.directory, conversation.segment),
+                    "ab",
+                )
+                conversation.index_file = open(
+                    os.path.join(conversation.directory, _INDEX_FILE), "ab"
+                )
+
+            timestamp = _sort_timestamp(activity.timestamp)
+            location = (conversation.segment, conversation.segment_size, len(line))
+            conversation.segment_file.write(line)
+            conversation.index_file.write(_INDEX_RECORD.pack(timestamp, *location))
+            conversation.segment_size += len(line)
+
+            insort(conversation.keys, (timestamp, len(conversation.timestamps)))
+            conversation.timestamps.append(timestamp)
+            conversation.locations.append(location)
+            written[id(conversation)] = conversation
+
+        # Segments first, so the index never points past the end of a segment.
+        for files in (
+            [conversation.segment_file for conversation in written.values()],
+            [conversation.index_file for conversation in written.values()],
+        ):
+            for file in files:
+                # None when the conversation was closed to make room for another.
+                if file is not None:
+                    file.flush()
+                    if self.fsync:
+                        os.fsync(file.fileno())
+
+    def _read_page(
+        self,
+        channel_id: str,
+        conversation_id: str,
+        continuation_token: str,
+        start_date: datetime,
+    ) -> PagedResult:
+        paged_result = PagedResult()
+        if conversation_id not in self._get_channel(channel_id).conversations:
+            return paged_result
+
+        conversation = self._get_conversation(channel_id, conversation_id)
+        start = bisect_left(conversation.keys, (_sort_timestamp(start_date), -1))
+        if continuation_token:
+            start = max(start, self._find_after(conversation, continuation_token))
+
+        end = min(start + self.page_size, len(conversation.keys))
+        sequences = [sequence for _, sequence in conversation.keys[start:end]]
+        paged_result.items = self._read_activities(conversation, sequences)
+        if end < len(conversation.keys):
+            paged_result.continuation_token = str(sequences[-1])
+
+        return paged_result
+
+    def _list(self, channel_id: str, continuation_token: str) -> PagedResult:
+        paged_result = PagedResult()
+        channel = self._get_channel(channel_id)
+        if not channel.conversations:
+            return paged_result
+
+        # Transcripts are listed newest first.
+        end = len(channel.created)
+        if continuation_token:
+            conversation = channel.conversations.get(continuation_token)
+            end = (
+                bisect_left(channel.created, (conversation[0], continuation_token))
+                if conversation
+                else 0
+            )
+
+        start = max(end - self.page_size, 0)
+        paged_result.items = [
+            TranscriptInfo(
+                channel_id, channel.conversations[conversation_id][1], conversation_id
+            )
+            for _, conversation_id in reversed(channel.created[start:end])
+        ]
+        if start > 0:
+            paged_result.continuation_token = paged_result.items[-1].id
+
+        return paged_result
+
+    def _delete(self, channel_id: str, conversation_id: str):
+        channel = self._get_channel(channel_id)
+        if conversation_id not in channel.conversations:
+            return
+
+        key, _ = channel.conversations.pop(conversation_id)
+        del channel.created[bisect_left(channel.created, (key, conversation_id))]
+        self._write_transcripts_file(channel_id, channel)
+
+        directory = self._conversation_directory(channel_id, conversation_id)
+        conversation = self._conversations.pop(directory, None)
+        if conversation is not None:
+            conversation.close()
+        wait([future for pending, future in self._compressions if pending == directory])
+        if self._decompressed[0] and self._decompressed[0].startswith(directory):
+            self._decompressed = (None, None)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    def _close_all(self):
+        for conversation in self._conversations.values():
+            conversation.close()
+        self._conversations.clear()
+        self._decompressed = (None, None)
+
+    def _get_channel(self, channel_id: str) -> _Channel:
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = _Channel()
+            path = os.path.join(self.folder, _safe_name(channel_id), _TRANSCRIPTS_FILE)
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A line cut short by a crash.
+                            continue
+                        created = entry.get("created")
+                        channel.add(
+                            entry["id"],
+                            datetime.fromisoformat(created) if created else None,
+                        )
+            self._channels[channel_id] = channel
+        return channel
+
+    def _write_transcripts_file(self, channel_id: str, channel: _Channel):
+        path = os.path.join(self.folder, _safe_name(channel_id), _TRANSCRIPTS_FILE)
+        with open(path + ".tmp", "wb") as file:
+            for _, conversation_id in channel.created:
+                file.write(
+                    self._transcript_entry(
+                        conversation_id, channel.conversations[conversation_id][1]
+                    )
+                )
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def _transcript_entry(conversation_id: str, created: datetime) -> bytes:
+        entry = {
+            "id": conversation_id,
+            "created": created.isoformat() if created else None,
+        }
+        return json.dumps(entry).encode("utf-8") + b"\n"
+
+    def _get_conversation(
+        self, channel_id: str, conversation_id: str, created: datetime = None
+    ) -> _Conversation:
+        directory = self._conversation_directory(channel_id, conversation_id)
+        conversation = self._conversations.get(directory)
+        if conversation is not None:
+            self._conversations.move_to_end(directory)
+            return conversation
+
+        channel = self._get_channel(channel_id)
+        if conversation_id not in channel.conversations:
+            os.makedirs(directory, exist_ok=True)
+            with open(
+                os.path.join(os.path.dirname(directory), _TRANSCRIPTS_FILE), "ab"
+            ) as file:
+                file.write(self._transcript_entry(conversation_id, created))
+            channel.add(conversation_id, created)
+
+        conversation = self._load_conversation(directory)
+        self._conversations[directory] = conversation
+        while len(self._conversations) > self.max_open_conversations:
+            self._conversations.popitem(last=False)[1].close()
+        return conversation
+
+    def _load_conversation(self, directory: str) -> _Conversation:
+        conversation = _Conversation(directory)
+        os.makedirs(directory, exist_ok=True)
+
+        sizes: Dict[int, int] = {}
+        for name in os.listdir(directory):
+            match = _SEGMENT_PATTERN.fullmatch(name)
+            if not match:
+                continue
+            if match.group(2):
+                conversation.compressed.add(int(match.group(1)))
+            else:
+                sizes[int(match.group(1))] = os.path.getsize(
+                    os.path.join(directory, name)
+                )
+        # A segment compressed right before a crash can still have its uncompressed copy.
+        for segment in conversation.compressed.intersection(sizes):
+            os.remove(self._segment_path(directory, segment))
+            del sizes[segment]
+
+        index_path = os.path.join(directory, _INDEX_FILE)
+        index = b""
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as file:
+                index = file.read()
+        complete = len(index) - len(index) % _INDEX_RECORD.size
+        for timestamp, segment, offset, length in _INDEX_RECORD.iter_unpack(
+            index[:complete]
+        ):
+            # Stop at the first activity that didn't reach its segment before a crash.
+            if segment not in conversation.compressed and offset + length > sizes.get(
+                segment, 0
+            ):
+                break
+            conversation.timestamps.append(timestamp)
+            conversation.locations.append((segment, offset, length))
+        if len(conversation.timestamps) * _INDEX_RECORD.size < len(index):
+            with open(index_path, "r+b") as file:
+                file.truncate(len(conversation.timestamps) * _INDEX_RECORD.size)
+
+        conversation.keys = sorted(
+            (timestamp, sequence)
+            for sequence, timestamp in enumerate(conversation.timestamps)
+        )
+
+        segments = conversation.compressed.union(sizes)
+        conversation.segment = max(segments, default=0)
+        if conversation.segment in conversation.compressed:
+            conversation.segment += 1
+        conversation.segment_size = sizes.get(conversation.segment, 0)
+
+        if self.compress_segments:
+            for segment in sizes:
+                if segment != conversation.segment:
+                    self._compress(directory, segment)
+
+        return conversation
+
+    def _roll_over(self, conversation: _Conversation):
+        conversation.close()
+        if self.compress_segments:
+            self._compress(conversation.directory, conversation.segment)
+        conversation.segment += 1
+        conversation.segment_size = 0
+
+    def _compress(self, directory: str, segment: int):
+        self._compressions = [
+            compression
+            for compression in self._compressions
+            if not compression[1].done()
+        ]
+        self._compressions.append(
+            (
+                directory,
+                self.__compressor.submit(self._compress_segment, directory, segment),
+            )
+        )
+
+    def _compress_segment(self, directory: str, segment: int):
+        # Runs on the compression thread. The segment is complete, so it doesn't change anymore.
+        path = self._segment_path(directory, segment)
+        try:
+            with open(path, "rb") as source, gzip.open(
+                path + ".gz.tmp", "wb"
+            ) as target:
+                shutil.copyfileobj(source, target)
+            os.replace(path + ".gz.tmp", path + ".gz")
+        except OSError:
+            # The transcript was deleted.
+            return
+
+        self.__executor.submit(self._segment_compressed, directory, segment)
+
+    def _segment_compressed(self, directory: str, segment: int):
+        conversation = self._conversations.get(directory)
+        if conversation is not None:
+            conversation.compressed.add(segment)
+        try:
+            os.remove(self._segment_path(directory, segment))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _find_after(conversation: _Conversation, continuation_token: str) -> int:
+        try:
+            sequence = int(continuation_token)
+        except ValueError:
+            return len(conversation.keys)
+        if not 0 <= sequence < len(conversation.timestamps):
+            return len(conversation.keys)
+        return bisect_right(
+            conversation.keys, (conversation.timestamps[sequence], sequence)
+        )
+
+    def _read_activities(
+        self, conversation: _Conversation, sequences: List[int]
+    ) -> List[Activity]:
+        content: Dict[int, bytes] = {}
+        by_segment: Dict[int, List[int]] = {}
+        for sequence in sequences:
+            by_segment.setdefault(conversation.locations[sequence][0], []).append(
+                sequence
+            )
+
+        for segment, segment_sequences in by_segment.items():
+            path = self._segment_path(conversation.directory, segment)
+            if segment in conversation.compressed:
+                if self._decompressed[0] != path:
+                    with gzip.open(path + ".gz", "rb") as file:
+                        self._decompressed = (path, file.read())
+                data = self._decompressed[1]
+                for sequence in segment_sequences:
+                    _, offset, length = conversation.locations[sequence]
+                    content[sequence] = data[offset : offset + length]
+            else:
+                with open(path, "rb") as file:
+                    for sequence in sorted(
+                        segment_sequences, key=lambda s: conversation.locations[s][1]
+                    ):
+                        _, offset, length = conversation.locations[sequence]
+                        file.seek(offset)
+                        content[sequence] = file.read(length)
+
+        return [
+            Activity().deserialize(json.loads(content[sequence]))
+            for sequence in sequences
+        ]
+
+    def _conversation_directory(self, channel_id: str, conversation_id: str) -> str:
+        return os.path.join(
+            self.folder, _safe_name(channel_id), _safe_name(conversation_id)
+        )
+
+    @staticmethod
+    def _segment_path(directory: str, segment: int) -> str:
+        return os.path.join(directory, f"{segment:08d}.jsonl")
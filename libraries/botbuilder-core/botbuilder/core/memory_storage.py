@@ -3,7 +3,7 @@
 
 from copy import deepcopy
 from typing import Dict, List
-from .storage import Storage, StoreItem
+from .storage import Storage, StoreItem, StoreItemDelta
 
 
 class MemoryStorage(Storage):
@@ -41,52 +41,113 @@ class MemoryStorage(Storage):
         try:
             # iterate over the changes
             for key, change in changes.items():
-                new_value = deepcopy(change)
-                old_state_etag = None
-
-                # Check if the a matching key already exists in self.memory
-                # If it exists then we want to cache its original value from memory
-                if key in self.memory:
-                    old_state = self.memory[key]
-                    if isinstance(old_state, dict):
-                        old_state_etag = old_state.get("e_tag", None)
-                    elif hasattr(old_state, "e_tag"):
-                        old_state_etag = old_state.e_tag
-
-                new_state = new_value
-
-                # Set ETag if applicable
-                new_value_etag = None
-                if isinstance(new_value, dict):
-                    new_value_etag = new_value.get("e_tag", None)
-                elif hasattr(new_value, "e_tag"):
-                    new_value_etag = new_value.e_tag
-                if new_value_etag == "":
-                    raise Exception("memory_storage.write(): etag missing")
-                if (
-                    old_state_etag is not None
-                    and new_value_etag is not None
-                    and new_value_etag != "*"
-                    and new_value_etag != old_state_etag
-                ):
-                    raise KeyError(
-                        "Etag conflict.\nOriginal: %s\r\nCurrent: %s"
-                        % (new_value_etag, old_state_etag)
-                    )
-
-                # If the original object didn't have an e_tag, don't set one (C# behavior)
-                if old_state_etag:
-                    if isinstance(new_state, dict):
-                        new_state["e_tag"] = str(self._e_tag)
-                    else:
-                        new_state.e_tag = str(self._e_tag)
-
-                self._e_tag += 1
-                self.memory[key] = deepcopy(new_state)
+                self.memory[key] = self._create_new_state(key, change)
 
         except Exception as error:
             raise error
 
+        return self._get_e_tags(changes)
+
+    async def write_delta(self, changes: Dict[str, StoreItemDelta]):
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return
+
+        for key, delta in changes.items():
+            self.memory[key] = self._create_patched_state(key, delta)
+
+        return self._get_e_tags(changes)
+
+    def _get_e_tags(self, keys) -> Dict[str, str]:
+        e_tags = {}
+        for key in keys:
+            state = self.memory.get(key)
+            e_tags[key] = (
+                state.get("e_tag", None)
+                if isinstance(state, dict)
+                else getattr(state, "e_tag", None)
+            )
+        return e_tags
+
+    def _create_new_state(self, key: str, change: StoreItem) -> StoreItem:
+        """
+        Copies a change, validates its e_tag against the stored value and stamps the new e_tag.
+        The returned copy is owned by the storage, so it is stored without copying again.
+        :param key:
+        :param change:
+        :return:
+        """
+        return self._set_new_e_tag(key, deepcopy(change))
+
+    def _create_patched_state(self, key: str, delta: StoreItemDelta) -> StoreItem:
+        """
+        Applies a delta to a copy of the stored value, copying only the changed properties.
+        Deltas that can't be applied to the stored value are written in full.
+        :param key:
+        :param delta:
+        :return:
+        """
+        old_state = self.memory.get(key)
+        if (
+            not delta.is_partial
+            or not isinstance(old_state, dict)
+            or not isinstance(delta.item, dict)
+        ):
+            return self._create_new_state(key, delta.item)
+
+        new_state = dict(old_state)
+        for name, value in delta.updated_properties.items():
+            new_state[name] = deepcopy(value)
+        for name in delta.removed_properties:
+            new_state.pop(name, None)
+        new_state.pop("e_tag", None)
+        if "e_tag" in delta.item:
+            new_state["e_tag"] = delta.item["e_tag"]
+
+        return self._set_new_e_tag(key, new_state)
+
+    def _set_new_e_tag(self, key: str, new_state: StoreItem) -> StoreItem:
+        old_state_etag = None
+
+        # Check if the a matching key already exists in self.memory
+        # If it exists then we want to cache its original value from memory
+        if key in self.memory:
+            old_state = self.memory[key]
+            if isinstance(old_state, dict):
+                old_state_etag = old_state.get("e_tag", None)
+            elif hasattr(old_state, "e_tag"):
+                old_state_etag = old_state.e_tag
+
+        # Set ETag if applicable
+        new_value_etag = None
+        if isinstance(new_state, dict):
+            new_value_etag = new_state.get("e_tag", None)
+        elif hasattr(new_state, "e_tag"):
+            new_value_etag = new_state.e_tag
+        if new_value_etag == "":
+            raise Exception("memory_storage.write(): etag missing")
+        if (
+            old_state_etag is not None
+            and new_value_etag is not None
+            and new_value_etag != "*"
+            and new_value_etag != old_state_etag
+        ):
+            raise KeyError(
+                "Etag conflict.\nOriginal: %s\r\nCurrent: %s"
+                % (new_value_etag, old_state_etag)
+            )
+
+        # If the original object didn't have an e_tag, don't set one (C# behavior)
+        if old_state_etag:
+            if isinstance(new_state, dict):
+                new_state["e_tag"] = str(self._e_tag)
+            else:
+                new_state.e_tag = str(self._e_tag)
+
+        self._e_tag += 1
+        return new_state
+
     # TODO: Check if needed, if not remove
     def __should_write_changes(
         self, old_value: StoreItem, new_value: StoreItem
@@ -2,40 +2,150 @@
 # Licensed under the MIT License.
 """The memory transcript store stores transcripts in volatile memory."""
 import datetime
-from typing import List, Dict
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Dict, List, Tuple
 from botbuilder.schema import Activity
 from .transcript_logger import PagedResult, TranscriptInfo, TranscriptStore
 
+# Activities and transcripts are ordered by (timestamp, sequence number), so activities with the
+# same timestamp keep the order they were logged in.
+_SortKey = Tuple[datetime.datetime, int]
+
+
+def _timestamp_key(timestamp: datetime.datetime) -> datetime.datetime:
+    # Naive and aware timestamps can't be compared, so aware ones are compared as naive UTC.
+    if timestamp is None:
+        return datetime.datetime.min
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+class _Transcript:
+    """The activities of a conversation, ordered by timestamp."""
+
+    def __init__(self, created: datetime.datetime, created_key: _SortKey):
+        self.created = created
+        self.created_key = created_key
+        self.keys: List[_SortKey] = []
+        self.activities: List[Activity] = []
+        # Activity id -> sort key, or None when several activities share the id.
+        self.ids: Dict[str, _SortKey] = {}
+
+    def add(self, activity: Activity, key: _SortKey):
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.activities.insert(index, activity)
+
+        if activity.id:
+            self.ids[activity.id] = None if activity.id in self.ids else key
+
+    def remove_oldest(self):
+        self.keys.pop(0)
+        activity = self.activities.pop(0)
+        if activity.id and self.ids.get(activity.id) is not None:
+            del self.ids[activity.id]
+
+    def get_continuation_token(self, index: int) -> str:
+        # The id of the activity when it identifies the activity, its sort key otherwise.
+        activity_id = self.activities[index].id
+        key = self.keys[index]
+        if activity_id and self.ids.get(activity_id) == key:
+            return activity_id
+        return f"#{key[1]}#{key[0].isoformat()}"
+
+    def find_after(self, continuation_token: str) -> int:
+        key = self.ids.get(continuation_token)
+        if key is None and continuation_token.startswith("#"):
+            try:
+                sequence, timestamp = continuation_token[1:].split("#", 1)
+                key = (datetime.datetime.fromisoformat(timestamp), int(sequence))
+            except ValueError:
+                key = None
+        if key is None:
+            return len(self.keys)
+        return bisect_right(self.keys, key)
+
 
-# pylint: disable=line-too-long
 class MemoryTranscriptStore(TranscriptStore):
     """This provider is most useful for simulating production storage when running locally against the
     emulator or as part of a unit test.
+
+    .. remarks::
+        Activities are kept ordered by timestamp as they are logged, and pages are found by binary
+        search, so reading a page doesn't depend on the length of the transcript. Continuation tokens
+        are the id of the last activity or conversation of the previous page.
+
+        When `max_activities_per_conversation` is set, the oldest activities of a conversation are
+        dropped beyond it. When `max_activities` is set, the oldest activities of the least recently
+        active conversations are dropped once the store holds more activities in total.
     """
 
-    channels: Dict[str, Dict[str, Activity]] = {}
+    page_size = 20
+
+    def __init__(
+        self, max_activities_per_conversation: int = None, max_activities: int = None
+    ):
+        """
+        :param max_activities_per_conversation: The number of activities kept per conversation, or None
+            to keep all of them.
+        :param max_activities: The number of activities kept in the store, or None to keep all of them.
+        """
+        if max_activities_per_conversation is not None and (
+            max_activities_per_conversation < 1
+        ):
+            raise ValueError("max_activities_per_conversation must be at least 1")
+        if max_activities is not None and max_activities < 1:
+            raise ValueError("max_activities must be at least 1")
+
+        self.max_activities_per_conversation = max_activities_per_conversation
+        self.max_activities = max_activities
+        self.activity_count = 0
+
+        # Channel id -> conversation id -> transcript.
+        self.channels: Dict[str, Dict[str, _Transcript]] = {}
+        # Channel id -> (created key, conversation id) of its transcripts, ascending.
+        self._created: Dict[str, List[Tuple[_SortKey, str]]] = {}
+        # (channel id, conversation id) of every transcript, least recently logged to first.
+        self._recent: Dict[Tuple[str, str], None] = OrderedDict()
+        self._sequence = 0
 
     async def log_activity(self, activity: Activity) -> None:
         if not activity:
             raise TypeError("activity cannot be None for log_activity()")
 
-        # get channel
-        channel = {}
-        if not activity.channel_id in self.channels:
-            channel = {}
-            self.channels[activity.channel_id] = channel
-        else:
-            channel = self.channels[activity.channel_id]
-
-        # Get conversation transcript.
-        transcript = []
-        if activity.conversation.id in channel:
-            transcript = channel[activity.conversation.id]
-        else:
-            transcript = []
-            channel[activity.conversation.id] = transcript
-
-        transcript.append(activity)
+        channel_id = activity.channel_id
+        conversation_id = activity.conversation.id
+        self._sequence += 1
+        key = (_timestamp_key(activity.timestamp), self._sequence)
+
+        channel = self.channels.setdefault(channel_id, {})
+        transcript = channel.get(conversation_id)
+        if transcript is None:
+            transcript = _Transcript(activity.timestamp, key)
+            channel[conversation_id] = transcript
+            insort(self._created.setdefault(channel_id, []), (key, conversation_id))
+
+        transcript.add(activity, key)
+        self.activity_count += 1
+
+        self._recent[(channel_id, conversation_id)] = None
+        self._recent.move_to_end((channel_id, conversation_id))
+
+        if self.max_activities_per_conversation is not None:
+            while len(transcript.keys) > self.max_activities_per_conversation:
+                transcript.remove_oldest()
+                self.activity_count -= 1
+
+        if self.max_activities is not None:
+            while self.activity_count > self.max_activities:
+                oldest_channel_id, oldest_conversation_id = next(iter(self._recent))
+                oldest = self.channels[oldest_channel_id][oldest_conversation_id]
+                oldest.remove_oldest()
+                self.activity_count -= 1
+                if not oldest.keys:
+                    self._remove_transcript(oldest_channel_id, oldest_conversation_id)
 
     async def get_transcript_activities(
         self,
@@ -51,38 +161,20 @@ class MemoryTranscriptStore(TranscriptStore):
             raise TypeError("Missing conversation_id")
 
         paged_result = PagedResult()
-        if channel_id in self.channels:
-            channel = self.channels[channel_id]
-            if conversation_id in channel:
-                transcript = channel[conversation_id]
-                if continuation_token:
-                    paged_result.items = (
-                        [
-                            x
-                            for x in sorted(
-                                transcript,
-                                key=lambda x: x.timestamp or str(datetime.datetime.min),
-                                reverse=False,
-                            )
-                            if x.timestamp >= start_date
-                        ]
-                        .dropwhile(lambda x: x.id != continuation_token)
-                        .Skip(1)[:20]
-                    )
-                    if paged_result.items.count == 20:
-                        paged_result.continuation_token = paged_result.items[-1].id
-                else:
-                    paged_result.items = [
-                        x
-                        for x in sorted(
-                            transcript,
-                            key=lambda x: x.timestamp or datetime.datetime.min,
-                            reverse=False,
-                        )
-                        if (x.timestamp or datetime.datetime.min) >= start_date
-                    ][:20]
-                    if paged_result.items.count == 20:
-                        paged_result.continuation_token = paged_result.items[-1].id
+        transcript = self.channels.get(channel_id, {}).get(conversation_id)
+        if transcript is None:
+            return paged_result
+
+        start = bisect_left(
+            transcript.keys, (_timestamp_key(start_date or datetime.datetime.min), 0)
+        )
+        if continuation_token:
+            start = max(start, transcript.find_after(continuation_token))
+
+        end = min(start + self.page_size, len(transcript.keys))
+        paged_result.items = transcript.activities[start:end]
+        if end < len(transcript.keys):
+            paged_result.continuation_token = transcript.get_continuation_token(end - 1)
 
         return paged_result
 
@@ -93,9 +185,9 @@ class MemoryTranscriptStore(TranscriptStore):
         if not conversation_id:
             raise TypeError("conversation_id should not be None")
 
-        if channel_id in self.channels:
-            if conversation_id in self.channels[channel_id]:
-                del self.channels[channel_id][conversation_id]
+        if conversation_id in self.channels.get(channel_id, {}):
+            self.activity_count -= len(self.channels[channel_id][conversation_id].keys)
+            self._remove_transcript(channel_id, conversation_id)
 
     async def list_transcripts(
         self, channel_id: str, continuation_token: str = None
@@ -104,49 +196,42 @@ class MemoryTranscriptStore(TranscriptStore):
             raise TypeError("Missing channel_id")
 
         paged_result = PagedResult()
-
-        if channel_id in self.channels:
-            channel: Dict[str, List[Activity]] = self.channels[channel_id]
-
-            if continuation_token:
-                paged_result.items = (
-                    sorted(
-                        [
-                            TranscriptInfo(
-                                channel_id,
-                                c.value()[0].timestamp if c.value() else None,
-                                c.id,
-                            )
-                            for c in channel
-                        ],
-                        key=lambda x: x.created,
-                        reverse=True,
-                    )
-                    .dropwhile(lambda x: x.id != continuation_token)
-                    .Skip(1)
-                    .Take(20)
-                )
-                if paged_result.items.count == 20:
-                    paged_result.continuation_token = paged_result.items[-1].id
-            else:
-                paged_result.items = (
-                    sorted(
-                        [
-                            TranscriptInfo(
-                                channel_id,
-                                c.value()[0].timestamp if c.value() else None,
-                                c.id,
-                            )
-                            for c in channel
-                        ],
-                        key=lambda x: x.created,
-                        reverse=True,
-                    )
-                    .dropwhile(lambda x: x.id != continuation_token)
-                    .Skip(1)
-                    .Take(20)
-                )
-                if paged_result.items.count == 20:
-                    paged_result.continuation_token = paged_result.items[-1].id
+        if channel_id not in self.channels:
+            return paged_result
+
+        # Transcripts are listed newest first.
+        created = self._created[channel_id]
+        end = len(created)
+        if continuation_token:
+            transcript = self.channels[channel_id].get(continuation_token)
+            end = (
+                bisect_left(created, (transcript.created_key, continuation_token))
+                if transcript
+                else 0
+            )
+
+        start = max(end - self.page_size, 0)
+        paged_result.items = [
+            TranscriptInfo(
+                channel_id,
+                self.channels[channel_id][conversation_id].created,
+                conversation_id,
+            )
+            for _, conversation_id in reversed(created[start:end])
+        ]
+        if start > 0:
+            paged_result.continuation_token = paged_result.items[-1].id
 
         return paged_result
+
+    def _remove_transcript(self, channel_id: str, conversation_id: str):
+        channel = self.channels[channel_id]
+        transcript = channel.pop(conversation_id)
+
+        created = self._created[channel_id]
+        del created[bisect_left(created, (transcript.created_key, conversation_id))]
+        if not channel:
+            del self.channels[channel_id]
+            del self._created[channel_id]
+
+        del self._recent[(channel_id, conversation_id)]
@@ -0,0 +1,259 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import random
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = monotonic()
+        self.blocked_until = 0.0
+        # Sends of a conversation take their tokens in order.
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def get_delay(self, now: float) -> float:
+        self.refill(now)
+        delay = self.blocked_until - now
+        if self.tokens < 1:
+            delay = max(delay, (1 - self.tokens) / self.rate)
+        return delay
+
+    def take(self):
+        self.tokens -= 1
+
+    def block(self, until: float):
+        self.blocked_until = max(self.blocked_until, until)
+
+    def is_idle(self, now: float) -> bool:
+        self.refill(now)
+        return (
+            not self.users and self.tokens >= self.burst and self.blocked_until <= now
+        )
+
+
+def _is_throttled(error: Exception) -> bool:
+    return getattr(getattr(error, "response", None), "status_code", None) == 429
+
+
+def _get_retry_after(error: Exception) -> float:
+    # Retry-After holds either a number of seconds or an HTTP date.
+    value = (getattr(error.response, "headers", None) or {}).get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class OutboundScheduler:
+    """
+    Paces the activities a bot sends to stay under the Connector service rate limits, and sends
+    them again when they are throttled.
+
+    .. remarks::
+        Every send takes a token from the bucket of its conversation and from the bucket shared by
+        the bot. Buckets hold up to `burst` tokens and are refilled with `rate` tokens per second,
+        so short bursts go out right away and longer ones are spread out. Sends of a conversation
+        take their tokens in order.
+
+        A throttled (HTTP 429) send is sent again up to `max_retries` times. It waits as long as
+        its `Retry-After` header asks, and the other sends of its conversation wait as well, or
+        with exponential backoff when there is no header. Waits are lengthened by up to `jitter`
+        of their length, so throttled senders don't all retry at the same moment.
+
+        Proactive sends, those of :meth:`BotAdapter.continue_conversation`, yield the shared bucket
+        to sends that reply to a user.
+
+        Pass the scheduler as the `outbound_scheduler` of an adapter. A retried typing activity
+        may arrive after later activities of its batch when the adapter's `pipeline_sends` is set.
+    """
+
+    def __init__(
+        self,
+        conversation_rate: float = 1.0,
+        conversation_burst: int = 7,
+        global_rate: float = 50.0,
+        global_burst: int = 50,
+        max_retries: int = 3,
+        max_retry_after: float = 60.0,
+        backoff_seconds: float = 1.0,
+        jitter: float = 0.2,
+        max_conversations: int = 10000,
+    ):
+        """
+        :param conversation_rate: The sustained number of sends per second to a conversation.
+        :param conversation_burst: The number of sends to a conversation that go out without wait.
+        :param global_rate: The sustained number of sends per second of the bot.
+        :param global_burst: The number of sends of the bot that go out without wait.
+        :param max_retries: How many times a throttled send is sent again.
+        :param max_retry_after: The longest `Retry-After`, in seconds, that is waited for. A send
+            asked to wait longer fails with the throttled response.
+        :param backoff_seconds: The wait before the first retry when there is no `Retry-After`.
+        :param jitter: The largest fraction of a wait that is added to it at random.
+        :param max_conversations: The number of conversation buckets kept. Buckets of idle
+            conversations are dropped beyond this.
+        """
+        if conversation_rate <= 0 or global_rate <= 0:
+            raise ValueError("OutboundScheduler: rates must be greater than zero.")
+        if conversation_burst < 1 or global_burst < 1:
+            raise ValueError("OutboundScheduler: bursts must be at least 1.")
+
+        self.conversation_rate = conversation_rate
+        self.conversation_burst = conversation_burst
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self.backoff_seconds = backoff_seconds
+        self.jitter = jitter
+        self.max_conversations = max_conversations
+
+        self._global = _TokenBucket(global_rate, global_burst)
+        self._conversations: Dict[str, _TokenBucket] = OrderedDict()
+
+        self._queued = {False: 0, True: 0}
+        self._interactive_waiting = 0
+        self._in_flight = 0
+        self._throttled = 0
+        self._retried = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of sends waiting for their turn.
+        """
+        return self._queued[False] + self._queued[True]
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Gets a snapshot of the scheduler's queues and counters, for example to report them to a
+        :class:`BotTelemetryClient` with `track_metric`.
+
+        :return: The interactive and proactive queue depths, the sends in flight, the number of
+            throttled responses and retries so far, and the number of tracked conversations.
+        """
+        return {
+            "interactive_queue_depth": self._queued[False],
+            "proactive_queue_depth": self._queued[True],
+            "in_flight": self._in_flight,
+            "throttled": self._throttled,
+            "retried": self._retried,
+            "conversations": len(self._conversations),
+        }
+
+    async def send(
+        self,
+        conversation_key: str,
+        send: Callable[[], Awaitable[T]],
+        proactive: bool = False,
+    ) -> T:
+        """
+        Sends when the rate limits allow it, and again when the send is throttled.
+
+        :param conversation_key: The key of the conversation, for example its service url and id.
+        :param send: Sends the activity. Called again for each retry.
+        :param proactive: True if the send doesn't reply to a user.
+        :return: The result of the send.
+        """
+        bucket = self._get_bucket(conversation_key)
+        try:
+            attempt = 0
+            while True:
+                await self._acquire(bucket, proactive)
+
+                self._in_flight += 1
+                try:
+                    return await send()
+                except Exception as error:
+                    if not _is_throttled(error):
+                        raise
+                    self._throttled += 1
+
+                    retry_after = _get_retry_after(error)
+                    if attempt >= self.max_retries or (
+                        retry_after is not None and retry_after > self.max_retry_after
+                    ):
+                        raise
+                    if retry_after is None:
+                        retry_after = self.backoff_seconds * (2**attempt)
+                    bucket.block(
+                        monotonic() + retry_after * (1 + random.uniform(0, self.jitter))
+                    )
+                finally:
+                    self._in_flight -= 1
+
+                attempt += 1
+                self._retried += 1
+        finally:
+            bucket.users -= 1
+
+    async def _acquire(self, bucket: _TokenBucket, proactive: bool):
+        self._queued[proactive] += 1
+        waiting_for_global = False
+        try:
+            async with bucket.lock:
+                while True:
+                    now = monotonic()
+                    delay = bucket.get_delay(now)
+                    if delay <= 0:
+                        global_delay = self._global.get_delay(now)
+                        if global_delay <= 0 and not (
+                            proactive and self._interactive_waiting
+                        ):
+                            bucket.take()
+                            self._global.take()
+                            return
+
+                        if not proactive and not waiting_for_global:
+                            waiting_for_global = True
+                            self._interactive_waiting += 1
+                        delay = max(global_delay, 1 / self._global.rate)
+
+                    await asyncio.sleep(delay)
+        finally:
+            self._queued[proactive] -= 1
+            if waiting_for_global:
+                self._interactive_waiting -= 1
+
+    def _get_bucket(self, conversation_key: str) -> _TokenBucket:
+        bucket = self._conversations.get(conversation_key)
+        if bucket is None:
+            bucket = _TokenBucket(self.conversation_rate, self.conversation_burst)
+            self._conversations[conversation_key] = bucket
+        else:
+            self._conversations.move_to_end(conversation_key)
+        bucket.users += 1
+
+        if len(self._conversations) > self.max_conversations:
+            self._drop_idle_buckets()
+        return bucket
+
+    def _drop_idle_buckets(self):
+        now = monotonic()
+        for key in list(self._conversations):
+            if len(self._conversations) <= self.max_conversations:
+                break
+            if self._conversations[key].is_idle(now):
+                del self._conversations[key]
@@ -0,0 +1,287 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import random
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Set,
+    Union,
+)
+
+from msrest.exceptions import ClientRequestError
+
+from botbuilder.schema import ConversationReference
+
+from .storage import Storage
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, (ClientRequestError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+class FanOutResult:
+    """
+    The outcome of continuing one conversation of a :class:`ProactiveFanOut`.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        reference: ConversationReference,
+        error: Exception = None,
+        attempts: int = 1,
+    ):
+        """
+        :param index: The position of the reference in the references of the fan-out.
+        :param reference: The reference of the conversation.
+        :param error: The error of the last attempt, or None if the conversation was continued.
+        :param attempts: How many times the conversation was continued.
+        """
+        self.index = index
+        self.reference = reference
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class FanOutCheckpoint:
+    """
+    Records in storage which references of a :class:`ProactiveFanOut` were handled, so a fan-out
+    that was interrupted can resume where it stopped.
+
+    .. remarks::
+        References are identified by their position, so a resumed fan-out must be given the same
+        references in the same order. References are recorded once handled, whether they
+        succeeded or failed, and the record is saved every `save_every` references and when the
+        fan-out ends.
+    """
+
+    def __init__(self, storage: Storage, key: str, save_every: int = 100):
+        """
+        :param storage: The storage the checkpoint is saved to.
+        :param key: The storage key of the checkpoint, for example the id of the broadcast.
+        :param save_every: The number of handled references between saves.
+        """
+        if not storage:
+            raise TypeError("FanOutCheckpoint: storage can't be None.")
+        if not key:
+            raise TypeError("FanOutCheckpoint: key can't be empty.")
+
+        self.storage = storage
+        self.key = key
+        self.save_every = save_every
+
+        # Every reference before position was handled, as was every one in handled.
+        self.position = 0
+        self.handled: Set[int] = set()
+        self._unsaved = 0
+
+    async def load(self):
+        """
+        Loads the checkpoint from storage. A missing checkpoint starts at the first reference.
+        """
+        items = await self.storage.read([self.key])
+        item = items.get(self.key)
+        if item:
+            self.position = item["position"]
+            self.handled = set(item["handled"])
+        self._unsaved = 0
+
+    async def save(self):
+        """
+        Saves the checkpoint to storage.
+        """
+        await self.storage.write(
+            {
+                self.key: {
+                    "position": self.position,
+                    "handled": sorted(self.handled),
+                    "e_tag": "*",
+                }
+            }
+        )
+        self._unsaved = 0
+
+    async def delete(self):
+        """
+        Removes the checkpoint from storage, for example once the fan-out completed.
+        """
+        await self.storage.delete([self.key])
+
+    def is_handled(self, index: int) -> bool:
+        return index < self.position or index in self.handled
+
+    async def set_handled(self, index: int):
+        """
+        Records a reference as handled, and saves the checkpoint every `save_every` references.
+
+        :param index: The position of the reference.
+        """
+        self.handled.add(index)
+        while self.position in self.handled:
+            self.handled.remove(self.position)
+            self.position += 1
+
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            await self.save()
+
+
+class ProactiveFanOut:
+    """
+    Continues many conversations, a bounded number at a time, and streams the outcome of each one.
+
+    .. remarks::
+        Iterate the fan-out to run it and get a :class:`FanOutResult` per conversation, in the
+        order they complete, or await :meth:`run` to run it to the end. References are read from
+        `references` only as conversations complete, so a large broadcast can be streamed from
+        storage without being loaded in memory.
+
+        A conversation that fails with a transient error, a connection error, a timeout, or a
+        throttled (429) or server (5xx) response, is continued again up to `max_retries` times with
+        exponential backoff. Since the whole turn is run again, its callback should not have sent
+        anything before the error, for example by sending a single activity.
+
+        The `succeeded`, `failed`, `skipped` and `retried` counters report the progress, and
+        `on_progress` is called with the fan-out each time a conversation completes. With a
+        `checkpoint`, conversations handled by an earlier run of the same broadcast are skipped.
+
+        Create fan-outs with :meth:`BotAdapter.continue_conversations`.
+    """
+
+    def __init__(
+        self,
+        continue_conversation: Callable[[ConversationReference], Awaitable],
+        references: Union[
+            Iterable[ConversationReference], AsyncIterable[ConversationReference]
+        ],
+        max_concurrency: int = 32,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        checkpoint: FanOutCheckpoint = None,
+        on_progress: Callable[["ProactiveFanOut"], None] = None,
+    ):
+        """
+        :param continue_conversation: Continues one conversation.
+        :param references: The references of the conversations to continue.
+        :param max_concurrency: The number of conversations continued at the same time.
+        :param max_retries: How many times a conversation that failed with a transient error is
+            continued again.
+        :param backoff_seconds: The wait before the first retry.
+        :param checkpoint: Records the handled conversations, to resume an interrupted fan-out.
+        :param on_progress: Called with the fan-out each time a conversation completes.
+        """
+        if max_concurrency is None or max_concurrency < 1:
+            raise ValueError("ProactiveFanOut: max_concurrency must be at least 1.")
+
+        self.continue_conversation = continue_conversation
+        self.references = references
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.checkpoint = checkpoint
+        self.on_progress = on_progress
+
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.retried = 0
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    def __aiter__(self) -> AsyncIterator[FanOutResult]:
+        return self._run()
+
+    async def run(self) -> "ProactiveFanOut":
+        """
+        Runs the fan-out to the end.
+
+        :return: The fan-out, with its counters.
+        """
+        async for _ in self:
+            pass
+        return self
+
+    async def _run(self) -> AsyncIterator[FanOutResult]:
+        if self.checkpoint:
+            await self.checkpoint.load()
+
+        references = self._read_references()
+        running = set()
+        index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(running) < self.max_concurrency:
+                    try:
+                        reference = await references.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+
+                    if self.checkpoint and self.checkpoint.is_handled(index):
+                        self.skipped += 1
+                    else:
+                        running.add(
+                            asyncio.ensure_future(self._continue(index, reference))
+                        )
+                    index += 1
+
+                if not running:
+                    break
+
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result: FanOutResult = task.result()
+                    if result.succeeded:
+                        self.succeeded += 1
+                    else:
+                        self.failed += 1
+                    if self.checkpoint:
+                        await self.checkpoint.set_handled(result.index)
+                    if self.on_progress:
+                        self.on_progress(self)
+                    yield result
+        finally:
+            for task in running:
+                task.cancel()
+            if self.checkpoint:
+                await self.checkpoint.save()
+
+    async def _read_references(self) -> AsyncIterator[ConversationReference]:
+        if hasattr(self.references, "__aiter__"):
+            async for reference in self.references:
+                yield reference
+        else:
+            for reference in self.references:
+                yield reference
+
+    async def _continue(self, index: int, reference: ConversationReference):
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await self.continue_conversation(reference)
+                return FanOutResult(index, reference, attempts=attempt)
+            except Exception as error:  # pylint: disable=broad-except
+                if attempt > self.max_retries or not _is_transient(error):
+                    return FanOutResult(index, reference, error, attempt)
+
+            self.retried += 1
+            delay = self.backoff_seconds * (2 ** (attempt - 1))
+            await asyncio.sleep(delay * random.uniform(1, 1.2))
@@ -0,0 +1,73 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from typing import Awaitable, Callable, List
+
+from botbuilder.schema import ResourceResponse
+
+SendCallback = Callable[[Callable[[], None]], Awaitable[ResourceResponse]]
+
+
+class SendPipeline:
+    """
+    Sends the activities of a batch one after the other, optionally starting a request as soon as
+    the previous one has been written to its connection instead of once its response arrived.
+
+    .. remarks::
+        A send is given an `on_request_sent` callback, which the HTTP driver calls once the request
+        is on the wire, like :class:`botframework.connector.AiohttpHTTPSender` does. A driver that
+        never calls it makes the pipeline wait for every response, like sequential sends.
+
+        Requests written over separate connections can be processed by the channel in another
+        order than they were sent, so only pipeline sends whose order can't be seen, like typing
+        activities. A send that isn't pipelined waits for its response, so the sends after it
+        start once the channel has it.
+
+        Once a send failed no other send is started, and :meth:`wait` raises the error.
+    """
+
+    def __init__(self):
+        self._sends: List[asyncio.Future] = []
+
+    async def send(
+        self, send: SendCallback, pipelined: bool = True
+    ) -> "asyncio.Future[ResourceResponse]":
+        """
+        Starts a send, and waits until its request has been sent.
+
+        :param send: Sends the activity. Called with the callback to call once the request has been
+            sent, or None for a sequential send.
+        :param pipelined: False to wait for the response of this send.
+        :return: The future response of the send.
+        """
+        if any(
+            task.done() and not task.cancelled() and task.exception()
+            for task in self._sends
+        ):
+            await self.wait()
+
+        if not pipelined:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(await send(None))
+            return future
+
+        sent = asyncio.Event()
+        task = asyncio.ensure_future(send(sent.set))
+        self._sends.append(task)
+
+        sent_task = asyncio.ensure_future(sent.wait())
+        try:
+            await asyncio.wait((task, sent_task), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sent_task.cancel()
+        return task
+
+    async def wait(self):
+        """
+        Waits for the sends in flight, and raises the error of the first send that failed.
+        """
+        sends, self._sends = self._sends, []
+        for result in await asyncio.gather(*sends, return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
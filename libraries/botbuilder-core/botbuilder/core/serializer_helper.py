@@ -2,45 +2,65 @@
 # Licensed under the MIT License.
 from copy import copy
 from inspect import getmembers
-from typing import Type
+from typing import TYPE_CHECKING, Type
 from enum import Enum
 
-from msrest.serialization import Model, Deserializer, Serializer
-
 import botbuilder.schema as schema
 import botbuilder.schema.teams as teams_schema
 
-DEPENDICIES = [
-    schema_cls
-    for key, schema_cls in getmembers(schema)
-    if isinstance(schema_cls, type) and issubclass(schema_cls, (Model, Enum))
-]
-DEPENDICIES += [
-    schema_cls
-    for key, schema_cls in getmembers(teams_schema)
-    if isinstance(schema_cls, type) and issubclass(schema_cls, (Model, Enum))
-]
-DEPENDICIES_DICT = {dependency.__name__: dependency for dependency in DEPENDICIES}
-
-
-def deserializer_helper(msrest_cls: Type[Model], dict_to_deserialize: dict) -> Model:
-    deserializer = Deserializer(DEPENDICIES_DICT)
+if TYPE_CHECKING:
+    from msrest.serialization import Model
+
+# Importing this module doesn't import the schema models, which are collected on first use.
+_SERIALIZER = None
+
+
+def _get_serializer() -> "schema.CompiledSerializer":
+    # Compiles the (de)serialization of each model once, instead of interpreting it on every call.
+    global _SERIALIZER  # pylint: disable=global-statement
+    if _SERIALIZER is None:
+        from msrest.serialization import (  # pylint: disable=import-outside-toplevel
+            Model,
+        )
+
+        dependencies = [
+            schema_cls
+            for module in (schema, teams_schema)
+            for key, schema_cls in getmembers(module)
+            if isinstance(schema_cls, type) and issubclass(schema_cls, (Model, Enum))
+        ]
+        _SERIALIZER = schema.CompiledSerializer(
+            {dependency.__name__: dependency for dependency in dependencies}
+        )
+    return _SERIALIZER
+
+
+def __getattr__(name: str):
+    if name == "DEPENDICIES_DICT":
+        return _get_serializer().dependencies
+    if name == "DEPENDICIES":
+        return list(_get_serializer().dependencies.values())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def deserializer_helper(
+    msrest_cls: Type["Model"], dict_to_deserialize: dict
+) -> "Model":
+    serializer = _get_serializer()
     _clean_data_for_serialization(
-        deserializer.dependencies[msrest_cls.__name__], dict_to_deserialize
+        serializer.dependencies[msrest_cls.__name__], dict_to_deserialize
     )
-    return deserializer(msrest_cls.__name__, dict_to_deserialize)
+    return serializer.deserialize(msrest_cls.__name__, dict_to_deserialize)
 
 
-def serializer_helper(object_to_serialize: Model) -> dict:
+def serializer_helper(object_to_serialize: "Model") -> dict:
     if object_to_serialize is None:
         return None
 
-    serializer = Serializer(DEPENDICIES_DICT)
-    # pylint: disable=protected-access
-    return serializer._serialize(object_to_serialize)
+    return _get_serializer().serialize(object_to_serialize)
 
 
-def _clean_data_for_serialization(msrest_cls: Type[Model], dict_to_deserialize: dict):
+def _clean_data_for_serialization(msrest_cls: Type["Model"], dict_to_deserialize: dict):
     # pylint: disable=protected-access
     # Clean channel response of empty strings for expected objects.
     if not isinstance(dict_to_deserialize, dict):
@@ -52,7 +72,7 @@ def _clean_data_for_serialization(msrest_cls: Type[Model], dict_to_deserialize:
     for prop, prop_value in dict_to_deserialize.items():
         if (
             prop in serialization_model
-            and serialization_model[prop]["type"] in DEPENDICIES_DICT
+            and serialization_model[prop]["type"] in _get_serializer().dependencies
             and not prop_value
         ):
             dict_to_deserialize[prop] = None
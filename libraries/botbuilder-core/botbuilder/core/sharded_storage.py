@@ -0,0 +1,253 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from asyncio import gather
+from bisect import bisect
+from copy import copy
+from hashlib import blake2b
+from typing import Dict, List, Tuple
+from uuid import uuid4
+
+from .conversation_queue_middleware import is_e_tag_conflict
+from .storage import Storage, StoreItem, StoreItemDelta
+
+
+def _hash(value: str) -> int:
+    # A stable hash, so every process maps keys to the same shards.
+    return int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class _HashRing:
+    """
+    Maps keys to shard names by consistent hashing. Every shard owns `virtual_nodes` points on the
+    ring, and a key belongs to the shard owning the first point at or after the key's hash.
+    """
+
+    def __init__(self, shards: Dict[str, Storage], virtual_nodes: int):
+        if not shards:
+            raise ValueError("ShardedStorage: at least one shard is required.")
+
+        self.shards = dict(shards)
+        points = sorted(
+            (_hash(f"{name}#{node}"), name)
+            for name in self.shards
+            for node in range(virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._names = [name for _, name in points]
+
+    def get_name(self, key: str) -> str:
+        index = bisect(self._points, _hash(key)) % len(self._points)
+        return self._names[index]
+
+    def get_storage(self, key: str) -> Storage:
+        return self.shards[self.get_name(key)]
+
+
+class ShardedStorage(Storage):
+    """
+    A :class:`Storage` that spreads keys across several child storages.
+
+    .. remarks::
+        Keys are assigned to shards by consistent hashing on the shard names, so adding or removing a
+        shard only moves the keys of that shard. Multi-key reads, writes and deletes are split into
+        one call per shard, and the calls run concurrently.
+
+        To reshard, create a new :class:`ShardedStorage` with the new shards and the current shards
+        as `previous_shards`. While resharding, a key that isn't found in its new shard is read from
+        its previous shard and copied to the new one, unless the new shard got the key meanwhile.
+        Deletes are applied to both shards, and writes go to the new shard only. Call
+        :meth:`complete_resharding` once every key has moved, or when the items left in the
+        previous shards are no longer needed.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, Storage],
+        virtual_nodes: int = 160,
+        previous_shards: Dict[str, Storage] = None,
+    ):
+        """
+        Initializes a new instance of the :class:`ShardedStorage` class.
+
+        :param shards: The child storages, keyed by a shard name. Keys are assigned by name, so a shard
+            must keep its name for as long as it holds data.
+        :type shards: Dict[str, :class:`Storage`]
+        :param virtual_nodes: The number of ring points per shard. More points spread keys more evenly.
+        :type virtual_nodes: int
+        :param previous_shards: The shards keys were assigned to before resharding, if resharding.
+        :type previous_shards: Dict[str, :class:`Storage`]
+        """
+        if virtual_nodes is None or virtual_nodes < 1:
+            raise ValueError("ShardedStorage: virtual_nodes must be at least 1.")
+
+        super().__init__()
+        self.virtual_nodes = virtual_nodes
+        self._ring = _HashRing(shards, virtual_nodes)
+        self._previous_ring = (
+            _HashRing(previous_shards, virtual_nodes) if previous_shards else None
+        )
+
+    @property
+    def shards(self) -> Dict[str, Storage]:
+        return self._ring.shards
+
+    @property
+    def is_resharding(self) -> bool:
+        return self._previous_ring is not None
+
+    def get_shard_name(self, key: str) -> str:
+        """
+        Gets the name of the shard a key is stored in.
+
+        :param key: The storage key.
+        :return: The shard name.
+        """
+        return self._ring.get_name(key)
+
+    def complete_resharding(self):
+        """
+        Stops reading from and deleting in the previous shards.
+        """
+        self._previous_ring = None
+
+    async def read(self, keys: List[str]) -> Dict[str, object]:
+        if keys is None:
+            raise Exception("Keys are required when reading")
+        if not keys:
+            return {}
+
+        keys = list(keys)
+        data = await self._read_shards(self._group(keys, self._ring))
+
+        if self._previous_ring is not None:
+            moved = [
+                key
+                for key in keys
+                if key not in data and self._get_previous_storage(key) is not None
+            ]
+            if moved:
+                data.update(await self._migrate(moved))
+
+        return data
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return {}
+
+        return self._merge_e_tags(
+            await gather(
+                *[
+                    storage.write({key: changes[key] for key in keys})
+                    for storage, keys in self._group(changes, self._ring)
+                ]
+            )
+        )
+
+    async def write_delta(self, changes: Dict[str, StoreItemDelta]):
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return {}
+
+        return self._merge_e_tags(
+            await gather(
+                *[
+                    storage.write_delta({key: changes[key] for key in keys})
+                    for storage, keys in self._group(changes, self._ring)
+                ]
+            )
+        )
+
+    async def delete(self, keys: List[str]):
+        if not keys:
+            return
+
+        keys = list(keys)
+        batches = self._group(keys, self._ring)
+        if self._previous_ring is not None:
+            batches.extend(
+                self._group(
+                    [
+                        key
+                        for key in keys
+                        if self._get_previous_storage(key) is not None
+                    ],
+                    self._previous_ring,
+                )
+            )
+
+        await gather(*[storage.delete(keys) for storage, keys in batches])
+
+    def _get_previous_storage(self, key: str) -> Storage:
+        # The previous shard of a key, when it differs from the current one.
+        previous = self._previous_ring.get_storage(key)
+        return None if previous is self._ring.get_storage(key) else previous
+
+    async def _migrate(self, keys: List[str]) -> Dict[str, object]:
+        found = await self._read_shards(self._group(keys, self._previous_ring))
+        if not found:
+            return found
+
+        copies = await gather(*[self._copy(key, item) for key, item in found.items()])
+        return dict(zip(found, copies))
+
+    async def _copy(self, key: str, item: object) -> object:
+        # The e_tags of the previous shard mean nothing to the new one. The copy is written with an
+        # e_tag no other item has, so storage that checks e_tags fails the write when the key was
+        # written to the new shard since it was read, by another copy or a newer version.
+        storage = self._ring.get_storage(key)
+        item_copy = ShardedStorage._with_e_tag(item, uuid4().hex)
+        try:
+            e_tags = await storage.write({key: item_copy})
+        except Exception as error:
+            if not is_e_tag_conflict(error):
+                raise
+            items = await storage.read([key])
+            if key in items:
+                return items[key]
+
+            # Storage that also fails it when the key is still missing, like blob storage, can
+            # only copy unconditionally.
+            item_copy = ShardedStorage._with_e_tag(item, "*")
+            e_tags = await storage.write({key: item_copy})
+
+        if not isinstance(e_tags, dict) or key not in e_tags:
+            # Read the copy back for the e_tag the new shard gave it.
+            return (await storage.read([key])).get(key)
+        return ShardedStorage._with_e_tag(item_copy, e_tags[key])
+
+    @staticmethod
+    def _with_e_tag(item: object, e_tag: str) -> object:
+        item_copy = copy(item)
+        if isinstance(item_copy, dict):
+            item_copy["e_tag"] = e_tag
+        elif hasattr(item_copy, "e_tag"):
+            item_copy.e_tag = e_tag
+        return item_copy
+
+    @staticmethod
+    def _group(keys, ring: _HashRing) -> List[Tuple[Storage, List[str]]]:
+        groups: Dict[int, Tuple[Storage, List[str]]] = {}
+        for key in keys:
+            storage = ring.get_storage(key)
+            groups.setdefault(id(storage), (storage, []))[1].append(key)
+        return list(groups.values())
+
+    @staticmethod
+    async def _read_shards(batches: List[Tuple[Storage, List[str]]]) -> Dict:
+        data = {}
+        for items in await gather(*[storage.read(keys) for storage, keys in batches]):
+            data.update(items)
+        return data
+
+    @staticmethod
+    def _merge_e_tags(results: List[Dict[str, str]]) -> Dict[str, str]:
+        # Shards that don't report e_tags leave their keys out.
+        e_tags = {}
+        for result in results:
+            if isinstance(result, dict):
+                e_tags.update(result)
+        return e_tags
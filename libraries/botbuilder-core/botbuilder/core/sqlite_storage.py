@@ -0,0 +1,363 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from typing import Callable, Dict, List, Union
+from uuid import uuid4
+
+from .storage import Storage, StoreItem, StoreItemDelta
+from .store_item_serializer import StoreItemSerializer, get_store_item_serializer
+
+# SQLite builds before 3.32 allow at most 999 parameters per statement.
+_MAX_KEYS_PER_STATEMENT = 500
+
+
+class SqliteStorage(Storage):
+    """
+    A :class:`Storage` persisted in a local SQLite database.
+
+    .. remarks::
+        The database runs in WAL mode, so readers in other processes are not blocked by writes.
+        Every read, write and delete is a single statement or transaction covering all of its keys:
+        a write either stores every change or, when any e_tag doesn't match, none of them.
+        Database calls run on a dedicated worker thread, never on the event loop.
+
+        :meth:`write_delta` updates only the changed properties of items in place with the SQLite
+        JSON functions when the serializer supports partial updates (see
+        :class:`JsonStoreItemSerializer`), and writes the whole item otherwise.
+
+        Items get a new e_tag on every write. A write with an e_tag other than "*" only succeeds if
+        it matches the stored e_tag, and an empty e_tag is rejected. When `ttl_seconds` is set,
+        items expire that many seconds after they were last written; expired items are no longer
+        read and are purged in the background every `expiry_interval_seconds`.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        table_name: str = "store_items",
+        serializer: Union[str, StoreItemSerializer] = None,
+        ttl_seconds: float = None,
+        expiry_interval_seconds: float = 60.0,
+    ):
+        """
+        Initializes a new instance of the :class:`SqliteStorage` class.
+
+        :param database: The path of the database file, or ":memory:" for a private in-memory database.
+        :type database: str
+        :param table_name: The table the items are stored in. It is created if it doesn't exist.
+        :type table_name: str
+        :param serializer: The serializer, or serializer name, used for written items. Defaults to jsonpickle.
+        :param ttl_seconds: The number of seconds an item is kept after it was last written, or None to keep
+            items until they are deleted.
+        :type ttl_seconds: float
+        :param expiry_interval_seconds: How often expired items are purged.
+        :type expiry_interval_seconds: float
+        """
+        if not database:
+            raise Exception("SqliteStorage: database is required.")
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table_name or ""):
+            raise Exception(f"SqliteStorage: invalid table name: {table_name}")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("SqliteStorage: ttl_seconds must be positive.")
+
+        super().__init__()
+        self.database = database
+        self.table_name = table_name
+        self.ttl_seconds = ttl_seconds
+        self.expiry_interval_seconds = expiry_interval_seconds
+
+        self.__serializer = get_store_item_serializer(serializer)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="SqliteStorage"
+        )
+        self.__connection: sqlite3.Connection = None
+        self.__expiry_task: asyncio.Task = None
+
+    async def read(self, keys: List[str]) -> Dict[str, object]:
+        """
+        Read storeitems from storage.
+
+        :param keys: Keys of the items to read.
+        :return: The items found, keyed by key.
+        """
+        if keys is None:
+            raise Exception("Keys are required when reading")
+        if not keys:
+            return {}
+
+        return await self._run(self._read_items, list(keys))
+
+    async def write(self, changes: Dict[str, StoreItem]) -> Dict[str, str]:
+        """
+        Save storeitems to storage in a single transaction.
+
+        :param changes: The items to write, keyed by key.
+        :return: The new e_tag of each written item.
+        """
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return {}
+
+        return await self._run(
+            self._write_items,
+            {key: StoreItemDelta(change) for key, change in changes.items()},
+        )
+
+    async def write_delta(self, changes: Dict[str, StoreItemDelta]) -> Dict[str, str]:
+        """
+        Save the changed properties of storeitems to storage in a single transaction.
+
+        :param changes: The deltas to apply, keyed by key.
+        :return: The new e_tag of each written item.
+        """
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return {}
+
+        return await self._run(self._write_items, changes)
+
+    async def delete(self, keys: List[str]):
+        """
+        Remove storeitems from storage.
+
+        :param keys: Keys of the items to remove.
+        """
+        if not keys:
+            return
+
+        await self._run(self._delete_items, list(keys))
+
+    async def purge_expired(self) -> int:
+        """
+        Deletes expired items now, instead of waiting for the background purge.
+
+        :return: The number of items deleted.
+        """
+        return await self._run(self._purge_expired)
+
+    async def close(self):
+        """
+        Stops the background purge and closes the database.
+        """
+        if self.__expiry_task is not None:
+            self.__expiry_task.cancel()
+            self.__expiry_task = None
+
+        await asyncio.get_running_loop().run_in_executor(
+            self.__executor, self._close_connection
+        )
+        self.__executor.shutdown(wait=False)
+
+    async def _run(self, operation: Callable, *args):
+        if self.ttl_seconds is not None and self.__expiry_task is None:
+            self.__expiry_task = asyncio.ensure_future(self._expire_periodically())
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__executor, operation, *args
+        )
+
+    async def _expire_periodically(self):
+        while True:
+            await asyncio.sleep(self.expiry_interval_seconds)
+            await asyncio.get_running_loop().run_in_executor(
+                self.__executor, self._purge_expired
+            )
+
+    # The methods below run on the worker thread.
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            # Autocommit mode, transactions are started explicitly.
+            connection = sqlite3.connect(self.database, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+                "key TEXT PRIMARY KEY, "
+                "data BLOB NOT NULL, "
+                "serializer TEXT NOT NULL, "
+                "e_tag TEXT NOT NULL, "
+                "expires_at REAL)"
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table_name}_expires_at "
+                f"ON {self.table_name} (expires_at) WHERE expires_at IS NOT NULL"
+            )
+            self.__connection = connection
+        return self.__connection
+
+    def _close_connection(self):
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def _read_items(self, keys: List[str]) -> Dict[str, object]:
+        connection = self._get_connection()
+        now = time()
+
+        data = {}
+        for start in range(0, len(keys), _MAX_KEYS_PER_STATEMENT):
+            chunk = keys[start : start + _MAX_KEYS_PER_STATEMENT]
+            rows = connection.execute(
+                f"SELECT key, data, serializer, e_tag FROM {self.table_name} "
+                f"WHERE key IN ({','.join('?' * len(chunk))}) "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (*chunk, now),
+            )
+            for key, content, serializer_name, e_tag in rows:
+                data[key] = self._row_to_store_item(content, serializer_name, e_tag)
+        return data
+
+    def _write_items(self, changes: Dict[str, StoreItemDelta]) -> Dict[str, str]:
+        # Validate and serialize everything before the transaction takes the write lock.
+        rows = []
+        for key, delta in changes.items():
+            e_tag = None
+            if isinstance(delta.item, dict):
+                e_tag = delta.item.get("e_tag", None)
+            elif hasattr(delta.item, "e_tag"):
+                e_tag = delta.item.e_tag
+            if e_tag == "":
+                raise Exception("sqlite_storage.write(): etag missing")
+
+            content = (
+                None
+                if self._can_patch(delta)
+                else self.__serializer.serialize(delta.item)
+            )
+            rows.append((key, delta, e_tag, content))
+
+        connection = self._get_connection()
+        now = time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+
+        new_e_tags = {}
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for key, delta, e_tag, content in rows:
+                if e_tag is not None and e_tag != "*":
+                    current = connection.execute(
+                        f"SELECT e_tag FROM {self.table_name} "
+                        "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                        (key, now),
+                    ).fetchone()
+                    if current is not None and current[0] != e_tag:
+                        raise KeyError(
+                            "Etag conflict.\nOriginal: %s\r\nCurrent: %s"
+                            % (e_tag, current[0])
+                        )
+
+                new_e_tags[key] = uuid4().hex
+                if content is None:
+                    if self._patch_row(
+                        connection, key, delta, new_e_tags[key], expires_at, now
+                    ):
+                        continue
+                    # The item doesn't exist or was written with another serializer.
+                    content = self.__serializer.serialize(delta.item)
+
+                connection.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} "
+                    "(key, data, serializer, e_tag, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, content, self.__serializer.name, new_e_tags[key], expires_at),
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+        return new_e_tags
+
+    def _can_patch(self, delta: StoreItemDelta) -> bool:
+        return (
+            delta.is_partial
+            and self.__serializer.partial_updates
+            and isinstance(delta.item, dict)
+            # SQLite JSON paths can't address names containing double quotes.
+            and not any(
+                '"' in name
+                for name in [*delta.updated_properties, *delta.removed_properties]
+            )
+        )
+
+    def _patch_row(
+        self,
+        connection: sqlite3.Connection,
+        key: str,
+        delta: StoreItemDelta,
+        e_tag: str,
+        expires_at: float,
+        now: float,
+    ) -> bool:
+        expression = "CAST(data AS TEXT)"
+        parameters = []
+        if delta.updated_properties:
+            expression = f"json_set({expression}"
+            for name, value in delta.updated_properties.items():
+                expression += ", ?, json(?)"
+                parameters.append(f'$."{name}"')
+                parameters.append(self.__serializer.serialize(value).decode("utf-8"))
+            expression += ")"
+        if delta.removed_properties:
+            expression = f"json_remove({expression}"
+            for name in delta.removed_properties:
+                expression += ", ?"
+                parameters.append(f'$."{name}"')
+            expression += ")"
+
+        cursor = connection.execute(
+            f"UPDATE {self.table_name} "
+            f"SET data = CAST({expression} AS BLOB), e_tag = ?, expires_at = ? "
+            "WHERE key = ? AND serializer = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (*parameters, e_tag, expires_at, key, self.__serializer.name, now),
+        )
+        return cursor.rowcount == 1
+
+    def _delete_items(self, keys: List[str]):
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for start in range(0, len(keys), _MAX_KEYS_PER_STATEMENT):
+                chunk = keys[start : start + _MAX_KEYS_PER_STATEMENT]
+                connection.execute(
+                    f"DELETE FROM {self.table_name} "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    def _purge_expired(self) -> int:
+        cursor = self._get_connection().execute(
+            f"DELETE FROM {self.table_name} "
+            "WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time(),),
+        )
+        return cursor.rowcount
+
+    def _row_to_store_item(
+        self, content: bytes, serializer_name: str, e_tag: str
+    ) -> object:
+        serializer = (
+            self.__serializer
+            if serializer_name == self.__serializer.name
+            else get_store_item_serializer(serializer_name)
+        )
+        result = serializer.deserialize(content)
+
+        if isinstance(result, dict):
+            result["e_tag"] = e_tag
+        else:
+            result.e_tag = e_tag
+        return result
@@ -3,7 +3,7 @@
 
 from copy import copy
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 
 
 class Storage(ABC):
@@ -21,7 +21,8 @@ class Storage(ABC):
         """
         Saves store items to storage.
         :param changes:
-        :return:
+        :return: Optionally, the e_tag each written item now has in storage, keyed by storage key.
+            Storage providers that can't report e_tags return None.
         """
         raise NotImplementedError()
 
@@ -34,6 +35,20 @@ class Storage(ABC):
         """
         raise NotImplementedError()
 
+    async def write_delta(self, changes: Dict[str, "StoreItemDelta"]):
+        """
+        Saves store items to storage, sending only the properties that changed where the
+        storage provider supports partial updates.
+
+        .. remarks::
+            Providers that can't update part of an item inherit this implementation, which writes
+            every item in full. Concurrency checks use the e_tag of each delta's item, exactly
+            like :meth:`write`.
+        :param changes: The deltas to apply, keyed by storage key.
+        :return: Optionally, the e_tag each written item now has in storage, keyed by storage key.
+        """
+        return await self.write({key: delta.item for key, delta in changes.items()})
+
 
 class StoreItem:
     """
@@ -56,6 +71,31 @@ class StoreItem:
         return output
 
 
+class StoreItemDelta:
+    """
+    The top-level properties of a dict store item that changed since it was read.
+
+    .. remarks::
+        `item` is always the complete new item, so a delta can be written in full whenever a
+        partial update isn't possible. When `updated_properties` is None the delta replaces the
+        whole item.
+    """
+
+    def __init__(
+        self,
+        item: object,
+        updated_properties: Dict[str, object] = None,
+        removed_properties: List[str] = None,
+    ):
+        self.item = item
+        self.updated_properties = updated_properties
+        self.removed_properties = removed_properties or []
+
+    @property
+    def is_partial(self) -> bool:
+        return self.updated_properties is not None
+
+
 def calculate_change_hash(item: StoreItem) -> str:
     """
     Utility function to calculate a change hash for a `StoreItem`.
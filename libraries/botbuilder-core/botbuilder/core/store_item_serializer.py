@@ -0,0 +1,246 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import json
+import math
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Dict, Union
+from uuid import UUID
+
+from jsonpickle import encode
+from jsonpickle.pickler import Pickler
+from jsonpickle.unpickler import Unpickler
+
+
+class StoreItemSerializer(ABC):
+    """
+    Converts store items to and from the payload persisted by a storage provider.
+
+    .. remarks::
+        Storage providers record the :attr:`name` of the serializer next to every payload they write,
+        so a payload is always read back with the serializer that wrote it. Payloads written before
+        serializers were recorded are read with :class:`JsonPickleStoreItemSerializer`.
+    """
+
+    name: str = None
+    # True when each top-level property of a dict store item serializes on its own, so a
+    # storage provider can replace single properties of a stored payload.
+    partial_updates: bool = False
+    # True when the serializer implements :meth:`to_document` and :meth:`from_document`, for
+    # storage providers that persist JSON documents.
+    json_documents: bool = False
+
+    @abstractmethod
+    def serialize(self, item: object) -> bytes:
+        """
+        Serializes a store item to bytes.
+
+        :param item: The store item.
+        :return: The serialized item.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def deserialize(self, data: bytes) -> object:
+        """
+        Deserializes a store item from bytes.
+
+        :param data: The serialized item.
+        :return: The store item.
+        """
+        raise NotImplementedError()
+
+    def to_document(self, item: object) -> Dict[str, object]:
+        """
+        Converts a store item to a JSON compatible document, for storage providers that persist JSON.
+        The returned document may be modified by the caller.
+
+        :param item: The store item.
+        :return: The document.
+        """
+        raise TypeError(f"{type(self).__name__} does not produce JSON documents.")
+
+    def from_document(self, document: Dict[str, object]) -> object:
+        """
+        Converts a document created by :meth:`to_document` back to a store item.
+
+        :param document: The document.
+        :return: The store item.
+        """
+        raise TypeError(f"{type(self).__name__} does not read JSON documents.")
+
+
+class JsonPickleStoreItemSerializer(StoreItemSerializer):
+    """
+    Serializes store items with jsonpickle, preserving the Python type of every object.
+
+    .. remarks::
+        This is the default for storage providers and the only serializer that supports arbitrary objects
+        in state. It is also the serializer used to read payloads that don't record a serializer.
+    """
+
+    name = "jsonpickle"
+    json_documents = True
+
+    def serialize(self, item: object) -> bytes:
+        return encode(item).encode("utf-8")
+
+    def deserialize(self, data: bytes) -> object:
+        return Unpickler().restore(json.loads(data))
+
+    def to_document(self, item: object) -> Dict[str, object]:
+        return Pickler().flatten(item)
+
+    def from_document(self, document: Dict[str, object]) -> object:
+        return Unpickler().restore(document)
+
+
+class JsonStoreItemSerializer(StoreItemSerializer):
+    """
+    Serializes store items that only contain dicts, lists and JSON scalar values.
+
+    .. remarks::
+        Uses orjson when it is installed and the standard json module otherwise, and both accept
+        the same items: dict keys must be strings and integers must fit in 64 bits, or a TypeError
+        is raised, and NaN and infinity raise a ValueError. Enums and UUIDs are written as their
+        values. Other objects, like datetimes, raise a TypeError.
+    """
+
+    name = "json"
+    partial_updates = True
+    json_documents = True
+
+    def __init__(self):
+        try:
+            import orjson  # pylint: disable=import-outside-toplevel
+
+            options = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+
+            def dumps(item: object) -> bytes:
+                data = orjson.dumps(item, default=_reject_json_value, option=options)
+                # orjson writes NaN and infinity as null.
+                if b"null" in data:
+                    _check_json_value(item)
+                return data
+
+            self._dumps = dumps
+            self._loads = orjson.loads
+        except ImportError:
+
+            def dumps(item: object) -> bytes:
+                _check_json_value(item)
+                return json.dumps(
+                    item,
+                    separators=(",", ":"),
+                    ensure_ascii=False,
+                    allow_nan=False,
+                    default=_default_json_value,
+                ).encode("utf-8")
+
+            self._dumps = dumps
+            self._loads = json.loads
+
+    def serialize(self, item: object) -> bytes:
+        return self._dumps(item)
+
+    def deserialize(self, data: bytes) -> object:
+        return self._loads(data)
+
+    def to_document(self, item: object) -> Dict[str, object]:
+        if not isinstance(item, dict):
+            raise TypeError(
+                f"{type(self).__name__} only supports dict store items, not {type(item).__name__}."
+            )
+        _check_json_value(item)
+        return dict(item)
+
+    def from_document(self, document: Dict[str, object]) -> object:
+        return document
+
+
+def _check_json_value(value: object):
+    # Rejects what orjson rejects, and NaN and infinity, which it writes as null.
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Dict keys must be str, not {type(key).__name__}.")
+            _check_json_value(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _check_json_value(item)
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"Out of range float values are not JSON: {value}.")
+    elif isinstance(value, int) and not -(2**63) <= value < 2**64:
+        raise TypeError("Integers must fit in 64 bits.")
+
+
+def _default_json_value(value: object) -> object:
+    # The values orjson writes natively that the json module doesn't.
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return _reject_json_value(value)
+
+
+def _reject_json_value(value: object) -> object:
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class MsgPackStoreItemSerializer(StoreItemSerializer):
+    """
+    Serializes store items that only contain dicts, lists and scalar values to compact MessagePack bytes.
+
+    .. remarks::
+        Requires the msgpack package. MessagePack is binary, so this serializer can't be used by storage
+        providers that persist JSON documents.
+    """
+
+    name = "msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError(
+                "MsgPackStoreItemSerializer requires the msgpack package."
+            ) from error
+
+        self._msgpack = msgpack
+
+    def serialize(self, item: object) -> bytes:
+        return self._msgpack.packb(item, use_bin_type=True)
+
+    def deserialize(self, data: bytes) -> object:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+STORE_ITEM_SERIALIZERS = {
+    JsonPickleStoreItemSerializer.name: JsonPickleStoreItemSerializer,
+    JsonStoreItemSerializer.name: JsonStoreItemSerializer,
+    MsgPackStoreItemSerializer.name: MsgPackStoreItemSerializer,
+}
+
+_SERIALIZER_INSTANCES: Dict[str, StoreItemSerializer] = {}
+
+
+def get_store_item_serializer(
+    serializer: Union[str, StoreItemSerializer] = None
+) -> StoreItemSerializer:
+    """
+    Resolves a serializer by name, defaulting to :class:`JsonPickleStoreItemSerializer`.
+
+    :param serializer: A serializer name, a serializer instance, or None.
+    :return: The serializer.
+    """
+    if isinstance(serializer, StoreItemSerializer):
+        return serializer
+
+    name = serializer or JsonPickleStoreItemSerializer.name
+    if name not in _SERIALIZER_INSTANCES:
+        if name not in STORE_ITEM_SERIALIZERS:
+            raise KeyError(f"Unknown store item serializer: {name}")
+        _SERIALIZER_INSTANCES[name] = STORE_ITEM_SERIALIZERS[name]()
+    return _SERIALIZER_INSTANCES[name]
@@ -2,10 +2,13 @@
 # Licensed under the MIT License.
 """Logs incoming and outgoing activities to a TranscriptStore.."""
 
+import asyncio
 from datetime import datetime, timezone
+from enum import Enum
 import copy
 import random
 import string
+import traceback
 from queue import Queue
 from abc import ABC, abstractmethod
 from typing import Awaitable, Callable, List
@@ -30,16 +33,67 @@ class TranscriptLogger(ABC):
         """
         raise NotImplementedError
 
+    async def log_activities(self, activities: List[Activity]) -> None:
+        """Log several activities to the transcript, in order.
+        Loggers that can append a batch in one operation should override this.
+        :param activities: Activities being logged.
+        """
+        for activity in activities:
+            await self.log_activity(activity)
+
+
+class TranscriptBufferFullPolicy(Enum):
+    """What background transcript logging does with an activity when its buffer is full."""
+
+    # Wait for room in the buffer, slowing the turn down to the speed of the logger.
+    block = "block"
+    # Discard the activity and count it as dropped.
+    drop = "drop"
+
 
 class TranscriptLoggerMiddleware(Middleware):
-    """Logs incoming and outgoing activities to a TranscriptStore."""
+    """Logs incoming and outgoing activities to a TranscriptStore.
+
+    .. remarks::
+        By default the activities of a turn are written at the end of the turn, before the turn
+        completes. With `background` set, they are added to a buffer of up to `max_buffer_size`
+        activities instead, and a background task writes them in batches of up to `batch_size`
+        with :meth:`TranscriptLogger.log_activities`, keeping the logger off the turn's critical
+        path. `buffer_full_policy` decides what happens when the buffer is full. Call :meth:`flush`
+        to wait for buffered activities to be written and :meth:`close` on shutdown.
+        `queued`, `written`, `dropped` and `failed` count activities in background mode.
+    """
 
-    def __init__(self, logger: TranscriptLogger):
+    def __init__(
+        self,
+        logger: TranscriptLogger,
+        background: bool = False,
+        max_buffer_size: int = 1000,
+        batch_size: int = 100,
+        buffer_full_policy: TranscriptBufferFullPolicy = TranscriptBufferFullPolicy.block,
+    ):
         if not logger:
             raise TypeError(
                 "TranscriptLoggerMiddleware requires a TranscriptLogger instance."
             )
+        if max_buffer_size < 1:
+            raise ValueError("max_buffer_size must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
         self.logger = logger
+        self.background = background
+        self.max_buffer_size = max_buffer_size
+        self.batch_size = batch_size
+        self.buffer_full_policy = TranscriptBufferFullPolicy(buffer_full_policy)
+
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._buffer: asyncio.Queue = None
+        self._writer: asyncio.Task = None
 
     async def on_turn(
         self, context: TurnContext, logic: Callable[[TurnContext], Awaitable]
@@ -134,13 +188,21 @@ class TranscriptLoggerMiddleware(Middleware):
             await logic()
 
         # Flush transcript at end of turn
+        activities = []
         while not transcript.empty():
             activity = transcript.get()
             if activity is None:
                 break
-            await self.logger.log_activity(activity)
+            activities.append(activity)
             transcript.task_done()
 
+        if not activities:
+            return
+        if self.background:
+            await self._enqueue(activities)
+        else:
+            await self.logger.log_activities(activities)
+
     async def log_activity(self, transcript: Queue, activity: Activity) -> None:
         """Logs the activity.
         :param transcript: transcript.
@@ -148,6 +210,54 @@ class TranscriptLoggerMiddleware(Middleware):
         """
         transcript.put(activity)
 
+    async def flush(self) -> None:
+        """Waits until every buffered activity has been written."""
+        if self._buffer is not None:
+            await self._buffer.join()
+
+    async def close(self) -> None:
+        """Writes the buffered activities and stops background logging."""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        self._buffer = None
+
+    async def _enqueue(self, activities: List[Activity]) -> None:
+        if self._buffer is None:
+            self._buffer = asyncio.Queue(self.max_buffer_size)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._write_buffered())
+
+        for activity in activities:
+            if self.buffer_full_policy == TranscriptBufferFullPolicy.drop:
+                try:
+                    self._buffer.put_nowait(activity)
+                except asyncio.QueueFull:
+                    self.dropped += 1
+                    continue
+            else:
+                await self._buffer.put(activity)
+            self.queued += 1
+
+    async def _write_buffered(self) -> None:
+        buffer = self._buffer
+        while True:
+            batch = [await buffer.get()]
+            while len(batch) < self.batch_size and not buffer.empty():
+                batch.append(buffer.get_nowait())
+
+            try:
+                await self.logger.log_activities(batch)
+                self.written += len(batch)
+            except Exception:  # pylint: disable=broad-except
+                # A failing logger must not stop transcript logging for later turns.
+                self.failed += len(batch)
+                traceback.print_exc()
+            finally:
+                for _ in batch:
+                    buffer.task_done()
+
 
 class TranscriptStore(TranscriptLogger):
     """Transcript storage for conversations."""
@@ -0,0 +1,73 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares BotState change detection against the previous jsonpickle based hash.
+
+Run with: python tests/benchmarks/bench_bot_state_change_detection.py
+"""
+
+import timeit
+
+from jsonpickle.pickler import Pickler
+
+from botbuilder.core.bot_state import CachedBotState
+
+
+class DialogInstance:
+    def __init__(self, dialog_id: str, state: dict):
+        self.id = dialog_id  # pylint: disable=invalid-name
+        self.state = state
+
+
+class DialogState:
+    def __init__(self, stack: list):
+        self.dialog_stack = stack
+
+
+def create_state(dialogs: int) -> dict:
+    stack = [
+        DialogInstance(
+            f"dialog{index}",
+            {
+                "stepIndex": index,
+                "options": {"prompt": f"Prompt {index}", "retries": 3},
+                "values": {
+                    "choices": [f"choice {choice}" for choice in range(10)],
+                    "answers": {f"q{answer}": answer for answer in range(10)},
+                },
+            },
+        )
+        for index in range(dialogs)
+    ]
+    return {
+        "DialogState": DialogState(stack),
+        "profile": {"name": "user", "locale": "en-us", "visits": 12},
+    }
+
+
+def jsonpickle_hash(obj: object) -> str:
+    return str(Pickler().flatten(obj))
+
+
+def main():
+    for dialogs in (1, 10, 50):
+        state = create_state(dialogs)
+        cached = CachedBotState(state)
+        previous_hash = jsonpickle_hash(state)
+
+        number = 200
+        old = timeit.timeit(
+            lambda state=state, previous_hash=previous_hash: previous_hash
+            != jsonpickle_hash(state),
+            number=number,
+        )
+        new = timeit.timeit(lambda cached=cached: cached.is_changed, number=number)
+        print(
+            f"dialogs={dialogs:3d}  jsonpickle: {old / number * 1e6:9.1f} us"
+            f"  snapshot: {new / number * 1e6:9.1f} us  speedup: {old / new:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the time that importing botbuilder.schema and botbuilder.core takes in a new interpreter,
+like on the cold start of a worker, against importing every attribute of the packages, which
+importing them used to do.
+
+Run with: python tests/benchmarks/bench_import_time.py [--max-ms=<milliseconds>]
+
+With --max-ms, exits with an error when importing the packages alone takes longer, to catch an
+import that loads the models or the connector again.
+"""
+
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import botbuilder.schema": "import botbuilder.schema",
+    "import botbuilder.core": "import botbuilder.core",
+    "from botbuilder.core import MemoryStorage": (
+        "from botbuilder.core import MemoryStorage"
+    ),
+    "from botbuilder.core import TurnContext": (
+        "from botbuilder.core import TurnContext"
+    ),
+    "every attribute of botbuilder.core": (
+        "from botbuilder.schema import *; from botbuilder.schema.teams import *; "
+        "from botbuilder.core import *"
+    ),
+}
+
+PACKAGE_STATEMENTS = ("import botbuilder.schema", "import botbuilder.core")
+
+
+def measure(statement: str, number: int) -> float:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    return statistics.median(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, check=True, text=True
+            ).stdout
+        )
+        for _ in range(number)
+    )
+
+
+def main():
+    max_ms = None
+    for argument in sys.argv[1:]:
+        if argument.startswith("--max-ms="):
+            max_ms = float(argument[len("--max-ms=") :])
+
+    slow = []
+    for name, statement in STATEMENTS.items():
+        duration = measure(statement, number=7)
+        print(f"{name:45s} {duration:7.1f} ms")
+        if max_ms is not None and name in PACKAGE_STATEMENTS and duration > max_ms:
+            slow.append(name)
+
+    if slow:
+        sys.exit(f"Slower than {max_ms} ms: {', '.join(slow)}")
+
+
+if __name__ == "__main__":
+    main()
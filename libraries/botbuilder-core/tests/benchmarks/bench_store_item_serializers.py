@@ -0,0 +1,68 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares the store item serializers on a dialog-heavy conversation state.
+
+Run with: python tests/benchmarks/bench_store_item_serializers.py
+"""
+
+import importlib.util
+import timeit
+
+from botbuilder.core import (
+    JsonPickleStoreItemSerializer,
+    JsonStoreItemSerializer,
+    MsgPackStoreItemSerializer,
+)
+
+
+def create_state(dialogs: int) -> dict:
+    return {
+        "DialogState": {
+            "dialogStack": [
+                {
+                    "id": f"dialog{index}",
+                    "state": {
+                        "stepIndex": index,
+                        "options": {"prompt": f"Prompt {index}", "retries": 3},
+                        "values": {
+                            "choices": [f"choice {choice}" for choice in range(10)],
+                            "answers": {f"q{answer}": answer for answer in range(10)},
+                            "instanceId": "3f2504e0-4f89-11d3-9a0c-0305e82c3301",
+                        },
+                    },
+                }
+                for index in range(dialogs)
+            ]
+        },
+        "ConversationData": {"timestamp": "2024-01-01T00:00:00Z", "channel": "msteams"},
+    }
+
+
+def main():
+    serializers = [JsonPickleStoreItemSerializer(), JsonStoreItemSerializer()]
+    if importlib.util.find_spec("msgpack") is not None:
+        serializers.append(MsgPackStoreItemSerializer())
+
+    for dialogs in (1, 10, 50):
+        state = create_state(dialogs)
+        print(f"dialogs={dialogs}")
+        for serializer in serializers:
+            number = 500
+            data = serializer.serialize(state)
+            encode = timeit.timeit(
+                lambda s=serializer, i=state: s.serialize(i), number=number
+            )
+            decode = timeit.timeit(
+                lambda s=serializer, d=data: s.deserialize(d), number=number
+            )
+            print(
+                f"  {serializer.name:10s} bytes: {len(data):7d}"
+                f"  serialize: {encode / number * 1e6:8.1f} us"
+                f"  deserialize: {decode / number * 1e6:8.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,22 @@
+from typing import Dict, List
+
 import aiounittest
-from botbuilder.core import AutoSaveStateMiddleware, BotState, TurnContext
+from botbuilder.core import (
+    AutoSaveStateMiddleware,
+    BotState,
+    BotStateSet,
+    ConversationState,
+    MemoryStorage,
+    StoreItem,
+    StoreItemDelta,
+    TurnContext,
+    UserState,
+)
 from botbuilder.core.adapters import TestAdapter
 from botbuilder.schema import Activity
 
+from test_utilities import TestUtilities
+
 
 async def aux_func():
     return
@@ -37,6 +51,25 @@ class BotStateMock(BotState):
         return ""
 
 
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.reads: List[List[str]] = []
+        self.writes: List[Dict[str, StoreItem]] = []
+
+    async def read(self, keys: List[str]):
+        self.reads.append(list(keys))
+        return await super().read(keys)
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        self.writes.append(changes)
+        await super().write(changes)
+
+    async def write_delta(self, changes: Dict[str, StoreItemDelta]):
+        self.writes.append(changes)
+        await super().write_delta(changes)
+
+
 class TestAutoSaveMiddleware(aiounittest.AsyncTestCase):
     async def test_should_add_and_call_load_all_on_single_plugin(self):
         adapter = TestAdapter()
@@ -113,3 +146,65 @@ class TestAutoSaveMiddleware(aiounittest.AsyncTestCase):
         assert (
             not middleware.bot_state_set.bot_states
         ), "should not have added any BotState."
+
+    async def test_should_batch_states_sharing_a_storage(self):
+        context = TestUtilities.create_empty_context()
+        storage = CountingStorage()
+        conversation_state = ConversationState(storage)
+        user_state = UserState(storage)
+        bot_state_set = BotStateSet([conversation_state, user_state])
+
+        await bot_state_set.load_all(context)
+        self.assertEqual(1, len(storage.reads))
+        self.assertEqual(2, len(storage.reads[0]))
+
+        await conversation_state.create_property("count").set(context, 1)
+        await user_state.create_property("name").set(context, "user")
+        await bot_state_set.save_all_changes(context)
+        self.assertEqual(1, len(storage.writes))
+        self.assertEqual(
+            {
+                conversation_state.get_storage_key(context),
+                user_state.get_storage_key(context),
+            },
+            set(storage.writes[0]),
+        )
+
+        # Nothing changed since the last save
+        await bot_state_set.save_all_changes(context)
+        self.assertEqual(1, len(storage.writes))
+
+        # Only the changed state is written
+        await user_state.create_property("name").set(context, "other")
+        await bot_state_set.save_all_changes(context)
+        self.assertEqual(2, len(storage.writes))
+        self.assertEqual([user_state.get_storage_key(context)], list(storage.writes[1]))
+
+    async def test_should_use_one_round_trip_per_storage(self):
+        context = TestUtilities.create_empty_context()
+        conversation_storage = CountingStorage()
+        user_storage = CountingStorage()
+        conversation_state = ConversationState(conversation_storage)
+        user_state = UserState(user_storage)
+        autosave_middleware = AutoSaveStateMiddleware([conversation_state, user_state])
+
+        await autosave_middleware.bot_state_set.load_all(context)
+
+        async def logic():
+            await conversation_state.create_property("count").set(context, 1)
+            await user_state.create_property("name").set(context, "user")
+
+        await autosave_middleware.on_turn(context, logic)
+
+        self.assertEqual(1, len(conversation_storage.reads))
+        self.assertEqual(1, len(user_storage.reads))
+        self.assertEqual(1, len(conversation_storage.writes))
+        self.assertEqual(1, len(user_storage.writes))
+
+        # A new turn reads back what was saved
+        context = TestUtilities.create_empty_context()
+        await autosave_middleware.bot_state_set.load_all(context)
+        self.assertEqual(
+            1, await conversation_state.create_property("count").get(context)
+        )
+        self.assertEqual("user", await user_state.create_property("name").get(context))
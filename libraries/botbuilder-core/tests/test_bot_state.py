@@ -14,6 +14,7 @@ from botbuilder.core import (
     UserState,
 )
 from botbuilder.core.adapters import TestAdapter
+from botbuilder.core.bot_state import CachedBotState
 from botbuilder.schema import Activity, ConversationAccount
 
 from test_utilities import TestUtilities
@@ -89,6 +90,8 @@ class TestBotState(aiounittest.AsyncTestCase):
 
         mock_storage = MemoryStorage(dictionary)
         mock_storage.write = MagicMock(side_effect=mock_write_result)
+        # Partial writes are writes too.
+        mock_storage.write_delta = mock_storage.write
         mock_storage.read = MagicMock(side_effect=mock_read_result)
 
         # Arrange
@@ -502,3 +505,76 @@ class TestBotState(aiounittest.AsyncTestCase):
 
         assert result is not None
         assert result == test_bot_state.get_cached_state(turn_context)
+
+    async def test_cached_state_detects_nested_in_place_changes(self):
+        nested = TestPocoState(value={"items": [1, 2, {"flag": False}]})
+        cached = CachedBotState({"test-name": nested, "count": 1})
+        assert not cached.is_changed
+
+        nested.value["items"][2]["flag"] = True
+        assert cached.is_changed
+
+        cached.hash = cached.compute_hash(cached.state)
+        nested.value["items"].append("three")
+        assert cached.is_changed
+
+    async def test_cached_state_detects_value_type_changes(self):
+        cached = CachedBotState({"count": 1})
+
+        cached.state["count"] = True
+        assert cached.is_changed
+
+        cached.state["count"] = 1.0
+        assert cached.is_changed
+
+        cached.state["count"] = 1
+        assert not cached.is_changed
+
+    async def test_cached_state_handles_shared_and_cyclic_references(self):
+        shared = {"value": "a"}
+        state = {"first": shared, "second": shared, "cycle": []}
+        state["cycle"].append(state["cycle"])
+        cached = CachedBotState(state)
+        assert not cached.is_changed
+
+        # Shared values are captured by every property that references them.
+        shared["value"] = "b"
+        assert cached.is_changed
+        cached.persisted = True
+        assert sorted(cached.get_delta().updated_properties) == ["first", "second"]
+
+    async def test_cached_state_new_state_is_changed(self):
+        assert CachedBotState().is_changed
+        assert not CachedBotState({}).is_changed
+
+    async def test_save_changes_writes_only_changed_properties(self):
+        storage = MemoryStorage()
+        deltas = []
+        write_delta = storage.write_delta
+
+        async def record_write_delta(changes):
+            deltas.append(changes)
+            return await write_delta(changes)
+
+        storage.write_delta = record_write_delta
+        user_state = UserState(storage)
+        first = user_state.create_property("first")
+        second = user_state.create_property("second")
+
+        context = TestUtilities.create_empty_context()
+        await user_state.load(context)
+        await first.set(context, {"value": 1})
+        await second.set(context, "unchanged")
+        await user_state.save_changes(context)
+        # new state is written in full
+        self.assertEqual([], deltas)
+
+        context = TestUtilities.create_empty_context()
+        await user_state.load(context)
+        (await first.get(context))["value"] = 2
+        await user_state.save_changes(context)
+
+        self.assertEqual(1, len(deltas))
+        delta = list(deltas[0].values())[0]
+        self.assertEqual({"first": {"value": 2}}, delta.updated_properties)
+        self.assertEqual([], delta.removed_properties)
@@ -0,0 +1,210 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from unittest.mock import patch
+
+import pytest
+
+from botbuilder.core import BoundedMemoryStorage, StoreItem
+from botbuilder.testing import StorageBaseTests
+
+
+def get_storage():
+    return BoundedMemoryStorage(max_items=100, ttl_seconds=60)
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag="*"):
+        super(SimpleStoreItem, self).__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+class TestBoundedMemoryStorageBaseTests:
+    @pytest.mark.asyncio
+    async def test_return_empty_object_when_reading_unknown_key(self):
+        test_ran = await StorageBaseTests.return_empty_object_when_reading_unknown_key(
+            get_storage()
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_reading(self):
+        test_ran = await StorageBaseTests.handle_null_keys_when_reading(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_writing(self):
+        test_ran = await StorageBaseTests.handle_null_keys_when_writing(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_does_not_raise_when_writing_no_items(self):
+        test_ran = await StorageBaseTests.does_not_raise_when_writing_no_items(
+            get_storage()
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_create_object(self):
+        test_ran = await StorageBaseTests.create_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_update_object(self):
+        test_ran = await StorageBaseTests.update_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_delete_object(self):
+        test_ran = await StorageBaseTests.delete_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_perform_batch_operations(self):
+        test_ran = await StorageBaseTests.perform_batch_operations(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_proceeds_through_waterfall(self):
+        test_ran = await StorageBaseTests.proceeds_through_waterfall(get_storage())
+
+        assert test_ran
+
+
+class TestBoundedMemoryStorage:
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_item_over_max_items(self):
+        storage = BoundedMemoryStorage(max_items=2)
+        await storage.write({"a": {"id": 1}, "b": {"id": 2}})
+        await storage.read(["a"])
+
+        await storage.write({"c": {"id": 3}})
+
+        data = await storage.read(["a", "b", "c"])
+        assert sorted(data) == ["a", "c"]
+        assert storage.evictions == 1
+        assert storage.hits == 3
+        assert storage.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_evicts_over_max_bytes(self):
+        storage = BoundedMemoryStorage(max_bytes=2000)
+        await storage.write({"small": {"id": 1}})
+        size = storage.total_bytes
+
+        await storage.write({"large": {"text": "x" * 1500}})
+
+        data = await storage.read(["small", "large"])
+        assert sorted(data) == ["large"]
+        assert storage.evictions == 1
+        assert size < storage.total_bytes <= 2000
+
+    @pytest.mark.asyncio
+    async def test_measures_items_only_with_max_bytes(self):
+        storage = BoundedMemoryStorage(max_items=10)
+        with patch(
+            "botbuilder.core.bounded_memory_storage.estimate_size"
+        ) as estimate_size:
+            await storage.write({"item": {"id": 1}})
+            await storage.delete(["item"])
+            estimate_size.assert_not_called()
+        assert storage.total_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_items_expire_after_ttl(self):
+        storage = BoundedMemoryStorage(ttl_seconds=10)
+        with patch("botbuilder.core.bounded_memory_storage.monotonic") as clock:
+            clock.return_value = 100
+            await storage.write({"a": {"id": 1}})
+            clock.return_value = 105
+            await storage.write({"b": {"id": 2}})
+
+            clock.return_value = 110
+            data = await storage.read(["a", "b"])
+            assert sorted(data) == ["b"]
+            assert storage.expirations == 1
+            assert storage.misses == 1
+
+            # writing again restarts the ttl
+            await storage.write({"b": {"id": 3}})
+            clock.return_value = 119
+            data = await storage.read(["b"])
+            assert data["b"]["id"] == 3
+
+    @pytest.mark.asyncio
+    async def test_items_expire_after_their_own_ttl(self):
+        storage = BoundedMemoryStorage(ttl_seconds=10)
+        with patch("botbuilder.core.bounded_memory_storage.monotonic") as clock:
+            clock.return_value = 100
+            await storage.write(
+                {
+                    "long": {"id": 1, "ttl_seconds": 60},
+                    "default": {"id": 2},
+                    "short": SimpleStoreItem(counter=3),
+                }
+            )
+            # writing it again with its own ttl replaces the default one
+            short = SimpleStoreItem(counter=3)
+            short.ttl_seconds = 2
+            await storage.write({"short": short})
+
+            clock.return_value = 102
+            assert sorted(await storage.read(["long", "default", "short"])) == [
+                "default",
+                "long",
+            ]
+            clock.return_value = 110
+            assert sorted(await storage.read(["long", "default"])) == ["long"]
+            clock.return_value = 160
+            assert not await storage.read(["long"])
+            assert storage.expirations == 3
+
+        with pytest.raises(ValueError):
+            await storage.write({"invalid": {"ttl_seconds": 0}})
+        assert not await storage.read(["invalid"])
+
+    @pytest.mark.asyncio
+    async def test_e_tag_conflict_raises(self):
+        storage = BoundedMemoryStorage(max_items=10)
+        await storage.write({"user": SimpleStoreItem()})
+        await storage.write({"user": SimpleStoreItem()})
+        data = await storage.read(["user"])
+        stale_e_tag = data["user"].e_tag
+
+        await storage.write({"user": SimpleStoreItem(counter=2, e_tag=stale_e_tag)})
+
+        with pytest.raises(KeyError):
+            await storage.write({"user": SimpleStoreItem(counter=3, e_tag=stale_e_tag)})
+
+        data = await storage.read(["user"])
+        assert data["user"].counter == 2
+
+    @pytest.mark.asyncio
+    async def test_write_stores_a_copy(self):
+        storage = BoundedMemoryStorage(max_items=10)
+        item = {"values": [1]}
+        await storage.write({"item": item})
+
+        item["values"].append(2)
+
+        data = await storage.read(["item"])
+        assert data["item"]["values"] == [1]
+
+    @pytest.mark.asyncio
+    async def test_delete_releases_size(self):
+        storage = BoundedMemoryStorage(max_bytes=100000)
+        await storage.write({"a": {"id": 1}, "b": {"id": 2}})
+
+        await storage.delete(["a", "b", "unknown"])
+
+        assert storage.total_bytes == 0
+        assert not await storage.read(["a", "b"])
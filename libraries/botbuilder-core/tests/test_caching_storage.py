@@ -0,0 +1,209 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from unittest.mock import patch
+
+import pytest
+
+from botbuilder.core import CachingStorage, MemoryStorage, StoreItem
+from botbuilder.testing import StorageBaseTests
+
+
+def get_storage():
+    return CachingStorage(MemoryStorage())
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.read_keys = []
+
+    async def read(self, keys):
+        self.read_keys.extend(keys)
+        return await super().read(keys)
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag="*"):
+        super(SimpleStoreItem, self).__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+class TestCachingStorageBaseTests:
+    @pytest.mark.asyncio
+    async def test_return_empty_object_when_reading_unknown_key(self):
+        test_ran = await StorageBaseTests.return_empty_object_when_reading_unknown_key(
+            get_storage()
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_reading(self):
+        # Null keys are passed to the wrapped storage, which decides how to handle them.
+        result = await get_storage().read(None)
+
+        assert not result
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_writing(self):
+        test_ran = await StorageBaseTests.handle_null_keys_when_writing(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_does_not_raise_when_writing_no_items(self):
+        test_ran = await StorageBaseTests.does_not_raise_when_writing_no_items(
+            get_storage()
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_create_object(self):
+        test_ran = await StorageBaseTests.create_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_update_object(self):
+        test_ran = await StorageBaseTests.update_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_delete_object(self):
+        test_ran = await StorageBaseTests.delete_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_perform_batch_operations(self):
+        test_ran = await StorageBaseTests.perform_batch_operations(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_proceeds_through_waterfall(self):
+        test_ran = await StorageBaseTests.proceeds_through_waterfall(get_storage())
+
+        assert test_ran
+
+
+class TestCachingStorage:
+    @pytest.mark.asyncio
+    async def test_serves_reads_from_cache(self):
+        inner = CountingStorage()
+        storage = CachingStorage(inner)
+        await storage.write({"a": {"count": 1}})
+
+        first = await storage.read(["a"])
+        first["a"]["count"] = 2
+        second = await storage.read(["a"])
+
+        assert not inner.read_keys
+        assert second["a"]["count"] == 1
+        assert storage.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_write_through_keeps_new_e_tag(self):
+        storage = CachingStorage(MemoryStorage())
+        await storage.write({"item": SimpleStoreItem()})
+        await storage.write({"item": SimpleStoreItem(counter=2)})
+
+        item = (await storage.read(["item"]))["item"]
+        item.counter = 3
+        await storage.write({"item": item})
+
+        stored = await storage.storage.read(["item"])
+        assert stored["item"].counter == 3
+        assert (await storage.read(["item"]))["item"].e_tag == stored["item"].e_tag
+
+    @pytest.mark.asyncio
+    async def test_e_tag_conflict_invalidates_key(self):
+        inner = CountingStorage()
+        storage = CachingStorage(inner)
+        await storage.write({"item": SimpleStoreItem()})
+        await storage.write({"item": SimpleStoreItem(counter=2)})
+        stale = (await storage.read(["item"]))["item"]
+
+        # Another process updates the item behind the cache.
+        await inner.write({"item": SimpleStoreItem(counter=5)})
+
+        stale.counter = 3
+        with pytest.raises(KeyError):
+            await storage.write({"item": stale})
+
+        assert (await storage.read(["item"]))["item"].counter == 5
+        assert inner.read_keys == ["item"]
+
+    @pytest.mark.asyncio
+    async def test_caches_missing_keys(self):
+        inner = CountingStorage()
+        storage = CachingStorage(inner)
+
+        assert await storage.read(["missing"]) == {}
+        assert await storage.read(["missing"]) == {}
+        assert inner.read_keys == ["missing"]
+
+        await storage.write({"missing": {"count": 1}})
+        await storage.delete(["missing"])
+        assert await storage.read(["missing"]) == {}
+        assert inner.read_keys == ["missing"]
+
+    @pytest.mark.asyncio
+    async def test_revalidates_missing_keys_after_max_missing_age(self):
+        inner = CountingStorage()
+        storage = CachingStorage(inner, max_missing_age_seconds=2)
+        with patch("botbuilder.core.caching_storage.monotonic", return_value=100):
+            await storage.read(["missing"])
+        with patch("botbuilder.core.caching_storage.monotonic", return_value=101):
+            await storage.read(["missing"])
+        assert inner.read_keys == ["missing"]
+
+        # Created by another process meanwhile.
+        await inner.write({"missing": {"count": 1}})
+        with patch("botbuilder.core.caching_storage.monotonic", return_value=102):
+            assert await storage.read(["missing"]) == {"missing": {"count": 1}}
+        assert inner.read_keys == ["missing", "missing"]
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        inner = CountingStorage()
+        storage = CachingStorage(inner, max_items=2)
+        await storage.write({"a": {}, "b": {}})
+        await storage.read(["a"])
+        await storage.write({"c": {}})
+
+        await storage.read(["a", "b", "c"])
+
+        assert storage.evictions >= 1
+        assert inner.read_keys == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_revalidates_after_max_age(self):
+        inner = CountingStorage()
+        storage = CachingStorage(inner, max_age_seconds=10)
+        with patch("botbuilder.core.caching_storage.monotonic", return_value=100):
+            await storage.write({"a": {"count": 1}})
+        with patch("botbuilder.core.caching_storage.monotonic", return_value=105):
+            await storage.read(["a"])
+        assert not inner.read_keys
+
+        with patch("botbuilder.core.caching_storage.monotonic", return_value=110):
+            await storage.read(["a"])
+        assert inner.read_keys == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_invalidates_when_e_tags_are_not_reported(self):
+        class NoETagStorage(CountingStorage):
+            async def write(self, changes):
+                await super().write(changes)
+
+        inner = NoETagStorage()
+        storage = CachingStorage(inner)
+        await storage.write({"a": {"count": 1}})
+        await storage.read(["a"])
+
+        assert inner.read_keys == ["a"]
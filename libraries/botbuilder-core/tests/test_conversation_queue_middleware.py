@@ -0,0 +1,151 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+
+import aiounittest
+
+from botbuilder.core import (
+    ConversationQueueMiddleware,
+    ConversationState,
+    MemoryStorage,
+    TurnContext,
+)
+from botbuilder.core.adapters import TestAdapter
+from botbuilder.schema import (
+    Activity,
+    ActivityEventNames,
+    ChannelAccount,
+    ConversationAccount,
+)
+
+
+def create_context(conversation_id: str) -> TurnContext:
+    return TurnContext(
+        TestAdapter(),
+        Activity(
+            type="message",
+            text="hi",
+            channel_id="test",
+            from_property=ChannelAccount(id="user"),
+            conversation=ConversationAccount(id=conversation_id),
+        ),
+    )
+
+
+class PreconditionFailedError(Exception):
+    status_code = 412
+
+
+class TestConversationQueueMiddleware(aiounittest.AsyncTestCase):
+    async def test_should_run_turns_of_a_conversation_one_at_a_time(self):
+        middleware = ConversationQueueMiddleware()
+        running = {"a": 0, "b": 0}
+        max_running = {"a": 0, "b": 0}
+        order = []
+
+        async def turn(conversation_id: str, number: int):
+            async def logic():
+                running[conversation_id] += 1
+                max_running[conversation_id] = max(
+                    max_running[conversation_id], running[conversation_id]
+                )
+                await asyncio.sleep(0.01)
+                order.append((conversation_id, number))
+                running[conversation_id] -= 1
+
+            await middleware.on_turn(create_context(conversation_id), logic)
+
+        await asyncio.gather(
+            turn("a", 1), turn("a", 2), turn("b", 1), turn("a", 3), turn("b", 2)
+        )
+
+        self.assertEqual({"a": 1, "b": 1}, max_running)
+        self.assertEqual(
+            [1, 2, 3], [number for conversation, number in order if conversation == "a"]
+        )
+        # the conversations ran alongside each other
+        self.assertEqual(("b", 1), order[1])
+        self.assertFalse(middleware._queues)  # pylint: disable=protected-access
+
+    async def test_should_not_queue_continued_turns_of_a_conversation(self):
+        adapter = TestAdapter()
+        adapter.use(ConversationQueueMiddleware())
+        continued = []
+
+        async def continue_logic(context: TurnContext):
+            continued.append(context.activity.name)
+
+        async def logic(context: TurnContext):
+            # Like the replies of a skill the turn waits for.
+            await asyncio.wait_for(
+                adapter.continue_conversation(
+                    TurnContext.get_conversation_reference(context.activity),
+                    continue_logic,
+                ),
+                timeout=1,
+            )
+
+        await adapter.process_activity(create_context("a").activity, logic)
+
+        self.assertEqual([ActivityEventNames.continue_conversation], continued)
+
+    async def test_should_replay_turn_with_reloaded_state_after_e_tag_conflict(self):
+        middleware = ConversationQueueMiddleware()
+        conversation_state = ConversationState(MemoryStorage())
+        context = create_context("a")
+        loads = []
+
+        async def logic():
+            await conversation_state.load(context)
+            loads.append(conversation_state.get_cached_state(context))
+            if len(loads) == 1:
+                raise KeyError("Etag conflict.\nOriginal: 1\r\nCurrent: 2")
+            if len(loads) == 2:
+                raise PreconditionFailedError()
+
+        await middleware.on_turn(context, logic)
+
+        self.assertEqual(3, len(loads))
+        self.assertIsNot(loads[0], loads[1])
+        self.assertIsNot(loads[1], loads[2])
+        self.assertEqual(2, middleware.retries)
+
+    async def test_should_stop_replaying_after_max_retries(self):
+        middleware = ConversationQueueMiddleware(max_retries=1)
+        attempts = []
+
+        async def logic():
+            attempts.append(1)
+            raise KeyError("Etag conflict.\nOriginal: 1\r\nCurrent: 2")
+
+        with self.assertRaises(KeyError):
+            await middleware.on_turn(create_context("a"), logic)
+        self.assertEqual(2, len(attempts))
+
+    async def test_should_not_replay_turn_that_responded(self):
+        middleware = ConversationQueueMiddleware()
+        context = create_context("a")
+        attempts = []
+
+        async def logic():
+            attempts.append(1)
+            await context.send_activity("reply")
+            raise KeyError("Etag conflict.\nOriginal: 1\r\nCurrent: 2")
+
+        with self.assertRaises(KeyError):
+            await middleware.on_turn(context, logic)
+        self.assertEqual(1, len(attempts))
+
+    async def test_should_not_replay_other_errors(self):
+        middleware = ConversationQueueMiddleware()
+        attempts = []
+
+        async def logic():
+            attempts.append(1)
+            raise KeyError("missing")
+
+        with self.assertRaises(KeyError):
+            await middleware.on_turn(create_context("a"), logic)
+        self.assertEqual(1, len(attempts))
+        self.assertFalse(middleware._queues)  # pylint: disable=protected-access
@@ -0,0 +1,167 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+
+import pytest
+
+from botbuilder.core import (
+    ConversationReferenceMiddleware,
+    ConversationReferenceStore,
+    MemoryStorage,
+    SqliteStorage,
+    TurnContext,
+)
+from botbuilder.core.adapters import TestAdapter
+from botbuilder.schema import (
+    Activity,
+    ActivityTypes,
+    ChannelAccount,
+    ConversationAccount,
+)
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    async def write(self, changes):
+        self.writes += 1
+        return await super().write(changes)
+
+
+class ConcurrentStorage(MemoryStorage):
+    """
+    Lets other tasks run between reads and writes. With `conditional_creates` False, fails
+    conditional writes of missing items, like blob storage.
+    """
+
+    def __init__(self, conditional_creates: bool = True):
+        super().__init__()
+        self.conditional_creates = conditional_creates
+
+    async def read(self, keys):
+        await asyncio.sleep(0)
+        return await super().read(keys)
+
+    async def write(self, changes):
+        await asyncio.sleep(0)
+        if not self.conditional_creates:
+            for key, change in changes.items():
+                if key not in self.memory and change.get("e_tag") not in (None, "*"):
+                    raise KeyError("Etag conflict. The item doesn't exist.")
+        return await super().write(changes)
+
+
+def create_activity(
+    conversation_id: str,
+    user_id: str = "user",
+    tenant_id: str = "tenant",
+    channel_id: str = "msteams",
+    team_id: str = None,
+    activity_id: str = "activity",
+) -> Activity:
+    return Activity(
+        type=ActivityTypes.message,
+        id=activity_id,
+        channel_id=channel_id,
+        service_url="https://service",
+        from_property=ChannelAccount(id=user_id),
+        recipient=ChannelAccount(id="bot"),
+        conversation=ConversationAccount(id=conversation_id, tenant_id=tenant_id),
+        channel_data={"team": {"id": team_id}} if team_id else None,
+    )
+
+
+async def find_ids(store: ConversationReferenceStore, **criteria):
+    return [reference.conversation.id async for reference in store.find(**criteria)]
+
+
+@pytest.mark.asyncio
+async def test_saves_only_changed_references():
+    storage = CountingStorage()
+    store = ConversationReferenceStore(storage)
+
+    assert await store.save_activity(create_activity("a", activity_id="1"))
+    writes = storage.writes
+    # Only the activity id changed.
+    assert not await store.save_activity(create_activity("a", activity_id="2"))
+    assert not await ConversationReferenceStore(storage).save_activity(
+        create_activity("a", activity_id="3")
+    )
+    assert storage.writes == writes
+
+    assert await store.save_activity(create_activity("a", tenant_id="other"))
+    assert await find_ids(store, tenant_id="tenant") == []
+    assert await find_ids(store, tenant_id="other") == ["a"]
+
+    reference = await store.get("msteams", "a")
+    assert reference.user.id == "user"
+    assert reference.activity_id is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_sqlite", [False, True])
+async def test_find_by_indexes(tmp_path, use_sqlite):
+    storage = (
+        SqliteStorage(str(tmp_path / "store.db")) if use_sqlite else MemoryStorage()
+    )
+    store = ConversationReferenceStore(storage, page_size=2, index_shards=3)
+
+    await store.save_activity(create_activity("a", user_id="u1", team_id="t1"))
+    await store.save_activity(create_activity("b", user_id="u2", team_id="t1"))
+    await store.save_activity(create_activity("c", user_id="u1"))
+    await store.save_activity(
+        create_activity("d", user_id="u1", tenant_id="other", channel_id="webchat")
+    )
+
+    assert await find_ids(store) == ["a", "b", "c", "d"]
+    assert await find_ids(store, user_id="u1") == ["a", "c", "d"]
+    assert await find_ids(store, team_id="t1") == ["a", "b"]
+    assert await find_ids(store, channel_id="webchat") == ["d"]
+    assert await find_ids(store, user_id="u1", tenant_id="tenant") == ["a", "c"]
+    assert [len(page) async for page in store.find_pages()] == [2, 2]
+
+    await store.delete("msteams", "a")
+    assert await find_ids(store, user_id="u1") == ["c", "d"]
+    assert await store.get("msteams", "a") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_saves():
+    store = ConversationReferenceStore(
+        ConcurrentStorage(), index_shards=2, max_retries=20
+    )
+    ids = [str(index) for index in range(10)]
+
+    await asyncio.gather(*[store.save_activity(create_activity(id)) for id in ids])
+
+    assert await find_ids(store) == sorted(ids)
+    assert await find_ids(store, user_id="user") == sorted(ids)
+    assert await find_ids(store, channel_id="msteams") == sorted(ids)
+
+
+@pytest.mark.asyncio
+async def test_saves_without_conditional_creates():
+    store = ConversationReferenceStore(ConcurrentStorage(conditional_creates=False))
+
+    await store.save_activity(create_activity("a"))
+    await store.save_activity(create_activity("b"))
+
+    assert await find_ids(store) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_saves_reference():
+    store = ConversationReferenceStore(MemoryStorage())
+
+    async def logic(context: TurnContext):
+        await context.send_activity("hello")
+
+    adapter = TestAdapter(logic).use(ConversationReferenceMiddleware(store))
+    await adapter.send("hi")
+
+    references = [reference async for reference in store.find()]
+    assert len(references) == 1
+    assert references[0].conversation.id == adapter.template.conversation.id
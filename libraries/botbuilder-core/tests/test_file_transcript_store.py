@@ -0,0 +1,190 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import datetime
+import os
+import uuid
+from typing import List
+
+import pytest
+
+from botbuilder.core import FileTranscriptStore
+from botbuilder.schema import (
+    Activity,
+    ActivityTypes,
+    ChannelAccount,
+    ConversationAccount,
+)
+from botframework.connector import Channels
+
+
+def create_activities(
+    conversation_id: str, date: datetime.datetime, count: int = 5
+) -> List[Activity]:
+    return [
+        Activity(
+            type=ActivityTypes.message,
+            timestamp=date + datetime.timedelta(minutes=i),
+            id=str(uuid.uuid4()),
+            text=str(i),
+            channel_id=Channels.test,
+            from_property=ChannelAccount(id=f"User{i}"),
+            conversation=ConversationAccount(id=conversation_id),
+            recipient=ChannelAccount(id="bot1", name="2"),
+            service_url="http://foo.com/api/messages",
+        )
+        for i in range(count)
+    ]
+
+
+async def read_all(store: FileTranscriptStore, conversation_id: str, **kwargs):
+    pages = []
+    continuation_token = None
+    while True:
+        result = await store.get_transcript_activities(
+            "test", conversation_id, continuation_token, **kwargs
+        )
+        pages.append(result.items)
+        continuation_token = result.continuation_token
+        if not continuation_token:
+            return pages
+
+
+DATE = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class TestFileTranscriptStore:
+    @pytest.mark.asyncio
+    async def test_log_and_read_activity(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path))
+        activity = create_activities("conversation", DATE, 1)[0]
+        await store.log_activity(activity)
+
+        result = await store.get_transcript_activities("test", "conversation")
+        await store.close()
+
+        assert [item.id for item in result.items] == [activity.id]
+        assert result.items[0].text == "0"
+        assert result.items[0].timestamp == activity.timestamp
+        assert result.continuation_token is None
+
+    @pytest.mark.asyncio
+    async def test_null_activity(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path))
+        with pytest.raises(TypeError):
+            await store.log_activity(None)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_unknown_conversation(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path))
+        result = await store.get_transcript_activities("test", "unknown")
+        await store.close()
+
+        assert result.items is None
+
+    @pytest.mark.asyncio
+    async def test_paging_in_timestamp_order(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path))
+        activities = create_activities("conversation", DATE, 45)
+        await store.log_activities(list(reversed(activities)))
+
+        pages = await read_all(store, "conversation")
+        await store.close()
+
+        assert [len(page) for page in pages] == [20, 20, 5]
+        assert [item.id for page in pages for item in page] == [
+            activity.id for activity in activities
+        ]
+
+    @pytest.mark.asyncio
+    async def test_start_date(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path))
+        await store.log_activities(create_activities("conversation", DATE, 5))
+
+        result = await store.get_transcript_activities(
+            "test", "conversation", start_date=DATE + datetime.timedelta(minutes=3)
+        )
+        await store.close()
+
+        assert [item.text for item in result.items] == ["3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_segments_roll_over_and_compress(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path), max_segment_bytes=1024)
+        activities = create_activities("conversation", DATE, 50)
+        for activity in activities:
+            await store.log_activity(activity)
+        await store.close()
+
+        files = [name for _, _, names in os.walk(tmp_path) for name in names]
+        assert any(name.endswith(".jsonl.gz") for name in files)
+        assert not any(name.endswith(".tmp") for name in files)
+
+        store = FileTranscriptStore(str(tmp_path), max_segment_bytes=1024)
+        pages = await read_all(store, "conversation")
+        await store.close()
+
+        assert [item.id for page in pages for item in page] == [
+            activity.id for activity in activities
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reopen_after_incomplete_write(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path))
+        activities = create_activities("conversation", DATE, 3)
+        await store.log_activities(activities)
+        await store.close()
+
+        # Simulate a crash that cut the last index record short.
+        index_path = [
+            os.path.join(path, name)
+            for path, _, names in os.walk(tmp_path)
+            for name in names
+            if name == "index.bin"
+        ][0]
+        with open(index_path, "r+b") as file:
+            file.truncate(os.path.getsize(index_path) - 5)
+
+        store = FileTranscriptStore(str(tmp_path))
+        more = create_activities("conversation", DATE + datetime.timedelta(hours=1), 1)
+        await store.log_activities(more)
+        result = await store.get_transcript_activities("test", "conversation")
+        await store.close()
+
+        assert [item.id for item in result.items] == [
+            activities[0].id,
+            activities[1].id,
+            more[0].id,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_list_and_delete_transcripts(self, tmp_path):
+        store = FileTranscriptStore(str(tmp_path), max_open_conversations=2)
+        for i in range(25):
+            await store.log_activities(
+                create_activities(
+                    f"conversation:{i}", DATE + datetime.timedelta(hours=i), 1
+                )
+            )
+
+        first = await store.list_transcripts("test")
+        second = await store.list_transcripts("test", first.continuation_token)
+        assert len(first.items) == 20
+        assert first.items[0].id == "conversation:24"
+        assert first.items[0].created == DATE + datetime.timedelta(hours=24)
+        assert [item.id for item in second.items] == [
+            f"conversation:{i}" for i in range(4, -1, -1)
+        ]
+        assert second.continuation_token is None
+
+        await store.delete_transcript("test", "conversation:24")
+        await store.close()
+
+        store = FileTranscriptStore(str(tmp_path))
+        result = await store.list_transcripts("test")
+        deleted = await store.get_transcript_activities("test", "conversation:24")
+        await store.close()
+
+        assert result.items[0].id == "conversation:23"
+        assert deleted.items is None
@@ -0,0 +1,64 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import subprocess
+import sys
+from importlib import import_module
+
+import aiounittest
+
+import botbuilder.core
+import botbuilder.schema
+import botbuilder.schema.teams
+from botbuilder.core.serializer_helper import deserializer_helper, serializer_helper
+from botbuilder.schema import Activity
+
+
+def get_imported_modules(statement: str) -> set:
+    output = subprocess.run(
+        [sys.executable, "-c", f"{statement}\nimport sys\nprint(*sys.modules)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports(aiounittest.AsyncTestCase):
+    def test_imports_modules_on_first_read(self):
+        modules = get_imported_modules("import botbuilder.core")
+        self.assertIn("botbuilder.core.serializer_helper", modules)
+        self.assertNotIn("botbuilder.core.turn_context", modules)
+        self.assertNotIn("botbuilder.schema._models_py3", modules)
+        self.assertNotIn("msrest", modules)
+
+        modules = get_imported_modules("from botbuilder.core import MessageFactory")
+        self.assertIn("botbuilder.schema._models_py3", modules)
+        self.assertNotIn("botbuilder.core.turn_context", modules)
+
+    def test_exports_every_attribute(self):
+        for package in (botbuilder.core, botbuilder.schema, botbuilder.schema.teams):
+            for name in package.__all__:
+                self.assertIsNotNone(getattr(package, name))
+            self.assertTrue(set(package.__all__) <= set(dir(package)))
+
+        self.assertIs(
+            botbuilder.core.conversation_reference_extension,
+            sys.modules["botbuilder.core.conversation_reference_extension"],
+        )
+        self.assertIs(serializer_helper, botbuilder.core.serializer_helper)
+
+        with self.assertRaises(AttributeError):
+            getattr(botbuilder.core, "Unknown")
+
+    def test_serializer_helper(self):
+        # The package attribute of the same name is the function.
+        serializer_helper_module = import_module("botbuilder.core.serializer_helper")
+        self.assertIs(
+            Activity, serializer_helper_module.DEPENDICIES_DICT[Activity.__name__]
+        )
+        self.assertIn(Activity, serializer_helper_module.DEPENDICIES)
+
+        activity = deserializer_helper(Activity, {"type": "message", "from": ""})
+        self.assertIsNone(activity.from_property)
+        self.assertEqual({"type": "message"}, serializer_helper(activity))
@@ -3,7 +3,7 @@
 
 import pytest
 
-from botbuilder.core import MemoryStorage, StoreItem
+from botbuilder.core import MemoryStorage, StoreItem, StoreItemDelta
 from botbuilder.testing import StorageBaseTests
 
 
@@ -198,3 +198,44 @@ class TestMemoryStorage:
         await storage.delete(["foo", "bar"])
         data = await storage.read(["test"])
         assert len(data.keys()) == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_storage_write_delta_copies_only_changed_properties(self):
+        unchanged = {"value": 1}
+        storage = MemoryStorage()
+        await storage.write(
+            {"state": {"unchanged": unchanged, "count": 1, "e_tag": "*"}}
+        )
+        stored = storage.memory["state"]
+
+        item = {
+            "unchanged": unchanged,
+            "count": 2,
+            "added": [1],
+            "e_tag": stored["e_tag"],
+        }
+        await storage.write_delta(
+            {"state": StoreItemDelta(item, {"count": 2, "added": item["added"]})}
+        )
+
+        patched = storage.memory["state"]
+        assert patched["count"] == 2
+        assert patched["added"] == [1] and patched["added"] is not item["added"]
+        # unchanged properties are shared with the previous stored value instead of copied
+        assert patched["unchanged"] is stored["unchanged"]
+        assert patched["e_tag"] != stored["e_tag"]
+
+        await storage.write_delta({"state": StoreItemDelta(patched, {}, ["added"])})
+        assert "added" not in storage.memory["state"]
+
+    @pytest.mark.asyncio
+    async def test_memory_storage_write_delta_checks_e_tag(self):
+        storage = MemoryStorage()
+        await storage.write({"state": {"count": 1, "e_tag": "*"}})
+        await storage.write({"state": {"count": 2, "e_tag": "*"}})
+
+        with pytest.raises(KeyError):
+            await storage.write_delta(
+                {"state": StoreItemDelta({"count": 3, "e_tag": "stale"}, {"count": 3})}
+            )
+        assert storage.memory["state"]["count"] == 2
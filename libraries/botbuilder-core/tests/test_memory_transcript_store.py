@@ -89,6 +89,140 @@ class TestMemoryTranscriptStore(aiounittest.AsyncTestCase):
         )
         self.assertEqual(result.items, None)
 
+    async def test_get_activities_ordered_by_timestamp(self):
+        memory_transcript = MemoryTranscriptStore()
+        conversation_id = "_ordered"
+        date = datetime.datetime.now()
+        activities = self.create_activities(conversation_id, date, count=5)
+        for activity in reversed(activities):
+            await memory_transcript.log_activity(activity)
+
+        result = await memory_transcript.get_transcript_activities(
+            "test", conversation_id
+        )
+        timestamps = [activity.timestamp for activity in result.items]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertIsNone(result.continuation_token)
+
+    async def test_get_activities_paged(self):
+        memory_transcript = MemoryTranscriptStore()
+        conversation_id = "_paged"
+        date = datetime.datetime.now()
+        activities = self.create_activities(conversation_id, date, count=25)
+        for activity in activities:
+            await memory_transcript.log_activity(activity)
+
+        pages = []
+        continuation_token = None
+        while True:
+            result = await memory_transcript.get_transcript_activities(
+                "test", conversation_id, continuation_token
+            )
+            pages.append(result.items)
+            continuation_token = result.continuation_token
+            if not continuation_token:
+                break
+
+        self.assertEqual([len(page) for page in pages], [20, 20, 10])
+        paged_ids = [activity.id for page in pages for activity in page]
+        self.assertEqual(sorted(paged_ids), sorted(a.id for a in activities))
+
+    async def test_get_activities_paged_without_ids(self):
+        memory_transcript = MemoryTranscriptStore()
+        conversation_id = "_paged_without_ids"
+        date = datetime.datetime.now(datetime.timezone.utc)
+        activities = self.create_activities(conversation_id, date, count=15)
+        for activity in activities:
+            activity.id = None
+            await memory_transcript.log_activity(activity)
+
+        first = await memory_transcript.get_transcript_activities(
+            "test", conversation_id
+        )
+        second = await memory_transcript.get_transcript_activities(
+            "test", conversation_id, first.continuation_token
+        )
+        self.assertEqual(len(first.items), 20)
+        self.assertEqual(len(second.items), 10)
+        self.assertIsNone(second.continuation_token)
+
+    async def test_get_activities_start_date(self):
+        memory_transcript = MemoryTranscriptStore()
+        conversation_id = "_start_date"
+        date = datetime.datetime.now()
+        activities = self.create_activities(conversation_id, date, count=5)
+        for activity in activities:
+            await memory_transcript.log_activity(activity)
+
+        result = await memory_transcript.get_transcript_activities(
+            "test",
+            conversation_id,
+            start_date=date + datetime.timedelta(minutes=1),
+        )
+        self.assertEqual(
+            [activity.text for activity in result.items], ["1", "2", "3", "4"]
+        )
+
+    async def test_max_activities_per_conversation(self):
+        memory_transcript = MemoryTranscriptStore(max_activities_per_conversation=3)
+        conversation_id = "_capped"
+        date = datetime.datetime.now()
+        activities = self.create_activities(conversation_id, date, count=5)[::2]
+        for activity in activities:
+            await memory_transcript.log_activity(activity)
+
+        result = await memory_transcript.get_transcript_activities(
+            "test", conversation_id
+        )
+        self.assertEqual([activity.text for activity in result.items], ["2", "3", "4"])
+        self.assertEqual(memory_transcript.activity_count, 3)
+
+    async def test_max_activities(self):
+        memory_transcript = MemoryTranscriptStore(max_activities=4)
+        date = datetime.datetime.now()
+        for activity in self.create_activities("_first", date, count=2):
+            await memory_transcript.log_activity(activity)
+        for activity in self.create_activities("_second", date, count=1):
+            await memory_transcript.log_activity(activity)
+
+        first = await memory_transcript.get_transcript_activities("test", "_first")
+        second = await memory_transcript.get_transcript_activities("test", "_second")
+        self.assertEqual(len(first.items), 2)
+        self.assertEqual(len(second.items), 2)
+
+        for activity in self.create_activities("_second", date, count=2):
+            await memory_transcript.log_activity(activity)
+
+        first = await memory_transcript.get_transcript_activities("test", "_first")
+        self.assertIsNone(first.items)
+        self.assertEqual(memory_transcript.activity_count, 4)
+
+    async def test_list_transcripts_paged(self):
+        memory_transcript = MemoryTranscriptStore()
+        date = datetime.datetime.now()
+        for i in range(25):
+            activity = self.create_activities(
+                f"_conversation{i}", date + datetime.timedelta(minutes=i), count=1
+            )[0]
+            await memory_transcript.log_activity(activity)
+
+        first = await memory_transcript.list_transcripts("test")
+        second = await memory_transcript.list_transcripts(
+            "test", first.continuation_token
+        )
+        self.assertEqual(len(first.items), 20)
+        self.assertEqual(first.items[0].id, "_conversation24")
+        self.assertEqual(first.continuation_token, "_conversation5")
+        self.assertEqual(
+            [transcript.id for transcript in second.items],
+            [f"_conversation{i}" for i in range(4, -1, -1)],
+        )
+        self.assertIsNone(second.continuation_token)
+
+        await memory_transcript.delete_transcript("test", "_conversation24")
+        result = await memory_transcript.list_transcripts("test")
+        self.assertEqual(result.items[0].id, "_conversation23")
+
     def create_activities(self, conversation_id: str, date: datetime, count: int = 5):
         activities: List[Activity] = []
         time_stamp = date
@@ -0,0 +1,173 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from time import monotonic
+from types import SimpleNamespace
+
+import aiounittest
+from botbuilder.core import (
+    BotAdapter,
+    BotFrameworkAdapter,
+    BotFrameworkAdapterSettings,
+    OutboundScheduler,
+    TurnContext,
+)
+from botbuilder.schema import (
+    Activity,
+    ActivityTypes,
+    ConversationAccount,
+    ResourceResponse,
+)
+
+
+class ThrottledError(Exception):
+    def __init__(self, retry_after: str = None):
+        super().__init__("Too many requests")
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+def create_send(results: list, calls: list, name: str = "send"):
+    async def send():
+        calls.append((name, monotonic()))
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return send
+
+
+class TestOutboundScheduler(aiounittest.AsyncTestCase):
+    async def test_paces_conversation(self):
+        scheduler = OutboundScheduler(conversation_rate=20, conversation_burst=2)
+        calls = []
+        send = create_send(list(range(4)), calls)
+
+        start = monotonic()
+        results = [await scheduler.send("conversation", send) for _ in range(4)]
+
+        assert results == [0, 1, 2, 3]
+        # Two sends go out right away, the others 1/20 s apart.
+        assert calls[1][1] - start < 0.03
+        assert calls[3][1] - start >= 0.09
+
+    async def test_conversations_have_own_buckets(self):
+        scheduler = OutboundScheduler(conversation_rate=1, conversation_burst=1)
+        calls = []
+
+        start = monotonic()
+        await asyncio.gather(
+            *[
+                scheduler.send(f"conversation {index}", create_send([index], calls))
+                for index in range(5)
+            ]
+        )
+
+        assert monotonic() - start < 0.1
+        assert scheduler.get_metrics()["conversations"] == 5
+
+    async def test_retries_throttled_send_after_retry_after(self):
+        scheduler = OutboundScheduler(jitter=0)
+        calls = []
+        send = create_send([ThrottledError("0.1"), "sent"], calls)
+
+        result = await scheduler.send("conversation", send)
+
+        assert result == "sent"
+        assert calls[1][1] - calls[0][1] >= 0.1
+        metrics = scheduler.get_metrics()
+        assert metrics["throttled"] == 1
+        assert metrics["retried"] == 1
+
+    async def test_retries_with_backoff_without_retry_after(self):
+        scheduler = OutboundScheduler(backoff_seconds=0.01, max_retries=2)
+        calls = []
+        send = create_send(
+            [ThrottledError(), ThrottledError(), ThrottledError()], calls
+        )
+
+        with self.assertRaises(ThrottledError):
+            await scheduler.send("conversation", send)
+
+        assert len(calls) == 3
+
+    async def test_fails_when_retry_after_too_long(self):
+        scheduler = OutboundScheduler(max_retry_after=1)
+        calls = []
+        send = create_send([ThrottledError("120"), "sent"], calls)
+
+        with self.assertRaises(ThrottledError):
+            await scheduler.send("conversation", send)
+
+        assert len(calls) == 1
+
+    async def test_does_not_retry_other_errors(self):
+        scheduler = OutboundScheduler()
+        calls = []
+        send = create_send([ValueError("bad request"), "sent"], calls)
+
+        with self.assertRaises(ValueError):
+            await scheduler.send("conversation", send)
+
+        assert len(calls) == 1
+
+    async def test_proactive_sends_yield_to_interactive(self):
+        scheduler = OutboundScheduler(global_rate=50, global_burst=1)
+        calls = []
+
+        async def send_proactive():
+            for index in range(3):
+                await scheduler.send(
+                    f"proactive {index}",
+                    create_send([None], calls, "proactive"),
+                    proactive=True,
+                )
+
+        async def send_interactive():
+            for index in range(3):
+                await scheduler.send(
+                    f"interactive {index}", create_send([None], calls, "interactive")
+                )
+
+        # The proactive sends are queued first.
+        await asyncio.gather(send_proactive(), send_interactive())
+
+        names = [name for name, _ in calls]
+        assert names.index("proactive", 1) > names.index("interactive")
+        assert scheduler.queue_depth == 0
+
+    async def test_adapter_sends_through_scheduler(self):
+        adapter = BotFrameworkAdapter(
+            BotFrameworkAdapterSettings(
+                "", "", outbound_scheduler=OutboundScheduler(jitter=0)
+            )
+        )
+        results = [ThrottledError("0"), ResourceResponse(id="reply")]
+
+        async def send_to_conversation(conversation_id, activity):
+            # pylint: disable=unused-argument
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        context = TurnContext(adapter, Activity(type=ActivityTypes.message))
+        context.turn_state[BotAdapter.BOT_CONNECTOR_CLIENT_KEY] = SimpleNamespace(
+            conversations=SimpleNamespace(send_to_conversation=send_to_conversation)
+        )
+
+        responses = await adapter.send_activities(
+            context,
+            [
+                Activity(
+                    type=ActivityTypes.message,
+                    service_url="https://service",
+                    conversation=ConversationAccount(id="conversation"),
+                )
+            ],
+        )
+
+        assert responses[0].id == "reply"
+        assert adapter.outbound_scheduler.get_metrics()["retried"] == 1
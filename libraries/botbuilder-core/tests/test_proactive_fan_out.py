@@ -0,0 +1,174 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from types import SimpleNamespace
+
+import aiounittest
+from botbuilder.core import (
+    BotAdapter,
+    CloudAdapterBase,
+    FanOutCheckpoint,
+    MemoryStorage,
+    ProactiveFanOut,
+    TurnContext,
+)
+from botbuilder.schema import ConversationAccount, ConversationReference
+from botframework.connector.auth import (
+    AuthenticationConstants,
+    BotFrameworkAuthentication,
+    ConnectorFactory,
+)
+
+from simple_adapter import SimpleAdapter
+
+
+def create_references(count: int):
+    return [
+        ConversationReference(
+            channel_id="test",
+            service_url="https://service",
+            conversation=ConversationAccount(id=f"conversation {index}"),
+        )
+        for index in range(count)
+    ]
+
+
+class ServerError(Exception):
+    def __init__(self):
+        super().__init__("Service unavailable")
+        self.response = SimpleNamespace(status_code=503)
+
+
+class NoConnectorFactory(ConnectorFactory):
+    async def create(self, service_url: str, audience: str):
+        return None
+
+
+class NoAuthentication(BotFrameworkAuthentication):
+    async def authenticate_request(self, activity, auth_header):
+        raise NotImplementedError()
+
+    async def authenticate_streaming_request(self, auth_header, channel_id_header):
+        raise NotImplementedError()
+
+    def create_connector_factory(self, claims_identity):
+        return NoConnectorFactory()
+
+    async def create_user_token_client(self, claims_identity):
+        return None
+
+
+class TestProactiveFanOut(aiounittest.AsyncTestCase):
+    async def test_continues_every_conversation(self):
+        adapter = SimpleAdapter()
+        continued = []
+
+        async def callback(context: TurnContext):
+            continued.append(context.activity.conversation.id)
+            await context.send_activity("notification")
+
+        progress = []
+        fan_out = adapter.continue_conversations(
+            create_references(10),
+            callback,
+            max_concurrency=3,
+            on_progress=lambda fan_out: progress.append(fan_out.completed),
+        )
+        results = [result async for result in fan_out]
+
+        assert sorted(continued) == sorted(f"conversation {i}" for i in range(10))
+        assert sorted(result.index for result in results) == list(range(10))
+        assert all(result.succeeded for result in results)
+        assert progress == list(range(1, 11))
+        assert fan_out.succeeded == 10
+
+    async def test_cloud_adapter(self):
+        adapter = CloudAdapterBase(NoAuthentication())
+        bot_ids = []
+
+        async def callback(context: TurnContext):
+            claims = context.turn_state[BotAdapter.BOT_IDENTITY_KEY].claims
+            bot_ids.append(claims[AuthenticationConstants.APP_ID_CLAIM])
+
+        fan_out = await adapter.continue_conversations(
+            create_references(3), callback, bot_id="bot"
+        ).run()
+
+        assert fan_out.succeeded == 3
+        assert bot_ids == ["bot"] * 3
+
+    async def test_bounds_concurrency(self):
+        running = []
+        max_running = []
+
+        async def continue_conversation(reference):
+            # pylint: disable=unused-argument
+            running.append(None)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+        async def references():
+            for reference in create_references(20):
+                yield reference
+
+        fan_out = await ProactiveFanOut(
+            continue_conversation, references(), max_concurrency=4
+        ).run()
+
+        assert fan_out.succeeded == 20
+        assert max(max_running) == 4
+
+    async def test_retries_transient_errors(self):
+        attempts = {}
+
+        async def continue_conversation(reference):
+            conversation_id = reference.conversation.id
+            attempts[conversation_id] = attempts.get(conversation_id, 0) + 1
+            if conversation_id == "conversation 1" and attempts[conversation_id] < 3:
+                raise ServerError()
+            if conversation_id == "conversation 2":
+                raise ValueError("not transient")
+
+        fan_out = ProactiveFanOut(
+            continue_conversation, create_references(3), backoff_seconds=0
+        )
+        results = {result.index: result async for result in fan_out}
+
+        assert results[0].succeeded
+        assert results[1].succeeded and results[1].attempts == 3
+        assert isinstance(results[2].error, ValueError)
+        assert results[2].attempts == 1
+        assert (fan_out.succeeded, fan_out.failed, fan_out.retried) == (2, 1, 2)
+
+    async def test_checkpoint_resumes(self):
+        storage = MemoryStorage()
+        continued = []
+
+        async def continue_conversation(reference):
+            continued.append(reference.conversation.id)
+
+        fan_out = ProactiveFanOut(
+            continue_conversation,
+            create_references(10),
+            max_concurrency=1,
+            checkpoint=FanOutCheckpoint(storage, "broadcast", save_every=1),
+        )
+        # The broadcast is interrupted after the fourth conversation.
+        async for result in fan_out:
+            if result.index == 3:
+                break
+
+        fan_out = await ProactiveFanOut(
+            continue_conversation,
+            create_references(10),
+            checkpoint=FanOutCheckpoint(storage, "broadcast"),
+        ).run()
+
+        assert continued == [f"conversation {i}" for i in range(10)]
+        assert fan_out.skipped == 4
+        assert fan_out.succeeded == 6
+        checkpoint = FanOutCheckpoint(storage, "broadcast")
+        await checkpoint.load()
+        assert checkpoint.position == 10
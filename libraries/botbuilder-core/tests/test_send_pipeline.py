@@ -0,0 +1,200 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from types import SimpleNamespace
+
+import aiounittest
+from botbuilder.core import (
+    BotAdapter,
+    BotFrameworkAdapter,
+    BotFrameworkAdapterSettings,
+    CloudAdapterBase,
+    SendPipeline,
+    TurnContext,
+)
+from botbuilder.schema import (
+    Activity,
+    ActivityTypes,
+    ConversationAccount,
+    ResourceResponse,
+)
+
+
+class FakeConversations:
+    """
+    Answers sends after a delay, signalling each request as sent right away.
+    """
+
+    def __init__(self, signal_sent: bool = True, fail_text: str = None):
+        self.signal_sent = signal_sent
+        self.fail_text = fail_text
+        self.events = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send_to_conversation(
+        self, conversation_id, activity, on_request_sent=None
+    ):
+        # pylint: disable=unused-argument
+        self.events.append(f"sent {activity.text}")
+        if on_request_sent and self.signal_sent:
+            on_request_sent()
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Later activities are answered first.
+        await asyncio.sleep(0.05 / len(self.events))
+        self.in_flight -= 1
+        self.events.append(f"done {activity.text}")
+
+        if activity.text == self.fail_text:
+            raise Exception(f"failed {activity.text}")
+        return ResourceResponse(id=f"id {activity.text}")
+
+
+def create_context(
+    conversations: FakeConversations, channel_id: str = "test", cloud: bool = False
+):
+    adapter = (
+        CloudAdapterBase(SimpleNamespace(), pipeline_sends=True)
+        if cloud
+        else BotFrameworkAdapter(
+            BotFrameworkAdapterSettings("", "", pipeline_sends=True)
+        )
+    )
+    context = TurnContext(
+        adapter, Activity(type=ActivityTypes.message, channel_id=channel_id)
+    )
+    context.turn_state[BotAdapter.BOT_CONNECTOR_CLIENT_KEY] = SimpleNamespace(
+        conversations=conversations
+    )
+    return adapter, context
+
+
+def create_activities(*texts: str, channel_id: str = "test"):
+    # Texts starting with "typing" are typing activities.
+    return [
+        Activity(
+            type=(
+                ActivityTypes.typing
+                if text.startswith("typing")
+                else ActivityTypes.message
+            ),
+            text=text,
+            channel_id=channel_id,
+            service_url="https://service",
+            conversation=ConversationAccount(id="conversation"),
+        )
+        for text in texts
+    ]
+
+
+class TestSendPipeline(aiounittest.AsyncTestCase):
+    async def test_messages_keep_order(self):
+        conversations = FakeConversations()
+        adapter, context = create_context(conversations)
+
+        responses = await adapter.send_activities(
+            context, create_activities("a", "b", "c")
+        )
+
+        assert [response.id for response in responses] == ["id a", "id b", "id c"]
+        assert conversations.events == [
+            "sent a",
+            "done a",
+            "sent b",
+            "done b",
+            "sent c",
+            "done c",
+        ]
+
+    async def test_pipelines_typing_activities(self):
+        for cloud in (False, True):
+            conversations = FakeConversations()
+            adapter, context = create_context(conversations, cloud=cloud)
+
+            responses = await adapter.send_activities(
+                context, create_activities("typing 1", "a", "typing 2", "b")
+            )
+
+            assert [response.id for response in responses] == [
+                "id typing 1",
+                "id a",
+                "id typing 2",
+                "id b",
+            ]
+            # The messages start once typing activities were sent, and wait for each other.
+            events = conversations.events
+            assert events.index("sent a") < events.index("done typing 1")
+            assert events.index("done a") < events.index("sent b")
+            assert conversations.max_in_flight > 1
+
+    async def test_sequential_without_sent_signal(self):
+        conversations = FakeConversations(signal_sent=False)
+        adapter, context = create_context(conversations)
+
+        responses = await adapter.send_activities(
+            context, create_activities("typing", "a", "b")
+        )
+
+        assert [response.id for response in responses] == ["id typing", "id a", "id b"]
+        assert conversations.max_in_flight == 1
+
+    async def test_sequential_channels(self):
+        conversations = FakeConversations()
+        adapter, context = create_context(conversations, "msteams")
+
+        await adapter.send_activities(
+            context, create_activities("typing", "a", channel_id="msteams")
+        )
+
+        assert conversations.max_in_flight == 1
+
+    async def test_delay_overlaps_typing_only(self):
+        conversations = FakeConversations()
+        adapter, context = create_context(conversations)
+        activities = create_activities("typing", "a", "b")
+        activities.insert(1, Activity(type="delay", value=1))
+        activities.insert(3, Activity(type="delay", value=1))
+
+        responses = await adapter.send_activities(context, activities)
+
+        assert [response.id for response in responses] == [
+            "id typing",
+            "",
+            "id a",
+            "",
+            "id b",
+        ]
+        events = conversations.events
+        assert events.index("sent a") < events.index("done typing")
+        assert events.index("done a") < events.index("sent b")
+
+    def test_settings_are_per_adapter(self):
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings("", ""))
+        cloud_adapter = CloudAdapterBase(SimpleNamespace())
+
+        for each in (adapter, cloud_adapter):
+            assert not each.pipeline_sends
+            assert each.sequential_send_channels == ("msteams",)
+            assert each.outbound_scheduler is None
+            assert not each.lazy_activities
+
+    async def test_stops_sending_after_failure(self):
+        conversations = FakeConversations(fail_text="a")
+        pipeline = SendPipeline()
+
+        async def send(text, on_request_sent):
+            return await conversations.send_to_conversation(
+                "conversation", Activity(text=text), on_request_sent
+            )
+
+        await pipeline.send(lambda on_sent: send("a", on_sent))
+        await asyncio.sleep(0.1)
+        with self.assertRaises(Exception) as error:
+            await pipeline.send(lambda on_sent: send("b", on_sent))
+            await pipeline.wait()
+
+        assert str(error.exception) == "failed a"
+        assert "sent b" not in conversations.events
@@ -0,0 +1,203 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+
+import pytest
+
+from botbuilder.core import MemoryStorage, ShardedStorage, StoreItem
+from botbuilder.testing import StorageBaseTests
+
+
+def get_storage():
+    return ShardedStorage({f"shard{index}": MemoryStorage() for index in range(3)})
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    async def read(self, keys):
+        self.reads.append(list(keys))
+        return await super().read(keys)
+
+
+class PausedStorage(MemoryStorage):
+    """
+    Waits for `resume` before its first write.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.resume = asyncio.Event()
+        self.paused = asyncio.Event()
+
+    async def write(self, changes):
+        if not self.paused.is_set():
+            self.paused.set()
+            await self.resume.wait()
+        return await super().write(changes)
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag="*"):
+        super(SimpleStoreItem, self).__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+class TestShardedStorageBaseTests:
+    @pytest.mark.asyncio
+    async def test_return_empty_object_when_reading_unknown_key(self):
+        test_ran = await StorageBaseTests.return_empty_object_when_reading_unknown_key(
+            get_storage()
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_reading(self):
+        test_ran = await StorageBaseTests.handle_null_keys_when_reading(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_writing(self):
+        test_ran = await StorageBaseTests.handle_null_keys_when_writing(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_does_not_raise_when_writing_no_items(self):
+        test_ran = await StorageBaseTests.does_not_raise_when_writing_no_items(
+            get_storage()
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_create_object(self):
+        test_ran = await StorageBaseTests.create_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_update_object(self):
+        test_ran = await StorageBaseTests.update_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_delete_object(self):
+        test_ran = await StorageBaseTests.delete_object(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_perform_batch_operations(self):
+        test_ran = await StorageBaseTests.perform_batch_operations(get_storage())
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_proceeds_through_waterfall(self):
+        test_ran = await StorageBaseTests.proceeds_through_waterfall(get_storage())
+
+        assert test_ran
+
+
+class TestShardedStorage:
+    @pytest.mark.asyncio
+    async def test_spreads_keys_across_shards(self):
+        shards = {f"shard{index}": MemoryStorage() for index in range(4)}
+        storage = ShardedStorage(shards)
+
+        keys = [f"conversation/{index}" for index in range(400)]
+        await storage.write({key: {"key": key} for key in keys})
+
+        for name, shard in shards.items():
+            assert 50 < len(shard.memory) < 150
+            assert all(storage.get_shard_name(key) == name for key in shard.memory)
+        assert len(await storage.read(keys)) == 400
+
+    @pytest.mark.asyncio
+    async def test_reads_each_shard_once(self):
+        shards = {f"shard{index}": CountingStorage() for index in range(3)}
+        storage = ShardedStorage(shards)
+
+        await storage.read([f"key{index}" for index in range(30)])
+
+        for shard in shards.values():
+            assert len(shard.reads) == 1
+        assert sum(len(shard.reads[0]) for shard in shards.values()) == 30
+
+    def test_adding_a_shard_moves_few_keys(self):
+        shards = {f"shard{index}": MemoryStorage() for index in range(4)}
+        before = ShardedStorage(shards)
+        after = ShardedStorage(dict(shards, shard4=MemoryStorage()))
+
+        keys = [f"user/{index}" for index in range(1000)]
+        moved = [
+            key
+            for key in keys
+            if before.get_shard_name(key) != after.get_shard_name(key)
+        ]
+
+        assert all(after.get_shard_name(key) == "shard4" for key in moved)
+        assert 100 < len(moved) < 300
+
+    @pytest.mark.asyncio
+    async def test_resharding_reads_and_moves_keys_from_previous_shards(self):
+        previous = {"shard0": MemoryStorage(), "shard1": MemoryStorage()}
+        old_storage = ShardedStorage(previous)
+        keys = [f"key{index}" for index in range(50)]
+        await old_storage.write({key: {"value": key, "e_tag": "*"} for key in keys})
+        await old_storage.write({key: {"value": key, "e_tag": "*"} for key in keys})
+
+        shards = dict(previous, shard2=MemoryStorage())
+        storage = ShardedStorage(shards, previous_shards=previous)
+        moved = [key for key in keys if storage.get_shard_name(key) == "shard2"]
+        assert moved
+
+        data = await storage.read(keys)
+        assert sorted(data) == sorted(keys)
+        assert sorted(shards["shard2"].memory) == sorted(moved)
+
+        # the copy carries the e_tag of the new shard, so it can be written back
+        data[moved[0]]["value"] = "updated"
+        await storage.write({moved[0]: data[moved[0]]})
+
+        await storage.delete([moved[1]])
+        assert moved[1] not in shards["shard2"].memory
+        assert all(moved[1] not in shard.memory for shard in previous.values())
+        assert moved[1] not in await storage.read([moved[1]])
+
+        storage.complete_resharding()
+        assert not storage.is_resharding
+        assert (await storage.read([moved[0]]))[moved[0]]["value"] == "updated"
+
+    @pytest.mark.asyncio
+    async def test_resharding_keeps_writes_of_concurrent_readers(self):
+        previous = {"old": MemoryStorage()}
+        await previous["old"].write({"key": {"value": 1}})
+        shards = {"new": PausedStorage()}
+
+        # A reader that read the previous shard, but didn't copy the item yet.
+        first = ShardedStorage(shards, previous_shards=previous)
+        first_read = asyncio.ensure_future(first.read(["key"]))
+        await shards["new"].paused.wait()
+
+        # Another reader copies the item, and a newer version is written.
+        second = ShardedStorage(shards, previous_shards=previous)
+        item = (await second.read(["key"]))["key"]
+        item["value"] = 2
+        await second.write({"key": item})
+
+        shards["new"].resume.set()
+        assert (await first_read)["key"]["value"] == 2
+        assert (await second.read(["key"]))["key"]["value"] == 2
+
+    def test_requires_a_shard(self):
+        with pytest.raises(ValueError):
+            ShardedStorage({})
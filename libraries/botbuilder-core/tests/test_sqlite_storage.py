@@ -0,0 +1,243 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from botbuilder.core import SqliteStorage, StoreItem, StoreItemDelta
+from botbuilder.testing import StorageBaseTests
+
+
+def get_storage(tmp_path, **kwargs):
+    return SqliteStorage(str(tmp_path / "state.db"), **kwargs)
+
+
+async def run_base_test(tmp_path, base_test) -> bool:
+    storage = get_storage(tmp_path)
+    try:
+        return await base_test(storage)
+    finally:
+        await storage.close()
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag="*"):
+        super(SimpleStoreItem, self).__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+class TestSqliteStorageBaseTests:
+    @pytest.mark.asyncio
+    async def test_return_empty_object_when_reading_unknown_key(self, tmp_path):
+        test_ran = await run_base_test(
+            tmp_path, StorageBaseTests.return_empty_object_when_reading_unknown_key
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_reading(self, tmp_path):
+        test_ran = await run_base_test(
+            tmp_path, StorageBaseTests.handle_null_keys_when_reading
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_null_keys_when_writing(self, tmp_path):
+        test_ran = await run_base_test(
+            tmp_path, StorageBaseTests.handle_null_keys_when_writing
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_does_not_raise_when_writing_no_items(self, tmp_path):
+        test_ran = await run_base_test(
+            tmp_path, StorageBaseTests.does_not_raise_when_writing_no_items
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_create_object(self, tmp_path):
+        test_ran = await run_base_test(tmp_path, StorageBaseTests.create_object)
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_handle_crazy_keys(self, tmp_path):
+        test_ran = await run_base_test(tmp_path, StorageBaseTests.handle_crazy_keys)
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_update_object(self, tmp_path):
+        test_ran = await run_base_test(tmp_path, StorageBaseTests.update_object)
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_delete_object(self, tmp_path):
+        test_ran = await run_base_test(tmp_path, StorageBaseTests.delete_object)
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_delete_unknown_object(self, tmp_path):
+        test_ran = await run_base_test(tmp_path, StorageBaseTests.delete_unknown_object)
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_perform_batch_operations(self, tmp_path):
+        test_ran = await run_base_test(
+            tmp_path, StorageBaseTests.perform_batch_operations
+        )
+
+        assert test_ran
+
+    @pytest.mark.asyncio
+    async def test_proceeds_through_waterfall(self, tmp_path):
+        test_ran = await run_base_test(
+            tmp_path, StorageBaseTests.proceeds_through_waterfall
+        )
+
+        assert test_ran
+
+
+class TestSqliteStorage:
+    @pytest.mark.asyncio
+    async def test_items_survive_reopening(self, tmp_path):
+        storage = get_storage(tmp_path)
+        e_tags = await storage.write({"user": SimpleStoreItem(counter=5)})
+        await storage.close()
+
+        storage = get_storage(tmp_path)
+        data = await storage.read(["user"])
+        await storage.close()
+
+        assert data["user"].counter == 5
+        assert data["user"].e_tag == e_tags["user"]
+
+    @pytest.mark.asyncio
+    async def test_conflicting_batch_writes_nothing(self, tmp_path):
+        storage = get_storage(tmp_path)
+        await storage.write({"a": SimpleStoreItem(), "b": SimpleStoreItem()})
+        data = await storage.read(["a", "b"])
+        stale_e_tag = data["b"].e_tag
+        await storage.write({"b": SimpleStoreItem(counter=2, e_tag=stale_e_tag)})
+
+        with pytest.raises(KeyError):
+            await storage.write(
+                {
+                    "a": SimpleStoreItem(counter=3, e_tag=data["a"].e_tag),
+                    "b": SimpleStoreItem(counter=3, e_tag=stale_e_tag),
+                }
+            )
+
+        data = await storage.read(["a", "b"])
+        await storage.close()
+        assert data["a"].counter == 1
+        assert data["b"].counter == 2
+
+    @pytest.mark.asyncio
+    async def test_items_expire_after_ttl(self, tmp_path):
+        storage = get_storage(tmp_path, ttl_seconds=10)
+        with patch("botbuilder.core.sqlite_storage.time") as clock:
+            clock.return_value = 100
+            await storage.write({"a": {"id": 1}})
+            clock.return_value = 105
+            await storage.write({"b": {"id": 2}})
+
+            clock.return_value = 110
+            data = await storage.read(["a", "b"])
+            assert sorted(data) == ["b"]
+
+            # an expired item can be written again whatever its e_tag was
+            await storage.write({"a": {"id": 3, "e_tag": "stale"}})
+
+            clock.return_value = 116
+            assert await storage.purge_expired() == 1
+            data = await storage.read(["a", "b"])
+            assert sorted(data) == ["a"]
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_items_are_purged_in_background(self, tmp_path):
+        storage = get_storage(tmp_path, ttl_seconds=10, expiry_interval_seconds=0.01)
+        with patch("botbuilder.core.sqlite_storage.time") as clock:
+            clock.return_value = 100
+            await storage.write({"a": {"id": 1}})
+            clock.return_value = 200
+            await asyncio.sleep(0.1)
+
+            assert await storage.purge_expired() == 0
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_items_written_with_another_serializer_are_readable(self, tmp_path):
+        storage = get_storage(tmp_path)
+        await storage.write({"pickled": SimpleStoreItem(counter=7)})
+        await storage.close()
+
+        storage = get_storage(tmp_path, serializer="json")
+        await storage.write({"json": {"count": 8}})
+        data = await storage.read(["pickled", "json"])
+        await storage.close()
+
+        assert data["pickled"].counter == 7
+        assert data["json"]["count"] == 8
+
+    @pytest.mark.asyncio
+    async def test_write_delta_updates_properties_in_place(self, tmp_path):
+        storage = get_storage(tmp_path, serializer="json")
+        await storage.write({"state": {"dialog": {"index": 1}, "user": "name"}})
+        item = (await storage.read(["state"]))["state"]
+
+        item["dialog"]["index"] = 2
+        del item["user"]
+        item["added"] = True
+        e_tags = await storage.write_delta(
+            {
+                "state": StoreItemDelta(
+                    item, {"dialog": item["dialog"], "added": True}, ["user"]
+                ),
+                "new": StoreItemDelta({"count": 1}, {"count": 1}),
+            }
+        )
+
+        data = await storage.read(["state", "new"])
+        await storage.close()
+        assert data["state"] == {
+            "dialog": {"index": 2},
+            "added": True,
+            "e_tag": e_tags["state"],
+        }
+        assert data["new"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_delta_patches_only_items_of_the_same_serializer(
+        self, tmp_path
+    ):
+        storage = get_storage(tmp_path)
+        await storage.write({"state": {"dialog": {"index": 1}, "user": "name"}})
+        await storage.close()
+
+        storage = get_storage(tmp_path, serializer="json")
+        item = {"dialog": {"index": 2}, "user": "name"}
+        await storage.write_delta(
+            {"state": StoreItemDelta(item, {"dialog": {"index": 2}})}
+        )
+        data = await storage.read(["state"])
+        await storage.close()
+
+        assert data["state"]["dialog"] == {"index": 2}
+        assert data["state"]["user"] == "name"
+
+    def test_rejects_invalid_table_name(self, tmp_path):
+        with pytest.raises(Exception):
+            get_storage(tmp_path, table_name="items; DROP TABLE items")
@@ -0,0 +1,149 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import importlib.util
+import sys
+from datetime import datetime
+from enum import Enum
+from unittest.mock import patch
+from uuid import UUID
+
+import aiounittest
+from botbuilder.core import (
+    JsonPickleStoreItemSerializer,
+    JsonStoreItemSerializer,
+    MsgPackStoreItemSerializer,
+    StoreItem,
+    get_store_item_serializer,
+)
+
+DIALOG_STATE = {
+    "DialogState": {
+        "dialogStack": [
+            {"id": "mainDialog", "state": {"stepIndex": 2, "values": {"a": [1, 2.5]}}}
+        ]
+    },
+    "flag": True,
+    "nothing": None,
+}
+
+
+class Color(Enum):
+    RED = "red"
+
+
+def create_json_serializers():
+    # With orjson, when it is installed, and with the json module.
+    serializers = [JsonStoreItemSerializer()]
+    with patch.dict(sys.modules, {"orjson": None}):
+        serializers.append(JsonStoreItemSerializer())
+    return serializers
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag="*"):
+        super().__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+class TestStoreItemSerializer(aiounittest.AsyncTestCase):
+    def test_jsonpickle_round_trips_objects(self):
+        serializer = JsonPickleStoreItemSerializer()
+        item = SimpleStoreItem(counter=5)
+
+        restored = serializer.deserialize(serializer.serialize(item))
+        self.assertIsInstance(restored, SimpleStoreItem)
+        self.assertEqual(5, restored.counter)
+
+        restored = serializer.from_document(serializer.to_document(item))
+        self.assertIsInstance(restored, SimpleStoreItem)
+        self.assertEqual(5, restored.counter)
+
+    def test_json_round_trips_plain_state(self):
+        serializer = JsonStoreItemSerializer()
+
+        self.assertEqual(
+            DIALOG_STATE, serializer.deserialize(serializer.serialize(DIALOG_STATE))
+        )
+        self.assertEqual(
+            DIALOG_STATE, serializer.from_document(serializer.to_document(DIALOG_STATE))
+        )
+
+    def test_json_document_is_a_copy(self):
+        serializer = JsonStoreItemSerializer()
+        item = {"value": 1, "e_tag": "*"}
+
+        document = serializer.to_document(item)
+        del document["e_tag"]
+        self.assertIn("e_tag", item)
+
+    def test_json_rejects_objects(self):
+        serializer = JsonStoreItemSerializer()
+
+        with self.assertRaises(TypeError):
+            serializer.serialize({"item": SimpleStoreItem()})
+        with self.assertRaises(TypeError):
+            serializer.to_document(SimpleStoreItem())
+
+    def test_json_backends_accept_the_same_items(self):
+        uuid = UUID(int=1)
+        for serializer in create_json_serializers():
+            self.assertEqual(
+                {"color": "red", "id": str(uuid), "text": "é", "large": 2**64 - 1},
+                serializer.deserialize(
+                    serializer.serialize(
+                        {
+                            "color": Color.RED,
+                            "id": uuid,
+                            "text": "é",
+                            "large": 2**64 - 1,
+                        }
+                    )
+                ),
+            )
+
+            for value in (datetime(2024, 1, 1), {1: "key"}, 2**64, -(2**63) - 1):
+                with self.assertRaises(TypeError):
+                    serializer.serialize({"value": value})
+            for value in (float("nan"), float("inf")):
+                with self.assertRaises(ValueError):
+                    serializer.serialize({"value": [value], "nothing": None})
+                with self.assertRaises(ValueError):
+                    serializer.to_document({"value": value})
+
+    def test_jsonpickle_reads_json_payloads(self):
+        # plain state written with the json serializer is also valid jsonpickle
+        data = JsonStoreItemSerializer().serialize(DIALOG_STATE)
+
+        self.assertEqual(
+            DIALOG_STATE, JsonPickleStoreItemSerializer().deserialize(data)
+        )
+
+    def test_msgpack_round_trips_plain_state(self):
+        if importlib.util.find_spec("msgpack") is None:
+            self.skipTest("msgpack is not installed")
+        serializer = MsgPackStoreItemSerializer()
+
+        self.assertEqual(
+            DIALOG_STATE, serializer.deserialize(serializer.serialize(DIALOG_STATE))
+        )
+        with self.assertRaises(TypeError):
+            serializer.to_document(DIALOG_STATE)
+
+    def test_get_store_item_serializer(self):
+        self.assertIsInstance(
+            get_store_item_serializer(), JsonPickleStoreItemSerializer
+        )
+        self.assertIsInstance(
+            get_store_item_serializer("json"), JsonStoreItemSerializer
+        )
+        self.assertIs(
+            get_store_item_serializer("json"), get_store_item_serializer("json")
+        )
+
+        serializer = JsonStoreItemSerializer()
+        self.assertIs(serializer, get_store_item_serializer(serializer))
+
+        with self.assertRaises(KeyError):
+            get_store_item_serializer("unknown")
@@ -1,10 +1,15 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+import asyncio
+from typing import List
+
 import aiounittest
 
 from botbuilder.core import (
     MemoryTranscriptStore,
+    TranscriptBufferFullPolicy,
+    TranscriptLogger,
     TranscriptLoggerMiddleware,
     TurnContext,
 )
@@ -12,6 +17,26 @@ from botbuilder.core.adapters import TestAdapter, TestFlow
 from botbuilder.schema import Activity, ActivityEventNames, ActivityTypes
 
 
+class BatchRecordingLogger(TranscriptLogger):
+    def __init__(self, delay: float = 0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.batches: List[List[Activity]] = []
+
+    async def log_activity(self, activity: Activity) -> None:
+        await self.log_activities([activity])
+
+    async def log_activities(self, activities: List[Activity]) -> None:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise Exception("transcript store unavailable")
+        self.batches.append(activities)
+
+
+async def echo(context: TurnContext):
+    await context.send_activity(context.activity.text)
+
+
 class TestTranscriptLoggerMiddleware(aiounittest.AsyncTestCase):
     async def test_should_not_log_continue_conversation(self):
         transcript_store = MemoryTranscriptStore()
@@ -42,3 +67,82 @@ class TestTranscriptLoggerMiddleware(aiounittest.AsyncTestCase):
             2,
             "only the two message activities should be logged",
         )
+
+    async def test_should_log_turn_activities_as_one_batch(self):
+        logger = BatchRecordingLogger()
+        adapter = TestAdapter(echo)
+        adapter.use(TranscriptLoggerMiddleware(logger))
+
+        await TestFlow(None, adapter).send("foo")
+
+        self.assertEqual(1, len(logger.batches))
+        self.assertEqual(["foo", "foo"], [item.text for item in logger.batches[0]])
+
+    async def test_should_log_in_background(self):
+        logger = BatchRecordingLogger(delay=0.05)
+        sut = TranscriptLoggerMiddleware(logger, background=True)
+        adapter = TestAdapter(echo)
+        adapter.use(sut)
+
+        step = await TestFlow(None, adapter).send("foo")
+        await step.send("bar")
+        # the turns didn't wait for the logger
+        self.assertEqual(0, sut.written)
+
+        await sut.close()
+        self.assertEqual(4, sut.queued)
+        self.assertEqual(4, sut.written)
+        self.assertEqual(
+            ["foo", "foo", "bar", "bar"],
+            [item.text for batch in logger.batches for item in batch],
+        )
+        # activities buffered together are written together
+        self.assertLess(len(logger.batches), 4)
+
+    async def test_should_drop_activities_when_buffer_is_full(self):
+        logger = BatchRecordingLogger(delay=0.05)
+        sut = TranscriptLoggerMiddleware(
+            logger,
+            background=True,
+            max_buffer_size=1,
+            buffer_full_policy=TranscriptBufferFullPolicy.drop,
+        )
+        adapter = TestAdapter(echo)
+        adapter.use(sut)
+
+        await TestFlow(None, adapter).send("foo")
+        await sut.close()
+
+        self.assertEqual(1, sut.queued)
+        self.assertEqual(1, sut.dropped)
+        self.assertEqual(1, sut.written)
+
+    async def test_should_block_when_buffer_is_full(self):
+        logger = BatchRecordingLogger(delay=0.01)
+        sut = TranscriptLoggerMiddleware(
+            logger, background=True, max_buffer_size=1, batch_size=1
+        )
+        adapter = TestAdapter(echo)
+        adapter.use(sut)
+
+        step = await TestFlow(None, adapter).send("foo")
+        await step.send("bar")
+        await sut.close()
+
+        self.assertEqual(0, sut.dropped)
+        self.assertEqual(4, sut.written)
+        self.assertEqual(4, len(logger.batches))
+
+    async def test_should_count_failed_batches(self):
+        sut = TranscriptLoggerMiddleware(
+            BatchRecordingLogger(fail=True), background=True
+        )
+        adapter = TestAdapter(echo)
+        adapter.use(sut)
+
+        await TestFlow(None, adapter).send("foo")
+        await sut.flush()
+
+        self.assertEqual(2, sut.failed)
+        self.assertEqual(0, sut.written)
+        await sut.close()
@@ -117,6 +117,9 @@ class DialogManager:
             self.user_state: UserState = self.user_state
             bot_state_set.add(self.user_state)
 
+        # load all BotState scopes up front so they share storage round trips
+        await bot_state_set.load_all(context)
+
         # create property accessors
         # DateTime(last_access)
         last_access_property = self.conversation_state.create_property(self.last_access)
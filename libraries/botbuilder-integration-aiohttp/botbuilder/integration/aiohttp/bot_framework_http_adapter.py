@@ -18,7 +18,7 @@ from botbuilder.core.streaming import (
     BotFrameworkHttpAdapterBase,
     StreamingRequestHandler,
 )
-from botbuilder.schema import Activity, ResourceResponse
+from botbuilder.schema import Activity, LazyActivity, ResourceResponse
 from botbuilder.integration.aiohttp.streaming import AiohttpWebSocket
 from botframework.connector.auth import AuthenticationConstants, JwtTokenValidation
 
@@ -51,7 +51,8 @@ class BotFrameworkHttpAdapter(BotFrameworkHttpAdapterBase):
             else:
                 raise HTTPUnsupportedMediaType()
 
-            activity = Activity().deserialize(body)
+            activity_class = LazyActivity if self.lazy_activities else Activity
+            activity = activity_class.deserialize(body)
             auth_header = (
                 request.headers["Authorization"]
                 if "Authorization" in request.headers
@@ -27,7 +27,7 @@ from botbuilder.core.streaming import (
     StreamingHttpDriver,
     StreamingRequestHandler,
 )
-from botbuilder.schema import Activity
+from botbuilder.schema import Activity, LazyActivity
 from botbuilder.integration.aiohttp.streaming import AiohttpWebSocket
 from botframework.connector import AsyncBfPipeline, BotFrameworkConnectorConfiguration
 from botframework.connector.aio import ConnectorClient
@@ -45,11 +45,15 @@ from .bot_framework_http_adapter_integration_base import (
 
 
 class CloudAdapter(CloudAdapterBase, BotFrameworkHttpAdapterIntegrationBase):
-    def __init__(self, bot_framework_authentication: BotFrameworkAuthentication = None):
+    def __init__(
+        self, bot_framework_authentication: BotFrameworkAuthentication = None, **kwargs
+    ):
         """
         Initializes a new instance of the CloudAdapter class.
 
         :param bot_framework_authentication: Optional BotFrameworkAuthentication instance
+        :param kwargs: The options of :class:`CloudAdapterBase`, like `pipeline_sends` or
+            `lazy_activities`.
         """
         # pylint: disable=invalid-name
         if not bot_framework_authentication:
@@ -57,7 +61,7 @@ class CloudAdapter(CloudAdapterBase, BotFrameworkHttpAdapterIntegrationBase):
 
         self._AUTH_HEADER_NAME = "authorization"
         self._CHANNEL_ID_HEADER_NAME = "channelid"
-        super().__init__(bot_framework_authentication)
+        super().__init__(bot_framework_authentication, **kwargs)
 
     async def process(
         self, request: Request, bot: Bot, ws_response: WebSocketResponse = None
@@ -84,7 +88,9 @@ class CloudAdapter(CloudAdapterBase, BotFrameworkHttpAdapterIntegrationBase):
                 else:
                     raise HTTPUnsupportedMediaType()
 
-                activity: Activity = Activity().deserialize(body)
+                activity: Activity = (
+                    LazyActivity if self.lazy_activities else Activity
+                ).deserialize(body)
 
                 # A POST request must contain an Activity
                 if not activity.type:
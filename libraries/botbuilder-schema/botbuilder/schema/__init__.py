@@ -1,82 +1,89 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+from importlib import import_module
 from warnings import warn
 
-from ._models_py3 import Activity
-from ._models_py3 import ActivityEventNames
-from ._models_py3 import AdaptiveCardInvokeAction
-from ._models_py3 import AdaptiveCardInvokeResponse
-from ._models_py3 import AdaptiveCardInvokeValue
-from ._models_py3 import AnimationCard
-from ._models_py3 import Attachment
-from ._models_py3 import AttachmentData
-from ._models_py3 import AttachmentInfo
-from ._models_py3 import AttachmentView
-from ._models_py3 import AudioCard
-from ._models_py3 import BasicCard
-from ._models_py3 import CardAction
-from ._models_py3 import CardImage
-from ._models_py3 import ChannelAccount
-from ._models_py3 import ConversationAccount
-from ._models_py3 import ConversationMembers
-from ._models_py3 import ConversationParameters
-from ._models_py3 import ConversationReference
-from ._models_py3 import ConversationResourceResponse
-from ._models_py3 import ConversationsResult
-from ._models_py3 import ExpectedReplies
-from ._models_py3 import Entity
-from ._models_py3 import Error
-from ._models_py3 import ErrorResponse, ErrorResponseException
-from ._models_py3 import Fact
-from ._models_py3 import GeoCoordinates
-from ._models_py3 import HeroCard
-from ._models_py3 import InnerHttpError
-from ._models_py3 import InvokeResponse
-from ._models_py3 import MediaCard
-from ._models_py3 import MediaEventValue
-from ._models_py3 import MediaUrl
-from ._models_py3 import Mention
-from ._models_py3 import MessageReaction
-from ._models_py3 import OAuthCard
-from ._models_py3 import PagedMembersResult
-from ._models_py3 import Place
-from ._models_py3 import ReceiptCard
-from ._models_py3 import ReceiptItem
-from ._models_py3 import ResourceResponse
-from ._models_py3 import SemanticAction
-from ._models_py3 import SigninCard
-from ._models_py3 import SuggestedActions
-from ._models_py3 import TextHighlight
-from ._models_py3 import Thing
-from ._models_py3 import ThumbnailCard
-from ._models_py3 import ThumbnailUrl
-from ._models_py3 import TokenExchangeInvokeRequest
-from ._models_py3 import TokenExchangeInvokeResponse
-from ._models_py3 import TokenExchangeState
-from ._models_py3 import TokenRequest
-from ._models_py3 import TokenResponse
-from ._models_py3 import Transcript
-from ._models_py3 import VideoCard
-from ._connector_client_enums import (
-    ActionTypes,
-    ActivityImportance,
-    ActivityTypes,
-    AttachmentLayoutTypes,
-    ContactRelationUpdateActionTypes,
-    DeliveryModes,
-    EndOfConversationCodes,
-    InputHints,
-    InstallationUpdateActionTypes,
-    MessageReactionTypes,
-    RoleTypes,
-    TextFormatTypes,
-)
-
-from ._sign_in_enums import SignInConstants
-from .callerid_constants import CallerIdConstants
-from .speech_constants import SpeechConstants
+# The modules of the attributes of the package, imported when the attributes are first read,
+# since importing the models takes most of the time of importing the package.
+_ATTRIBUTE_MODULES = {
+    "Activity": "._models_py3",
+    "ActivityEventNames": "._models_py3",
+    "AdaptiveCardInvokeAction": "._models_py3",
+    "AdaptiveCardInvokeResponse": "._models_py3",
+    "AdaptiveCardInvokeValue": "._models_py3",
+    "AnimationCard": "._models_py3",
+    "Attachment": "._models_py3",
+    "AttachmentData": "._models_py3",
+    "AttachmentInfo": "._models_py3",
+    "AttachmentView": "._models_py3",
+    "AudioCard": "._models_py3",
+    "BasicCard": "._models_py3",
+    "CardAction": "._models_py3",
+    "CardImage": "._models_py3",
+    "ChannelAccount": "._models_py3",
+    "ConversationAccount": "._models_py3",
+    "ConversationMembers": "._models_py3",
+    "ConversationParameters": "._models_py3",
+    "ConversationReference": "._models_py3",
+    "ConversationResourceResponse": "._models_py3",
+    "ConversationsResult": "._models_py3",
+    "ExpectedReplies": "._models_py3",
+    "Entity": "._models_py3",
+    "Error": "._models_py3",
+    "ErrorResponse": "._models_py3",
+    "ErrorResponseException": "._models_py3",
+    "Fact": "._models_py3",
+    "GeoCoordinates": "._models_py3",
+    "HeroCard": "._models_py3",
+    "InnerHttpError": "._models_py3",
+    "InvokeResponse": "._models_py3",
+    "MediaCard": "._models_py3",
+    "MediaEventValue": "._models_py3",
+    "MediaUrl": "._models_py3",
+    "Mention": "._models_py3",
+    "MessageReaction": "._models_py3",
+    "OAuthCard": "._models_py3",
+    "PagedMembersResult": "._models_py3",
+    "Place": "._models_py3",
+    "ReceiptCard": "._models_py3",
+    "ReceiptItem": "._models_py3",
+    "ResourceResponse": "._models_py3",
+    "SemanticAction": "._models_py3",
+    "SigninCard": "._models_py3",
+    "SuggestedActions": "._models_py3",
+    "TextHighlight": "._models_py3",
+    "Thing": "._models_py3",
+    "ThumbnailCard": "._models_py3",
+    "ThumbnailUrl": "._models_py3",
+    "TokenExchangeInvokeRequest": "._models_py3",
+    "TokenExchangeInvokeResponse": "._models_py3",
+    "TokenExchangeState": "._models_py3",
+    "TokenRequest": "._models_py3",
+    "TokenResponse": "._models_py3",
+    "Transcript": "._models_py3",
+    "VideoCard": "._models_py3",
+    "ActionTypes": "._connector_client_enums",
+    "ActivityImportance": "._connector_client_enums",
+    "ActivityTypes": "._connector_client_enums",
+    "AttachmentLayoutTypes": "._connector_client_enums",
+    "ContactRelationUpdateActionTypes": "._connector_client_enums",
+    "DeliveryModes": "._connector_client_enums",
+    "EndOfConversationCodes": "._connector_client_enums",
+    "InputHints": "._connector_client_enums",
+    "InstallationUpdateActionTypes": "._connector_client_enums",
+    "MessageReactionTypes": "._connector_client_enums",
+    "RoleTypes": "._connector_client_enums",
+    "TextFormatTypes": "._connector_client_enums",
+    "SignInConstants": "._sign_in_enums",
+    "CallerIdConstants": ".callerid_constants",
+    "CompiledSerializer": "._compiled_serializer",
+    "LazyActivity": "._lazy_activity",
+    "SpeechConstants": ".speech_constants",
+}
 
+# The attributes are defined by __getattr__.
+# pylint: disable=undefined-all-variable
 __all__ = [
     "Activity",
     "ActivityEventNames",
@@ -109,6 +116,7 @@ __all__ = [
     "HeroCard",
     "InnerHttpError",
     "InvokeResponse",
+    "LazyActivity",
     "MediaCard",
     "MediaEventValue",
     "MediaUrl",
@@ -148,5 +156,20 @@ __all__ = [
     "ContactRelationUpdateActionTypes",
     "InstallationUpdateActionTypes",
     "CallerIdConstants",
+    "CompiledSerializer",
     "SpeechConstants",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _ATTRIBUTE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # Later reads find the attribute without calling this function.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(globals().keys() | _ATTRIBUTE_MODULES.keys())
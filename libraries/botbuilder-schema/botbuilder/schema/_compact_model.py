@@ -0,0 +1,114 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import logging
+from inspect import getattr_static
+
+from ._compiled_serializer import CompiledModel
+
+_LOGGER = logging.getLogger(__name__)
+
+_MISSING = object()
+
+_object_setattr = object.__setattr__
+_object_delattr = object.__delattr__
+
+
+class _AdditionalProperties:
+    """
+    Creates the additional properties dict of a model when it's first read.
+    """
+
+    def __get__(self, instance: "CompactModel", owner: type = None):
+        if instance is None:
+            return self
+        additional_properties = {}
+        # Stored in the instance, which hides this descriptor from then on.
+        _object_setattr(instance, "additional_properties", additional_properties)
+        return additional_properties
+
+
+class CompactModel(CompiledModel):
+    """
+    A model that keeps in its instance dict only its attributes that aren't None, for the models
+    kept in memory in large numbers, like conversation references and activities.
+
+    .. remarks::
+        The attributes that are None are read from class attributes instead, and the empty dict
+        of additional properties is created when it's first read. An activity usually sets a few
+        of its 40 attributes, and so takes several times less memory than an msrest model, which
+        stores every attribute. This also keeps the instance dicts small enough for CPython to
+        share their keys between instances.
+
+        Serialization, equality and copies behave like those of msrest models, except that
+        `vars()` lists only the attributes that aren't None.
+    """
+
+    additional_properties = _AdditionalProperties()
+
+    # The attributes that aren't stored when they're None.
+    _compact_attributes = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Subclasses may leave out of their attribute map some attributes of their bases.
+        compact_attributes = {
+            attr
+            for base in cls.__bases__
+            for attr in getattr(base, "_compact_attributes", ())
+            if getattr_static(cls, attr, None) is None
+        }
+        for attr in cls._attribute_map:
+            if attr == "additional_properties":
+                continue
+            class_value = getattr_static(cls, attr, _MISSING)
+            if class_value is _MISSING:
+                setattr(cls, attr, None)
+                class_value = None
+            # Attributes with descriptors, like lazy attributes, store their own values.
+            if class_value is None:
+                compact_attributes.add(attr)
+        cls._compact_attributes = frozenset(compact_attributes)
+
+    def __init__(self, **kwargs):  # pylint: disable=super-init-not-called
+        # Like the msrest Model, without creating the dict of additional properties.
+        for key, value in kwargs.items():
+            if key not in self._attribute_map:
+                _LOGGER.warning(
+                    "%s is not a known attribute of class %s and will be ignored",
+                    key,
+                    self.__class__,
+                )
+            elif key in self._validation and self._validation[key].get(
+                "readonly", False
+            ):
+                _LOGGER.warning(
+                    "Readonly attribute %s will be ignored in class %s",
+                    key,
+                    self.__class__,
+                )
+            else:
+                setattr(self, key, value)
+
+    def __setattr__(self, name: str, value):
+        # Called for every attribute the models create, so kept short.
+        if value is None and name in self._compact_attributes:
+            if getattr(self, name) is not None:
+                _object_delattr(self, name)
+            return
+        _object_setattr(self, name, value)
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return _get_state(self) == _get_state(other)
+        return False
+
+
+def _get_state(model: CompactModel) -> dict:
+    # The attributes stored, other than those that are None or empty additional properties.
+    return {
+        attr: value
+        for attr, value in vars(model).items()
+        if value is not None and not (attr == "additional_properties" and value == {})
+    }
@@ -0,0 +1,554 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+# pylint: disable=protected-access,unidiomatic-typecheck
+
+import re
+import sys
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Type, Union
+
+from msrest.exceptions import SerializationError
+from msrest.serialization import Deserializer, Model, Serializer
+
+# Like msrest, keys are flattened on dots that aren't escaped.
+_FLATTEN = re.compile(r"(?<!\\)\.")
+
+# The instance attribute holding the values of lazy attributes not deserialized yet.
+_RAW_VALUES = "_raw_values"
+
+
+class _Fallback(Exception):
+    """
+    Raised by a compiled function for a value it doesn't handle, to have msrest handle it.
+    """
+
+
+def _fallback(value):
+    raise _Fallback()
+
+
+class CompiledSerializer:
+    """
+    Serializes and deserializes msrest models with functions compiled from their `_attribute_map`,
+    instead of interpreting the map for every value like the msrest `Serializer` and
+    `Deserializer` do.
+
+    .. remarks::
+        The results, and errors, are those of msrest for the same `dependencies`. A model class is
+        compiled the first time it is used. The values of JSON payloads, like strings, numbers,
+        dates, lists, dicts and models, are handled by the compiled functions, and any other value,
+        like a number given for a string attribute, is handled by msrest. Models msrest handles
+        differently, with XML, polymorphic or flattened attributes, are left to msrest entirely.
+    """
+
+    def __init__(self, dependencies: Dict[str, type]):
+        """
+        :param dependencies: The model and enum classes by name, like the classes given to the
+            msrest `Serializer` and `Deserializer`.
+        """
+        self.dependencies = dict(dependencies)
+
+        self._serializer = Serializer(self.dependencies)
+        self._deserializer = Deserializer(self.dependencies)
+        self._encoders: Dict[type, Callable[[Model], dict]] = {}
+        self._decoders: Dict[type, Callable[[dict], Model]] = {}
+        self._value_decoders: Dict[str, Callable[[Any], Any]] = {}
+
+    def serialize(self, model: Model) -> Any:
+        """
+        Serializes a model to a JSON compatible dict, like the `_serialize` method of an msrest
+        `Serializer`. Read-only attributes aren't serialized.
+
+        :param model: The model.
+        :return: The serialized model.
+        """
+        encoder = self._get_encoder(type(model))
+        if encoder is not _fallback:
+            try:
+                return encoder(model)
+            except Exception:  # pylint: disable=broad-except
+                # Serialize again with msrest, to raise its error.
+                pass
+        return self._serializer._serialize(model)
+
+    def deserialize(self, target: Union[str, Type[Model]], data: Any) -> Any:
+        """
+        Deserializes a model from JSON compatible data, like calling an msrest `Deserializer`.
+
+        :param target: The model class or its name.
+        :param data: The data, usually a dict.
+        :return: The model.
+        """
+        model_class = (
+            self.dependencies.get(target) if isinstance(target, str) else target
+        )
+        if type(data) is dict and model_class is not None:
+            decoder = self._get_decoder(model_class)
+            if decoder is not _fallback:
+                try:
+                    return decoder(data)
+                except Exception:  # pylint: disable=broad-except
+                    # Deserialize again with msrest, to raise its error.
+                    pass
+        return self._deserializer(target, data)
+
+    def deserialize_data(self, data: Any, data_type: str) -> Any:
+        """
+        Deserializes a value of an attribute type, like the `deserialize_data` method of an msrest
+        `Deserializer`.
+
+        :param data: The value.
+        :param data_type: The type of the attribute in the `_attribute_map` of its model.
+        :return: The deserialized value.
+        """
+        if data is not None:
+            decoder = self._value_decoders.get(data_type)
+            if decoder is None:
+                decoder = self._get_value_decoder(data_type)
+                self._value_decoders[data_type] = decoder
+            try:
+                return decoder(data)
+            except Exception:  # pylint: disable=broad-except
+                # Let msrest handle the value, and raise its error.
+                pass
+        return self._deserializer.deserialize_data(data, data_type)
+
+    def _get_encoder(self, model_class: type) -> Callable[[Model], dict]:
+        encoder = self._encoders.get(model_class)
+        if encoder is None:
+            encoder = _fallback
+            if self._is_compilable(model_class):
+                encoder = self._create_encoder(model_class)
+            self._encoders[model_class] = encoder
+        return encoder
+
+    def _get_decoder(self, model_class: type) -> Callable[[dict], Model]:
+        decoder = self._decoders.get(model_class)
+        if decoder is None:
+            decoder = _fallback
+            # Polymorphic models pick their class from the data.
+            if self._is_compilable(model_class) and not model_class.__dict__.get(
+                "_subtype_map"
+            ):
+                decoder = self._create_decoder(model_class)
+            self._decoders[model_class] = decoder
+        return decoder
+
+    @staticmethod
+    def _is_compilable(model_class: type) -> bool:
+        return (
+            isinstance(model_class, type)
+            and issubclass(model_class, Model)
+            and not issubclass(model_class, Enum)
+            and not model_class.is_xml_model()
+            and all(
+                len(_FLATTEN.split(attr_desc["key"])) == 1
+                for attr_desc in model_class._attribute_map.values()
+            )
+        )
+
+    def _create_encoder(self, model_class: type) -> Callable[[Model], dict]:
+        serializer = self._serializer
+        # (attribute, key, value encoder, attribute map entry), in the order msrest serializes
+        # them. The key of additional properties is None.
+        fields = []
+        for attr, attr_desc in model_class._attribute_map.items():
+            if model_class._validation.get(attr, {}).get("readonly", False):
+                continue
+            if attr == "additional_properties" and attr_desc["key"] == "":
+                fields.append((attr, None, None, attr_desc))
+                continue
+            fields.append(
+                (
+                    attr,
+                    attr_desc["key"].replace("\\.", "."),
+                    self._get_value_encoder(attr_desc["type"]),
+                    attr_desc,
+                )
+            )
+
+        # Reading __dict__ would create it for models that don't have one yet.
+        has_lazy_attributes = any(
+            isinstance(getattr(model_class, attr, None), LazyAttribute)
+            for attr in model_class._attribute_map
+        )
+
+        def encode(model: Model) -> dict:
+            serialized = {}
+            raw_values = has_lazy_attributes and model.__dict__.get(_RAW_VALUES)
+            for attr, key, encode_value, attr_desc in fields:
+                if raw_values and attr in raw_values:
+                    # Lazy attributes that weren't read are serialized as they were received.
+                    if key not in serialized:
+                        serialized[key] = raw_values[attr]
+                    continue
+                value = getattr(model, attr)
+                if value is None:
+                    continue
+                if key is None:
+                    serialized.update(value)
+                    continue
+
+                try:
+                    value = encode_value(value)
+                except _Fallback:
+                    try:
+                        value = serializer.serialize_data(
+                            value,
+                            attr_desc["type"],
+                            is_xml=False,
+                            serialization_ctxt=attr_desc,
+                        )
+                    except ValueError as error:
+                        if isinstance(error, SerializationError):
+                            raise
+                        continue
+                # Like msrest, attributes don't replace additional properties of the same key.
+                if key not in serialized:
+                    serialized[key] = value
+            return serialized
+
+        return encode
+
+    def _get_value_encoder(self, data_type: str) -> Callable[[Any], Any]:
+        # pylint: disable=too-many-return-statements
+        if data_type == "str":
+            return _encode_str
+        if data_type in _BASIC_TYPES:
+            expected_type = _BASIC_TYPES[data_type]
+
+            def encode_basic(value):
+                if type(value) is not expected_type:
+                    raise _Fallback()
+                return value
+
+            return encode_basic
+        if data_type == "iso-8601":
+            return Serializer.serialize_iso
+        if data_type == "object":
+            return self._encode_object
+        if data_type in self._serializer.serialize_type:
+            return _fallback
+
+        dependency = self.dependencies.get(data_type)
+        if isinstance(dependency, type) and issubclass(dependency, Enum):
+            return lambda value: Serializer.serialize_enum(value, enum_obj=dependency)
+
+        if len(data_type) > 2 and data_type[0] + data_type[-1] in ("[]", "{}"):
+            encode_item = self._get_value_encoder(data_type[1:-1])
+            if data_type[0] == "[":
+
+                def encode_list(value):
+                    if type(value) is not list:
+                        raise _Fallback()
+                    return [
+                        None if item is None else encode_item(item) for item in value
+                    ]
+
+                return encode_list
+
+            def encode_dict(value):
+                if type(value) is not dict:
+                    raise _Fallback()
+                serialized = {}
+                for key, item in value.items():
+                    if type(key) is not str:
+                        raise _Fallback()
+                    serialized[key] = None if item is None else encode_item(item)
+                return serialized
+
+            return encode_dict
+
+        return self._encode_model
+
+    def _encode_model(self, value):
+        if not isinstance(value, Model) or isinstance(value, Enum):
+            raise _Fallback()
+        encoder = self._get_encoder(type(value))
+        if encoder is _fallback:
+            raise _Fallback()
+        return encoder(value)
+
+    def _encode_object(self, value):
+        value_type = type(value)
+        if value_type in (str, int, bool, float) or value is None:
+            return value
+        if value_type is dict:
+            serialized = {}
+            for key, item in value.items():
+                if type(key) is not str:
+                    raise _Fallback()
+                serialized[key] = self._encode_object(item)
+            return serialized
+        if value_type is list:
+            return [self._encode_object(item) for item in value]
+        if isinstance(value, Model) and not isinstance(value, Enum):
+            # msrest serializes the models of generic objects on their own.
+            return self.serialize(value)
+        raise _Fallback()
+
+    def _create_decoder(self, model_class: type) -> Callable[[dict], Model]:
+        deserializer = self._deserializer
+        attribute_map = model_class._attribute_map
+        validation = model_class._validation
+        subtypes = getattr(model_class, "_subtype_map", {})
+        readonly = [
+            attr for attr, config in validation.items() if config.get("readonly")
+        ]
+        excluded = readonly + [
+            attr for attr, config in validation.items() if config.get("constant")
+        ]
+
+        # Key -> (attribute, value decoder, type, whether it's an argument of __init__, whether it's
+        # lazy)
+        attributes = [
+            (attr, attr_desc)
+            for attr, attr_desc in attribute_map.items()
+            if not (attr == "additional_properties" and attr_desc["key"] == "")
+        ]
+        fields = {
+            attr_desc["key"].replace("\\.", "."): (
+                attr,
+                self._get_value_decoder(attr_desc["type"]),
+                attr_desc["type"],
+                attr not in subtypes and attr not in excluded,
+                isinstance(getattr(model_class, attr, None), LazyAttribute),
+            )
+            for attr, attr_desc in attributes
+        }
+        if len(fields) < len(attributes):
+            # Several attributes have the same key.
+            return _fallback
+        # Like msrest, every argument is passed, None when it's missing.
+        arguments = {field[0]: None for field in fields.values() if field[3]}
+
+        # Like msrest, the keys that aren't attributes are additional properties, unless the model
+        # has an attribute of that name.
+        collect_additional_properties = attribute_map.get(
+            "additional_properties", {}
+        ).get("key") in (None, "")
+
+        def decode(data: dict) -> Model:
+            kwargs = arguments.copy()
+            other_values = {}
+            raw_values = {}
+            has_additional_properties = False
+            for key, value in data.items():
+                field = fields.get(key)
+                if field is None:
+                    has_additional_properties = True
+                    continue
+                if value is None:
+                    continue
+
+                attr, decode_value, data_type, is_argument, is_lazy = field
+                if is_lazy:
+                    raw_values[attr] = value
+                    continue
+                try:
+                    value = decode_value(value)
+                except _Fallback:
+                    value = deserializer.deserialize_data(value, data_type)
+                if is_argument:
+                    kwargs[attr] = value
+                else:
+                    other_values[attr] = value
+
+            model = model_class(**kwargs)
+            for attr in readonly:
+                setattr(model, attr, other_values.get(attr))
+            if raw_values:
+                model.__dict__[_RAW_VALUES] = raw_values
+            if collect_additional_properties and has_additional_properties:
+                additional_keys = data.keys() - fields.keys()
+                if additional_keys:
+                    model.additional_properties = {
+                        key: data[key] for key in additional_keys
+                    }
+            return model
+
+        return decode
+
+    def _get_value_decoder(self, data_type: str) -> Callable[[Any], Any]:
+        # pylint: disable=too-many-return-statements
+        if data_type in _BASIC_TYPES or data_type == "str":
+            expected_type = _BASIC_TYPES.get(data_type, str)
+
+            def decode_basic(value):
+                if type(value) is not expected_type:
+                    raise _Fallback()
+                return value
+
+            return decode_basic
+        if data_type == "iso-8601":
+            return _decode_iso
+        if data_type == "object":
+            return _decode_object
+        if data_type in self._deserializer.deserialize_type:
+            return _fallback
+
+        if len(data_type) > 2 and data_type[0] + data_type[-1] in ("[]", "{}"):
+            decode_item = self._get_value_decoder(data_type[1:-1])
+            if data_type[0] == "[":
+
+                def decode_list(value):
+                    if type(value) is not list:
+                        raise _Fallback()
+                    return [
+                        None if item is None else decode_item(item) for item in value
+                    ]
+
+                return decode_list
+
+            def decode_dict(value):
+                if type(value) is not dict:
+                    raise _Fallback()
+                return {
+                    key: None if item is None else decode_item(item)
+                    for key, item in value.items()
+                }
+
+            return decode_dict
+
+        dependency = self.dependencies.get(data_type)
+        if not isinstance(dependency, type):
+            return _fallback
+        if issubclass(dependency, Enum):
+            return lambda value: Deserializer.deserialize_enum(value, dependency)
+
+        def decode_model(value):
+            if type(value) is not dict:
+                raise _Fallback()
+            decoder = self._get_decoder(dependency)
+            if decoder is _fallback:
+                raise _Fallback()
+            return decoder(value)
+
+        return decode_model
+
+
+# The basic types, other than str, msrest converts values to.
+_BASIC_TYPES = {"bool": bool, "int": int, "float": float}
+
+
+def _encode_str(value):
+    if type(value) is str:
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    raise _Fallback()
+
+
+def _decode_iso(value):
+    if isinstance(value, datetime):
+        return value
+    return Deserializer.deserialize_iso(value)
+
+
+def _decode_object(value):
+    value_type = type(value)
+    if value_type in (str, int, bool, float) or value is None:
+        return value
+    if value_type is dict:
+        return {key: _decode_object(item) for key, item in value.items()}
+    if value_type is list:
+        return [_decode_object(item) for item in value]
+    raise _Fallback()
+
+
+class LazyAttribute:
+    """
+    An attribute of a :class:`CompiledModel` that its :class:`CompiledSerializer` doesn't
+    deserialize until it's first read.
+
+    .. remarks::
+        Until then, the value received is kept as is, and serializing the model outputs it
+        unchanged, without deserializing it.
+    """
+
+    def __init__(self):
+        self.name = None
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, instance: "CompiledModel", owner: type = None):
+        if instance is None:
+            return self
+
+        values = instance.__dict__
+        raw_values = values.get(_RAW_VALUES)
+        if raw_values and self.name in raw_values:
+            model_class = type(instance)
+            values[self.name] = model_class._get_compiled_serializer().deserialize_data(
+                raw_values[self.name], model_class._attribute_map[self.name]["type"]
+            )
+            self._remove_raw_value(instance)
+        return values.get(self.name)
+
+    def __set__(self, instance: "CompiledModel", value):
+        self._remove_raw_value(instance)
+        if value is None:
+            instance.__dict__.pop(self.name, None)
+        else:
+            instance.__dict__[self.name] = value
+
+    def _remove_raw_value(self, instance: "CompiledModel"):
+        # Copies of the model share the raw values, so they're replaced rather than changed.
+        raw_values = instance.__dict__.get(_RAW_VALUES)
+        if raw_values and self.name in raw_values:
+            raw_values = {
+                attr: value for attr, value in raw_values.items() if attr != self.name
+            }
+            if raw_values:
+                instance.__dict__[_RAW_VALUES] = raw_values
+            else:
+                del instance.__dict__[_RAW_VALUES]
+
+
+class CompiledModel(Model):
+    """
+    An msrest model serialized and deserialized by a :class:`CompiledSerializer` for the models of
+    its package, with the same results as msrest.
+    """
+
+    # By class, and by package for the models of packages.
+    _compiled_serializers: Dict[Union[type, str], CompiledSerializer] = {}
+
+    def serialize(self, keep_readonly=False, **kwargs):
+        if keep_readonly or kwargs:
+            return super().serialize(keep_readonly=keep_readonly, **kwargs)
+        return self._get_compiled_serializer().serialize(self)
+
+    @classmethod
+    def deserialize(cls, data, content_type=None):
+        if content_type is not None:
+            return super().deserialize(data, content_type=content_type)
+        return cls._get_compiled_serializer().deserialize(cls.__name__, data)
+
+    @classmethod
+    def _infer_class_models(cls):
+        # msrest reads the models from the namespace of the package, which imports them on first
+        # read, so every model the package exports is read first.
+        package = sys.modules.get(cls.__module__.rsplit(".", 1)[0])
+        for name in getattr(package, "__all__", ()):
+            getattr(package, name)
+        return super()._infer_class_models()
+
+    @classmethod
+    def _get_compiled_serializer(cls) -> CompiledSerializer:
+        serializer = CompiledModel._compiled_serializers.get(cls)
+        if serializer is None:
+            # The models of a package share its serializer, created with every model it exports.
+            # Other models, like those of tests, have their own.
+            package_name = cls.__module__.rsplit(".", 1)[0]
+            package = sys.modules.get(package_name)
+            key = package_name if getattr(package, cls.__name__, None) is cls else cls
+            serializer = CompiledModel._compiled_serializers.get(key)
+            if serializer is None:
+                serializer = CompiledSerializer(cls._infer_class_models())
+                CompiledModel._compiled_serializers[key] = serializer
+            CompiledModel._compiled_serializers[cls] = serializer
+        return serializer
@@ -0,0 +1,34 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from ._compiled_serializer import LazyAttribute
+from ._models_py3 import Activity
+
+
+class LazyActivity(Activity):
+    """
+    An :class:`Activity` whose attachments, entities, channel data and value are deserialized
+    only when they're first read.
+
+    .. remarks::
+        Most turns never read these attributes, which make up most of large payloads, like the
+        channel data of Teams or adaptive cards. Until read, they're kept as received, and
+        serializing the activity outputs them as they are, with the properties their models don't
+        declare, like the text of mention entities.
+    """
+
+    attachments = LazyAttribute()
+    entities = LazyAttribute()
+    channel_data = LazyAttribute()
+    value = LazyAttribute()
+
+    def __eq__(self, other):
+        self._read_lazy_attributes()
+        if isinstance(other, LazyActivity):
+            other._read_lazy_attributes()  # pylint: disable=protected-access
+        return super().__eq__(other)
+
+    def _read_lazy_attributes(self):
+        for name, attribute in vars(LazyActivity).items():
+            if isinstance(attribute, LazyAttribute):
+                getattr(self, name)
@@ -6,7 +6,8 @@ from typing import List
 from botbuilder.schema._connector_client_enums import ActivityTypes
 from datetime import datetime, timezone
 from enum import Enum
-from msrest.serialization import Model
+from botbuilder.schema._compact_model import CompactModel
+from botbuilder.schema._compiled_serializer import CompiledModel as Model
 from msrest.exceptions import HttpOperationError
 
 
@@ -15,7 +16,7 @@ class ActivityEventNames(str, Enum):
     create_conversation = "CreateConversation"
 
 
-class ConversationReference(Model):
+class ConversationReference(CompactModel):
     """An object relating to a particular point in a conversation.
 
     :param activity_id: (Optional) ID of the activity to refer to
@@ -97,7 +98,7 @@ class Mention(Model):
         self.type = type
 
 
-class ResourceResponse(Model):
+class ResourceResponse(CompactModel):
     """A response containing a resource ID.
 
     :param id: Id of the resource
@@ -111,7 +112,7 @@ class ResourceResponse(Model):
         self.id = id
 
 
-class Activity(Model):
+class Activity(CompactModel):
     """An Activity is the basic communication type for the Bot Framework 3.0
     protocol.
 
@@ -1274,7 +1275,7 @@ class CardImage(Model):
         self.tap = tap
 
 
-class ChannelAccount(Model):
+class ChannelAccount(CompactModel):
     """Channel account information needed to route a message.
 
     :param id: Channel id for the user or bot on this channel (Example:
@@ -1316,7 +1317,7 @@ class ChannelAccount(Model):
         self.properties = properties
 
 
-class ConversationAccount(Model):
+class ConversationAccount(CompactModel):
     """Conversation account represents the identity of the conversation within a channel.
 
     :param is_group: Indicates whether the conversation contains more than two
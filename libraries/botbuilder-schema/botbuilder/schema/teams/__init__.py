@@ -1,95 +1,102 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-from ._models_py3 import AppBasedLinkQuery
-from ._models_py3 import ChannelInfo
-from ._models_py3 import ConversationList
-from ._models_py3 import FileConsentCard
-from ._models_py3 import FileConsentCardResponse
-from ._models_py3 import FileDownloadInfo
-from ._models_py3 import FileInfoCard
-from ._models_py3 import FileUploadInfo
-from ._models_py3 import MeetingDetails
-from ._models_py3 import MeetingInfo
-from ._models_py3 import MeetingStartEventDetails
-from ._models_py3 import MeetingEndEventDetails
-from ._models_py3 import MessageActionsPayload
-from ._models_py3 import MessageActionsPayloadApp
-from ._models_py3 import MessageActionsPayloadAttachment
-from ._models_py3 import MessageActionsPayloadBody
-from ._models_py3 import MessageActionsPayloadConversation
-from ._models_py3 import MessageActionsPayloadFrom
-from ._models_py3 import MessageActionsPayloadMention
-from ._models_py3 import MessageActionsPayloadReaction
-from ._models_py3 import MessageActionsPayloadUser
-from ._models_py3 import MessagingExtensionAction
-from ._models_py3 import MessagingExtensionActionResponse
-from ._models_py3 import MessagingExtensionAttachment
-from ._models_py3 import MessagingExtensionParameter
-from ._models_py3 import MessagingExtensionQuery
-from ._models_py3 import MessagingExtensionQueryOptions
-from ._models_py3 import MessagingExtensionResponse
-from ._models_py3 import MessagingExtensionResult
-from ._models_py3 import MessagingExtensionSuggestedAction
-from ._models_py3 import NotificationInfo
-from ._models_py3 import O365ConnectorCard
-from ._models_py3 import O365ConnectorCardActionBase
-from ._models_py3 import O365ConnectorCardActionCard
-from ._models_py3 import O365ConnectorCardActionQuery
-from ._models_py3 import O365ConnectorCardDateInput
-from ._models_py3 import O365ConnectorCardFact
-from ._models_py3 import O365ConnectorCardHttpPOST
-from ._models_py3 import O365ConnectorCardImage
-from ._models_py3 import O365ConnectorCardInputBase
-from ._models_py3 import O365ConnectorCardMultichoiceInput
-from ._models_py3 import O365ConnectorCardMultichoiceInputChoice
-from ._models_py3 import O365ConnectorCardOpenUri
-from ._models_py3 import O365ConnectorCardOpenUriTarget
-from ._models_py3 import O365ConnectorCardSection
-from ._models_py3 import O365ConnectorCardTextInput
-from ._models_py3 import O365ConnectorCardViewAction
-from ._models_py3 import SigninStateVerificationQuery
-from ._models_py3 import TaskModuleContinueResponse
-from ._models_py3 import TaskModuleMessageResponse
-from ._models_py3 import TaskModuleRequest
-from ._models_py3 import TaskModuleRequestContext
-from ._models_py3 import TaskModuleResponse
-from ._models_py3 import TaskModuleResponseBase
-from ._models_py3 import TaskModuleTaskInfo
-from ._models_py3 import TeamDetails
-from ._models_py3 import TeamInfo
-from ._models_py3 import TeamsChannelAccount
-from ._models_py3 import TeamsChannelDataSettings
-from ._models_py3 import TeamsChannelData
-from ._models_py3 import TeamsPagedMembersResult
-from ._models_py3 import TenantInfo
-from ._models_py3 import TeamsMeetingInfo
-from ._models_py3 import TeamsMeetingParticipant
-from ._models_py3 import MeetingParticipantInfo
-from ._models_py3 import CacheInfo
-from ._models_py3 import TabContext
-from ._models_py3 import TabEntityContext
-from ._models_py3 import TabRequest
-from ._models_py3 import TabResponseCard
-from ._models_py3 import TabResponseCards
-from ._models_py3 import TabResponsePayload
-from ._models_py3 import TabResponse
-from ._models_py3 import TabSubmit
-from ._models_py3 import TabSubmitData
-from ._models_py3 import TabSuggestedActions
-from ._models_py3 import TaskModuleCardResponse
-from ._models_py3 import UserMeetingDetails
-from ._models_py3 import TeamsMeetingMember
-from ._models_py3 import MeetingParticipantsEventDetails
-from ._models_py3 import ReadReceiptInfo
-from ._models_py3 import BotConfigAuth
-from ._models_py3 import ConfigAuthResponse
-from ._models_py3 import ConfigResponse
-from ._models_py3 import ConfigTaskResponse
-from ._models_py3 import MeetingNotificationBase
-from ._models_py3 import MeetingNotificationResponse
-from ._models_py3 import OnBehalfOf
+from importlib import import_module
 
+# The modules of the attributes of the package, imported when the attributes are first read.
+_ATTRIBUTE_MODULES = {
+    "AppBasedLinkQuery": "._models_py3",
+    "ChannelInfo": "._models_py3",
+    "ConversationList": "._models_py3",
+    "FileConsentCard": "._models_py3",
+    "FileConsentCardResponse": "._models_py3",
+    "FileDownloadInfo": "._models_py3",
+    "FileInfoCard": "._models_py3",
+    "FileUploadInfo": "._models_py3",
+    "MeetingDetails": "._models_py3",
+    "MeetingInfo": "._models_py3",
+    "MeetingStartEventDetails": "._models_py3",
+    "MeetingEndEventDetails": "._models_py3",
+    "MessageActionsPayload": "._models_py3",
+    "MessageActionsPayloadApp": "._models_py3",
+    "MessageActionsPayloadAttachment": "._models_py3",
+    "MessageActionsPayloadBody": "._models_py3",
+    "MessageActionsPayloadConversation": "._models_py3",
+    "MessageActionsPayloadFrom": "._models_py3",
+    "MessageActionsPayloadMention": "._models_py3",
+    "MessageActionsPayloadReaction": "._models_py3",
+    "MessageActionsPayloadUser": "._models_py3",
+    "MessagingExtensionAction": "._models_py3",
+    "MessagingExtensionActionResponse": "._models_py3",
+    "MessagingExtensionAttachment": "._models_py3",
+    "MessagingExtensionParameter": "._models_py3",
+    "MessagingExtensionQuery": "._models_py3",
+    "MessagingExtensionQueryOptions": "._models_py3",
+    "MessagingExtensionResponse": "._models_py3",
+    "MessagingExtensionResult": "._models_py3",
+    "MessagingExtensionSuggestedAction": "._models_py3",
+    "NotificationInfo": "._models_py3",
+    "O365ConnectorCard": "._models_py3",
+    "O365ConnectorCardActionBase": "._models_py3",
+    "O365ConnectorCardActionCard": "._models_py3",
+    "O365ConnectorCardActionQuery": "._models_py3",
+    "O365ConnectorCardDateInput": "._models_py3",
+    "O365ConnectorCardFact": "._models_py3",
+    "O365ConnectorCardHttpPOST": "._models_py3",
+    "O365ConnectorCardImage": "._models_py3",
+    "O365ConnectorCardInputBase": "._models_py3",
+    "O365ConnectorCardMultichoiceInput": "._models_py3",
+    "O365ConnectorCardMultichoiceInputChoice": "._models_py3",
+    "O365ConnectorCardOpenUri": "._models_py3",
+    "O365ConnectorCardOpenUriTarget": "._models_py3",
+    "O365ConnectorCardSection": "._models_py3",
+    "O365ConnectorCardTextInput": "._models_py3",
+    "O365ConnectorCardViewAction": "._models_py3",
+    "SigninStateVerificationQuery": "._models_py3",
+    "TaskModuleContinueResponse": "._models_py3",
+    "TaskModuleMessageResponse": "._models_py3",
+    "TaskModuleRequest": "._models_py3",
+    "TaskModuleRequestContext": "._models_py3",
+    "TaskModuleResponse": "._models_py3",
+    "TaskModuleResponseBase": "._models_py3",
+    "TaskModuleTaskInfo": "._models_py3",
+    "TeamDetails": "._models_py3",
+    "TeamInfo": "._models_py3",
+    "TeamsChannelAccount": "._models_py3",
+    "TeamsChannelDataSettings": "._models_py3",
+    "TeamsChannelData": "._models_py3",
+    "TeamsPagedMembersResult": "._models_py3",
+    "TenantInfo": "._models_py3",
+    "TeamsMeetingInfo": "._models_py3",
+    "TeamsMeetingParticipant": "._models_py3",
+    "MeetingParticipantInfo": "._models_py3",
+    "CacheInfo": "._models_py3",
+    "TabContext": "._models_py3",
+    "TabEntityContext": "._models_py3",
+    "TabRequest": "._models_py3",
+    "TabResponseCard": "._models_py3",
+    "TabResponseCards": "._models_py3",
+    "TabResponsePayload": "._models_py3",
+    "TabResponse": "._models_py3",
+    "TabSubmit": "._models_py3",
+    "TabSubmitData": "._models_py3",
+    "TabSuggestedActions": "._models_py3",
+    "TaskModuleCardResponse": "._models_py3",
+    "UserMeetingDetails": "._models_py3",
+    "TeamsMeetingMember": "._models_py3",
+    "MeetingParticipantsEventDetails": "._models_py3",
+    "ReadReceiptInfo": "._models_py3",
+    "BotConfigAuth": "._models_py3",
+    "ConfigAuthResponse": "._models_py3",
+    "ConfigResponse": "._models_py3",
+    "ConfigTaskResponse": "._models_py3",
+    "MeetingNotificationBase": "._models_py3",
+    "MeetingNotificationResponse": "._models_py3",
+    "OnBehalfOf": "._models_py3",
+}
+
+# The attributes are defined by __getattr__.
+# pylint: disable=undefined-all-variable
 __all__ = [
     "AppBasedLinkQuery",
     "ChannelInfo",
@@ -180,3 +187,17 @@ __all__ = [
     "MeetingNotificationResponse",
     "OnBehalfOf",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _ATTRIBUTE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # Later reads find the attribute without calling this function.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(globals().keys() | _ATTRIBUTE_MODULES.keys())
@@ -3,7 +3,7 @@
 
 from enum import Enum
 from typing import List
-from msrest.serialization import Model
+from botbuilder.schema._compiled_serializer import CompiledModel as Model
 from botbuilder.schema import (
     Attachment,
     ChannelAccount,
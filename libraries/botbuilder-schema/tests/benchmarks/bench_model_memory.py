@@ -0,0 +1,89 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares the memory that the compact models take against the msrest layout, which stores every
+attribute and an additional properties dict, on the models kept in large numbers.
+
+Run with: python tests/benchmarks/bench_model_memory.py
+"""
+
+import tracemalloc
+from copy import deepcopy
+
+from msrest.serialization import Model
+
+from botbuilder.schema import Activity, ResourceResponse
+from botbuilder.schema._compact_model import CompactModel
+
+from bench_serialization import PAYLOADS
+
+_MSREST_CLASSES = {}
+
+
+def to_msrest_layout(value):
+    """
+    Copies the compact models of a value into classes with the msrest layout.
+    """
+    if isinstance(value, list):
+        return [to_msrest_layout(item) for item in value]
+    if not isinstance(value, CompactModel):
+        return value
+
+    model_class = type(value)
+    msrest_class = _MSREST_CLASSES.get(model_class)
+    if msrest_class is None:
+        msrest_class = type(
+            model_class.__name__,
+            (Model,),
+            {
+                "_attribute_map": model_class._attribute_map,
+                "_validation": model_class._validation,
+            },
+        )
+        _MSREST_CLASSES[model_class] = msrest_class
+
+    model = msrest_class()
+    # Like the generated __init__ methods, set every attribute.
+    for attr in sorted(model_class._compact_attributes | set(vars(value))):
+        object.__setattr__(model, attr, to_msrest_layout(getattr(value, attr)))
+    return model
+
+
+def measure(create, number: int) -> float:
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    models = [create() for _ in range(number)]
+    size = sum(
+        stat.size_diff
+        for stat in tracemalloc.take_snapshot().compare_to(start, "filename")
+    )
+    tracemalloc.stop()
+    del models
+    return size / number
+
+
+def report(name: str, create, number: int = 2000):
+    old = measure(lambda: to_msrest_layout(create()), number)
+    new = measure(create, number)
+    print(
+        f"{name:37s} msrest: {old:7.0f} B  compact: {new:7.0f} B"
+        f"  reduction: {old / new:4.1f}x"
+    )
+
+
+def main():
+    for name, payload in PAYLOADS.items():
+        report(f"{name} activity", lambda p=payload: Activity.deserialize(deepcopy(p)))
+        report(
+            f"{name} conversation reference",
+            lambda p=payload: Activity.deserialize(
+                deepcopy(p)
+            ).get_conversation_reference(),
+        )
+
+    report("resource response", lambda: ResourceResponse(id=str(12345678)))
+
+
+if __name__ == "__main__":
+    main()
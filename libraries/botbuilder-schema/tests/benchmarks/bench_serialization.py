@@ -0,0 +1,260 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares the compiled model serialization against the generic msrest Serializer and Deserializer,
+on channel payloads.
+
+Run with: python tests/benchmarks/bench_serialization.py
+"""
+
+import timeit
+from copy import deepcopy
+
+from msrest.serialization import Deserializer, Model, Serializer
+
+import botbuilder.schema as schema
+import botbuilder.schema.teams as teams_schema
+from botbuilder.schema import Activity, CompiledSerializer, LazyActivity
+from botbuilder.schema.teams import TeamsChannelData
+
+DEPENDENCIES = {
+    name: cls
+    for module in (schema, teams_schema)
+    for name, cls in vars(module).items()
+    if isinstance(cls, type)
+}
+
+CONVERSATION = {
+    "isGroup": True,
+    "conversationType": "channel",
+    "tenantId": "72f988bf-86f1-41af-91ab-2d7cd011db47",
+    "id": "19:0f1e2d3c4b5a@thread.tacv2;messageid=1686595026473",
+}
+
+TEAMS_CHANNEL_DATA = {
+    "teamsChannelId": "19:0f1e2d3c4b5a@thread.tacv2",
+    "teamsTeamId": "19:9a8b7c6d5e4f@thread.tacv2",
+    "channel": {"id": "19:0f1e2d3c4b5a@thread.tacv2", "name": "General"},
+    "team": {
+        "id": "19:9a8b7c6d5e4f@thread.tacv2",
+        "name": "Contoso",
+        "aadGroupId": "02ce3874-dd86-41ba-bddc-013f34019978",
+    },
+    "tenant": {"id": "72f988bf-86f1-41af-91ab-2d7cd011db47"},
+    "settings": {"selectedChannel": {"id": "19:0f1e2d3c4b5a@thread.tacv2"}},
+}
+
+PAYLOADS = {
+    "teams message": {
+        "text": "<at>Contoso Bot</at> what's the status of order 1234?",
+        "textFormat": "plain",
+        "attachments": [
+            {
+                "contentType": "text/html",
+                "content": "<div><at>Contoso Bot</at> what's the status?</div>",
+            }
+        ],
+        "type": "message",
+        "timestamp": "2023-06-12T18:37:06.4735172Z",
+        "localTimestamp": "2023-06-12T20:37:06.4735172+02:00",
+        "id": "1686595026473",
+        "channelId": "msteams",
+        "serviceUrl": "https://smba.trafficmanager.net/emea/",
+        "from": {
+            "id": "29:1Abc2Def3Ghi4Jkl5Mno6Pqr7Stu8Vwx9Yz",
+            "name": "Megan Bowen",
+            "aadObjectId": "6f0e1c3a-8c4a-4b2e-9e6a-0d3f7e2a9b11",
+        },
+        "conversation": CONVERSATION,
+        "recipient": {"id": "28:c9e8c047-2a74-40a2-b28a-b162d5f5327c", "name": "Bot"},
+        "entities": [
+            {
+                "mentioned": {
+                    "id": "28:c9e8c047-2a74-40a2-b28a-b162d5f5327c",
+                    "name": "Contoso Bot",
+                },
+                "text": "<at>Contoso Bot</at>",
+                "type": "mention",
+            },
+            {
+                "locale": "en-US",
+                "country": "US",
+                "platform": "Web",
+                "timezone": "Europe/Paris",
+                "type": "clientInfo",
+            },
+        ],
+        "channelData": TEAMS_CHANNEL_DATA,
+        "locale": "en-US",
+        "localTimezone": "Europe/Paris",
+    },
+    "teams card submit": {
+        "type": "invoke",
+        "name": "adaptiveCard/action",
+        "id": "f:9a8b7c6d",
+        "timestamp": "2023-06-12T18:38:10.123Z",
+        "localTimestamp": "2023-06-12T20:38:10.123+02:00",
+        "channelId": "msteams",
+        "serviceUrl": "https://smba.trafficmanager.net/emea/",
+        "from": {"id": "29:1Abc2Def3Ghi", "aadObjectId": "6f0e1c3a"},
+        "conversation": CONVERSATION,
+        "recipient": {"id": "28:c9e8c047", "name": "Bot"},
+        "replyToId": "1686595026473",
+        "entities": [{"locale": "en-US", "country": "US", "type": "clientInfo"}],
+        "channelData": dict(TEAMS_CHANNEL_DATA, source={"name": "message"}),
+        "value": {
+            "action": {
+                "type": "Action.Execute",
+                "verb": "approve",
+                "data": {"orderId": 1234, "comment": "Looks good", "rush": True},
+            },
+            "trigger": "manual",
+        },
+        "locale": "en-US",
+    },
+    "teams adaptive card": {
+        "type": "message",
+        "id": "1686595099123",
+        "timestamp": "2023-06-12T18:38:19.123Z",
+        "channelId": "msteams",
+        "serviceUrl": "https://smba.trafficmanager.net/emea/",
+        "from": {"id": "29:1Abc2Def3Ghi", "aadObjectId": "6f0e1c3a"},
+        "conversation": CONVERSATION,
+        "recipient": {"id": "28:c9e8c047", "name": "Bot"},
+        "attachments": [
+            {
+                "contentType": "application/vnd.microsoft.card.adaptive",
+                "content": {
+                    "type": "AdaptiveCard",
+                    "version": "1.5",
+                    "body": [
+                        {
+                            "type": "ColumnSet",
+                            "columns": [
+                                {
+                                    "type": "Column",
+                                    "width": "auto",
+                                    "items": [
+                                        {
+                                            "type": "TextBlock",
+                                            "text": f"Order {order}",
+                                            "weight": "Bolder",
+                                        },
+                                        {
+                                            "type": "FactSet",
+                                            "facts": [
+                                                {"title": "Status", "value": "Open"},
+                                                {"title": "Total", "value": "$12.50"},
+                                            ],
+                                        },
+                                    ],
+                                }
+                            ],
+                        }
+                        for order in range(40)
+                    ],
+                    "actions": [
+                        {"type": "Action.Execute", "verb": "refresh", "data": {}}
+                    ],
+                },
+            }
+        ],
+        "channelData": TEAMS_CHANNEL_DATA,
+    },
+    "teams members added": {
+        "membersAdded": [
+            {"id": "29:1Abc2Def3Ghi", "aadObjectId": "6f0e1c3a"},
+            {"id": "28:c9e8c047"},
+        ],
+        "type": "conversationUpdate",
+        "timestamp": "2023-06-12T18:30:00.000Z",
+        "id": "f:1234",
+        "channelId": "msteams",
+        "serviceUrl": "https://smba.trafficmanager.net/emea/",
+        "from": {"id": "29:1Abc2Def3Ghi", "aadObjectId": "6f0e1c3a"},
+        "conversation": CONVERSATION,
+        "recipient": {"id": "28:c9e8c047", "name": "Bot"},
+        "channelData": dict(TEAMS_CHANNEL_DATA, eventType="teamMemberAdded"),
+    },
+    "webchat message": {
+        "type": "message",
+        "id": "Kx1hp3ZV9JV6LnA0qpPqeN-eu|0000001",
+        "timestamp": "2023-06-12T18:37:06.123Z",
+        "serviceUrl": "https://webchat.botframework.com/",
+        "channelId": "webchat",
+        "from": {"id": "dl_16865950", "name": "You", "role": "user"},
+        "conversation": {"id": "Kx1hp3ZV9JV6LnA0qpPqeN-eu"},
+        "recipient": {"id": "contoso-bot@abc", "name": "contoso-bot"},
+        "textFormat": "plain",
+        "locale": "en-US",
+        "text": "hello",
+        "entities": [
+            {
+                "requiresBotState": True,
+                "supportsListening": True,
+                "supportsTts": True,
+                "type": "ClientCapabilities",
+            }
+        ],
+        "channelData": {"clientActivityID": "1686595026123bm6rrb4hc1q"},
+    },
+}
+
+
+def measure(function, number: int) -> float:
+    return timeit.timeit(function, number=number) / number * 1e6
+
+
+def report(name: str, old: float, new: float, labels=("msrest", "compiled")):
+    print(
+        f"{name:37s} {labels[0]}: {old:7.1f} us  {labels[1]}: {new:7.1f} us"
+        f"  speedup: {old / new:4.1f}x"
+    )
+
+
+def main():
+    compiled = CompiledSerializer(DEPENDENCIES)
+    number = 2000
+
+    for name, payload in PAYLOADS.items():
+        activity = Activity.deserialize(deepcopy(payload))
+        assert Model.serialize(activity) == activity.serialize()
+
+        report(
+            f"{name} deserialize",
+            measure(lambda p=payload: Model.deserialize.__func__(Activity, p), number),
+            measure(lambda p=payload: Activity.deserialize(p), number),
+        )
+        report(
+            f"{name} lazy deserialize",
+            measure(lambda p=payload: Activity.deserialize(p), number),
+            measure(lambda p=payload: LazyActivity.deserialize(p), number),
+            labels=("eager", "lazy"),
+        )
+        report(
+            f"{name} serialize",
+            measure(lambda a=activity: Model.serialize(a), number),
+            measure(lambda a=activity: a.serialize(), number),
+        )
+        # serializer_helper used to create a Serializer for every call.
+        report(
+            f"{name} serializer_helper",
+            measure(lambda a=activity: Serializer(DEPENDENCIES)._serialize(a), number),
+            measure(lambda a=activity: compiled.serialize(a), number),
+        )
+
+    report(
+        "teams channel_data deserialize",
+        measure(
+            lambda: Deserializer(DEPENDENCIES)("TeamsChannelData", TEAMS_CHANNEL_DATA),
+            number,
+        ),
+        measure(
+            lambda: compiled.deserialize(TeamsChannelData, TEAMS_CHANNEL_DATA), number
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import pickle
+from copy import copy, deepcopy
+
+import aiounittest
+import jsonpickle
+from msrest.serialization import Model
+
+from botbuilder.schema import (
+    Activity,
+    ChannelAccount,
+    ConversationAccount,
+    ConversationReference,
+    LazyActivity,
+    ResourceResponse,
+)
+from botbuilder.schema.teams import TeamsChannelAccount
+
+from test_compiled_serializer import CONVERSATION_UPDATE, TEAMS_MESSAGE
+
+
+class TestCompactModel(aiounittest.AsyncTestCase):
+    def test_stores_only_attributes_set(self):
+        account = ChannelAccount(id="user", name=None)
+
+        self.assertEqual({"id": "user"}, vars(account))
+        self.assertIsNone(account.name)
+        self.assertIsNone(account.aad_object_id)
+
+        account.name = "User"
+        account.id = None
+        self.assertEqual({"name": "User"}, vars(account))
+        self.assertIsNone(account.id)
+        self.assertIsNone(ChannelAccount.id)
+
+        self.assertEqual({}, vars(ResourceResponse()))
+        self.assertEqual({"id": "1"}, vars(ResourceResponse(id="1")))
+
+    def test_creates_additional_properties_when_read(self):
+        account = ChannelAccount(id="user")
+        self.assertEqual({}, account.additional_properties)
+        account.additional_properties["extra"] = 1
+        self.assertEqual({"extra": 1}, account.additional_properties)
+        self.assertEqual({"extra": 1}, vars(account)["additional_properties"])
+        self.assertNotIn("additional_properties", vars(ChannelAccount(id="user")))
+
+        account = ChannelAccount.deserialize({"id": "user", "extra": 1})
+        self.assertEqual({"extra": 1}, account.additional_properties)
+        self.assertEqual(Model.serialize(account), account.serialize())
+
+    def test_subclasses(self):
+        account = TeamsChannelAccount(id="user", email="user@contoso.com")
+        self.assertEqual({"id": "user", "email": "user@contoso.com"}, vars(account))
+        self.assertIsNone(account.given_name)
+
+        activity = LazyActivity.deserialize(deepcopy(TEAMS_MESSAGE))
+        self.assertNotIn("value", vars(activity))
+        self.assertNotIn("channel_data", vars(activity))
+        self.assertEqual(TEAMS_MESSAGE["channelData"], activity.channel_data)
+
+    def test_serializes_like_msrest(self):
+        for payload in (TEAMS_MESSAGE, CONVERSATION_UPDATE):
+            activity = Activity.deserialize(deepcopy(payload))
+            self.assertEqual(Model.serialize(activity), activity.serialize())
+            self.assertEqual(
+                Model.serialize(activity),
+                Model.deserialize.__func__(Activity, deepcopy(payload)).serialize(),
+            )
+
+        reference = ConversationReference(
+            activity_id="1",
+            user=ChannelAccount(id="user"),
+            conversation=ConversationAccount(id="conversation", is_group=False),
+            channel_id="msteams",
+        )
+        self.assertEqual(Model.serialize(reference), reference.serialize())
+        self.assertEqual(
+            reference, ConversationReference.deserialize(reference.serialize())
+        )
+
+    def test_equality(self):
+        account = ChannelAccount(id="user")
+
+        self.assertEqual(ChannelAccount(id="user", name=None), account)
+        self.assertNotEqual(ChannelAccount(id="user", name="User"), account)
+
+        account_copy = ChannelAccount(id="user")
+        self.assertEqual({}, account_copy.additional_properties)
+        self.assertEqual(account_copy, account)
+        account_copy.additional_properties["extra"] = 1
+        self.assertNotEqual(account_copy, account)
+        self.assertNotEqual(ResourceResponse(id="user"), account)
+
+    def test_copies(self):
+        activity = Activity.deserialize(deepcopy(TEAMS_MESSAGE))
+
+        for activity_copy in (
+            copy(activity),
+            deepcopy(activity),
+            pickle.loads(pickle.dumps(activity)),
+            jsonpickle.decode(jsonpickle.encode(activity)),
+        ):
+            self.assertEqual(activity, activity_copy)
+            self.assertEqual(vars(activity).keys(), vars(activity_copy).keys())
+
+        activity_copy = copy(activity)
+        activity_copy.text = None
+        self.assertEqual(TEAMS_MESSAGE["text"], activity.text)
+        self.assertIsNone(activity_copy.text)
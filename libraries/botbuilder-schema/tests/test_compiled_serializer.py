@@ -0,0 +1,237 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import subprocess
+import sys
+from copy import deepcopy
+from datetime import datetime, timezone
+
+import aiounittest
+from msrest.exceptions import DeserializationError, SerializationError
+from msrest.serialization import Deserializer, Model, Serializer
+
+import botbuilder.schema as schema
+import botbuilder.schema.teams as teams_schema
+from botbuilder.schema import (
+    Activity,
+    ActivityTypes,
+    Attachment,
+    ChannelAccount,
+    CompiledSerializer,
+    ConversationAccount,
+    ConversationReference,
+    Mention,
+    TextFormatTypes,
+)
+from botbuilder.schema.teams import TeamInfo, TeamsChannelData, TenantInfo
+
+DEPENDENCIES = {
+    name: cls
+    for module in (schema, teams_schema)
+    for name, cls in vars(module).items()
+    if isinstance(cls, type)
+}
+
+TEAMS_MESSAGE = {
+    "text": "<at>Bot</at> hello",
+    "textFormat": "plain",
+    "attachments": [
+        {"contentType": "text/html", "content": "<div><at>Bot</at> hello</div>"},
+        {
+            "contentType": "application/vnd.microsoft.card.adaptive",
+            "content": {
+                "type": "AdaptiveCard",
+                "version": "1.4",
+                "body": [{"type": "TextBlock", "text": "Hi", "wrap": True}],
+                "actions": [{"type": "Action.Submit", "data": {"id": 1.5}}],
+            },
+        },
+    ],
+    "type": "message",
+    "timestamp": "2023-06-12T18:37:06.4735172Z",
+    "localTimestamp": "2023-06-12T20:37:06.4735172+02:00",
+    "id": "1686595026473",
+    "channelId": "msteams",
+    "serviceUrl": "https://smba.trafficmanager.net/emea/",
+    "from": {
+        "id": "29:1abc",
+        "name": "Jane",
+        "aadObjectId": "6f0e1c3a-8c4a-4b2e-9e6a-0d3f7e2a9b11",
+    },
+    "conversation": {
+        "isGroup": True,
+        "conversationType": "channel",
+        "tenantId": "72f988bf-86f1-41af-91ab-2d7cd011db47",
+        "id": "19:abc@thread.tacv2;messageid=1686595026473",
+    },
+    "recipient": {"id": "28:bot", "name": "Bot"},
+    "entities": [
+        {
+            "mentioned": {"id": "28:bot", "name": "Bot"},
+            "text": "<at>Bot</at>",
+            "type": "mention",
+        },
+        {
+            "locale": "en-US",
+            "country": "US",
+            "platform": "Web",
+            "timezone": "Europe/Paris",
+            "type": "clientInfo",
+        },
+    ],
+    "channelData": {
+        "teamsChannelId": "19:abc@thread.tacv2",
+        "teamsTeamId": "19:team@thread.tacv2",
+        "channel": {"id": "19:abc@thread.tacv2"},
+        "team": {"id": "19:team@thread.tacv2"},
+        "tenant": {"id": "72f988bf-86f1-41af-91ab-2d7cd011db47"},
+        "settings": {"selectedChannel": {"id": "19:abc@thread.tacv2"}},
+    },
+    "locale": "en-US",
+    "localTimezone": "Europe/Paris",
+}
+
+CONVERSATION_UPDATE = {
+    "membersAdded": [{"id": "29:1abc", "aadObjectId": "6f0e"}, {"id": "28:bot"}],
+    "type": "conversationUpdate",
+    "timestamp": "2023-06-12T18:37:06Z",
+    "id": "f:123",
+    "channelId": "msteams",
+    "serviceUrl": "https://smba.trafficmanager.net/emea/",
+    "from": {"id": "29:1abc"},
+    "conversation": {"conversationType": "personal", "id": "a:1xyz"},
+    "recipient": {"id": "28:bot", "name": "Bot"},
+    "channelData": {"tenant": {"id": "tenant"}, "eventType": "teamMemberAdded"},
+}
+
+
+class TestCompiledSerializer(aiounittest.AsyncTestCase):
+    def assert_serializes_like_msrest(self, model: Model):
+        expected = Serializer(DEPENDENCIES)._serialize(model)
+        self.assertEqual(expected, CompiledSerializer(DEPENDENCIES).serialize(model))
+        self.assertEqual(
+            list(expected), list(CompiledSerializer(DEPENDENCIES).serialize(model))
+        )
+        self.assertEqual(Model.serialize(model), model.serialize())
+
+    def assert_deserializes_like_msrest(self, target: type, data: dict):
+        expected = Deserializer(DEPENDENCIES)(target.__name__, deepcopy(data))
+        actual = CompiledSerializer(DEPENDENCIES).deserialize(
+            target.__name__, deepcopy(data)
+        )
+        self.assertEqual(expected, actual)
+        self.assertIs(type(expected), type(actual))
+        self.assertEqual(
+            Model.deserialize.__func__(target, deepcopy(data)),
+            target.deserialize(deepcopy(data)),
+        )
+        return actual
+
+    def test_deserialize_channel_payloads(self):
+        activity = self.assert_deserializes_like_msrest(Activity, TEAMS_MESSAGE)
+        self.assertEqual(
+            activity.from_property.aad_object_id, TEAMS_MESSAGE["from"]["aadObjectId"]
+        )
+        self.assertEqual(activity.timestamp.microsecond, 473517)
+        self.assertEqual(
+            activity.entities[0].additional_properties["mentioned"]["id"], "28:bot"
+        )
+
+        self.assert_deserializes_like_msrest(Activity, CONVERSATION_UPDATE)
+        self.assert_deserializes_like_msrest(
+            TeamsChannelData, TEAMS_MESSAGE["channelData"]
+        )
+        self.assert_deserializes_like_msrest(
+            ConversationReference,
+            {"conversation": {"id": "a"}, "channelId": "msteams", "other": [1, None]},
+        )
+
+    def test_deserialize_unusual_values(self):
+        self.assert_deserializes_like_msrest(
+            Activity,
+            {
+                "type": "message",
+                "id": 42,
+                "timestamp": datetime(2023, 6, 12, tzinfo=timezone.utc),
+                "membersAdded": [None, {"id": "a"}],
+                "channelData": {"values": [1, None, {"a": None}]},
+                "value": "value",
+                "unknown": {"nested": True},
+            },
+        )
+        self.assert_deserializes_like_msrest(
+            Attachment, {"contentType": "text/plain", "content": "text", "name": 5}
+        )
+        self.assert_deserializes_like_msrest(ChannelAccount, {"id": "a", "role": "bot"})
+
+        with self.assertRaises(DeserializationError):
+            CompiledSerializer(DEPENDENCIES).deserialize(
+                "Activity", {"membersAdded": "not a list"}
+            )
+
+    def test_shares_serializer_by_package(self):
+        serializer = Activity._get_compiled_serializer()
+        self.assertIs(serializer, ChannelAccount._get_compiled_serializer())
+        self.assertIs(serializer.dependencies["Activity"], Activity)
+        self.assertIsNot(serializer, TeamsChannelData._get_compiled_serializer())
+        self.assertIs(
+            TeamsChannelData._get_compiled_serializer(),
+            TeamInfo._get_compiled_serializer(),
+        )
+
+        # In a new interpreter, the first serializer has every model of the package.
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from botbuilder.schema import Activity\n"
+                "Activity.deserialize({'type': 'message'})\n"
+                "activity = Activity.deserialize({'from': {'id': 'u'}})\n"
+                "print(type(activity.from_property).__name__)",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        self.assertEqual("ChannelAccount", output.strip())
+
+    def test_serialize_models(self):
+        activity = Activity.deserialize(deepcopy(TEAMS_MESSAGE))
+        self.assert_serializes_like_msrest(activity)
+
+        self.assert_serializes_like_msrest(
+            Activity(
+                type=ActivityTypes.message,
+                text_format=TextFormatTypes.markdown,
+                timestamp=datetime(2023, 6, 12, 18, 37, 6, 473517, timezone.utc),
+                from_property=ChannelAccount(id="bot", role="bot"),
+                entities=[
+                    Mention(mentioned=ChannelAccount(id="user"), text="<at>user</at>")
+                ],
+                channel_data=TeamsChannelData(
+                    team=TeamInfo(id="team"), tenant=TenantInfo(id="tenant")
+                ),
+                value={"card": Attachment(content_type="text/plain"), "list": [1, 2]},
+                attachments=[],
+            )
+        )
+
+    def test_serialize_unusual_values(self):
+        self.assert_serializes_like_msrest(
+            Activity(
+                id=42,
+                text=b"bytes",
+                members_added=(ChannelAccount(id="a"), None),
+                value={"date": datetime(2023, 6, 12), 1: "key", "enum": InvalidEnum()},
+                conversation=ConversationAccount(id="a", is_group="yes"),
+                label=TextFormatTypes.plain,
+            )
+        )
+
+        with self.assertRaises(SerializationError):
+            CompiledSerializer(DEPENDENCIES).serialize(Activity(timestamp="not a date"))
+
+
+class InvalidEnum:
+    def __str__(self):
+        return "invalid"
@@ -0,0 +1,61 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from copy import copy, deepcopy
+
+import aiounittest
+from botbuilder.schema import Activity, Attachment, LazyActivity
+
+from test_compiled_serializer import TEAMS_MESSAGE
+
+
+def get_raw_attributes(activity: LazyActivity):
+    return sorted(activity.__dict__.get("_raw_values", {}))
+
+
+class TestLazyActivity(aiounittest.AsyncTestCase):
+    def test_deserializes_on_first_read(self):
+        activity = LazyActivity.deserialize(deepcopy(TEAMS_MESSAGE))
+        expected = Activity.deserialize(deepcopy(TEAMS_MESSAGE))
+
+        self.assertEqual(
+            ["attachments", "channel_data", "entities"], get_raw_attributes(activity)
+        )
+        self.assertEqual(expected.text, activity.text)
+        self.assertIsNone(activity.value)
+
+        self.assertEqual(expected.channel_data, activity.channel_data)
+        self.assertIs(activity.channel_data, activity.channel_data)
+        self.assertEqual(expected.entities, activity.entities)
+        self.assertIsInstance(activity.attachments[0], Attachment)
+        self.assertEqual([], get_raw_attributes(activity))
+
+        self.assertEqual(expected.serialize(), activity.serialize())
+
+    def test_serializes_unread_attributes_as_received(self):
+        data = deepcopy(TEAMS_MESSAGE)
+        activity = LazyActivity.deserialize(data)
+
+        serialized = activity.serialize()
+        self.assertIs(data["channelData"], serialized["channelData"])
+        self.assertEqual(TEAMS_MESSAGE["entities"], serialized["entities"])
+        self.assertEqual("<at>Bot</at>", serialized["entities"][0]["text"])
+
+        activity.channel_data = {"replaced": True}
+        self.assertEqual({"replaced": True}, activity.serialize()["channelData"])
+
+    def test_copies_read_independently(self):
+        activity = LazyActivity.deserialize(deepcopy(TEAMS_MESSAGE))
+        activity_copy = copy(activity)
+
+        self.assertEqual("mention", activity.entities[0].type)
+        self.assertEqual(
+            ["attachments", "channel_data", "entities"],
+            get_raw_attributes(activity_copy),
+        )
+        self.assertEqual("mention", activity_copy.entities[0].type)
+
+    def test_equality(self):
+        activity = LazyActivity.deserialize(deepcopy(TEAMS_MESSAGE))
+        self.assertEqual(LazyActivity.deserialize(deepcopy(TEAMS_MESSAGE)), activity)
+        self.assertNotEqual(LazyActivity.deserialize({"type": "message"}), activity)
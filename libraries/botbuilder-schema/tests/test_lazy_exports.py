@@ -0,0 +1,38 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import subprocess
+import sys
+
+import aiounittest
+
+
+def run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+
+class TestLazyExports(aiounittest.AsyncTestCase):
+    def test_deserializes_nested_models_of_unread_exports(self):
+        # In a new interpreter, where no other module read the exports of the packages.
+        self.assertEqual(
+            "ChannelAccount ChannelAccount",
+            run(
+                "from msrest.serialization import Model\n"
+                "from botbuilder.schema import Activity\n"
+                "data = {'type': 'message', 'from': {'id': 'u'}}\n"
+                "activity = Activity.deserialize(data)\n"
+                "msrest_activity = Model.deserialize.__func__(Activity, data)\n"
+                "print(type(activity.from_property).__name__,"
+                " type(msrest_activity.from_property).__name__)"
+            ),
+        )
+        self.assertEqual(
+            "TeamInfo",
+            run(
+                "from botbuilder.schema.teams import TeamsChannelData\n"
+                "data = TeamsChannelData.deserialize({'team': {'id': 't'}})\n"
+                "print(type(data.team).__name__)"
+            ),
+        )
@@ -11,15 +11,19 @@ from .emulator_api_client import EmulatorApiClient
 from .version import VERSION
 
 from .aiohttp_bf_pipeline import AsyncBfPipeline
+from .aiohttp_http_sender import AiohttpHTTPSender
 from .bot_framework_sdk_client_async import BotFrameworkConnectorConfiguration
+from .client_pool import ClientPool
 from .http_client_base import HttpClientBase
 from .http_client_factory import HttpClientFactory
 from .http_request import HttpRequest
 from .http_response_base import HttpResponseBase
 
 __all__ = [
+    "AiohttpHTTPSender",
     "AsyncBfPipeline",
     "Channels",
+    "ClientPool",
     "ConnectorClient",
     "EmulatorApiClient",
     "BotFrameworkConnectorConfiguration",
@@ -1,20 +1,71 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-from msrest.pipeline import AsyncPipeline, AsyncHTTPPolicy, SansIOHTTPPolicy
+from msrest.pipeline import (
+    AsyncPipeline,
+    AsyncHTTPPolicy,
+    AsyncHTTPSender,
+    Request,
+    Response,
+    SansIOHTTPPolicy,
+)
 from msrest.universal_http.async_requests import AsyncRequestsHTTPSender as Driver
 from msrest.pipeline.async_requests import (
     AsyncRequestsCredentialsPolicy,
     AsyncPipelineRequestsHTTPSender,
 )
 from msrest.pipeline.universal import RawDeserializer
+import requests
 
+from .aiohttp_http_sender import AiohttpHTTPSender
 from .bot_framework_sdk_client_async import BotFrameworkConnectorConfiguration
 
 
+class _AsyncCredentialsHeaderPolicy(AsyncHTTPPolicy):
+    """
+    Adds the Authorization header of credentials that sign requests sessions to requests sent
+    without one, like requests sent with aiohttp.
+    """
+
+    def __init__(self, credentials):
+        super().__init__()
+        self._credentials = credentials
+        self._session = requests.Session()
+
+    async def send(self, request, **kwargs):
+        session = self._credentials.signed_session(self._session)
+        authorization = session.headers.get("Authorization")
+        if authorization:
+            request.http_request.headers["Authorization"] = authorization
+        return await self.next.send(request, **kwargs)
+
+
+class _AiohttpPipelineSender(AsyncHTTPSender):
+    """
+    Sends pipeline requests with an :class:`AiohttpHTTPSender`, passing the operation options on.
+    """
+
+    def __init__(self, driver: AiohttpHTTPSender):
+        self.driver = driver
+
+    async def __aenter__(self):
+        await self.driver.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_details):  # pylint: disable=arguments-differ
+        await self.driver.__aexit__(*exc_details)
+
+    def build_context(self):
+        return None
+
+    async def send(self, request: Request, **config) -> Response:
+        return Response(request, await self.driver.send(request.http_request, **config))
+
+
 class AsyncBfPipeline(AsyncPipeline):
     def __init__(self, config: BotFrameworkConnectorConfiguration):
         creds = config.credentials
+        driver = config.driver
 
         policies = [
             config.user_agent_policy,  # UserAgent policy
@@ -24,11 +75,16 @@ class AsyncBfPipeline(AsyncPipeline):
         if creds:
             if isinstance(creds, (AsyncHTTPPolicy, SansIOHTTPPolicy)):
                 policies.insert(1, creds)
+            elif isinstance(driver, AiohttpHTTPSender):
+                policies.insert(1, _AsyncCredentialsHeaderPolicy(creds))
             else:
                 # Assume this is the old credentials class, and then requests. Wrap it.
                 policies.insert(1, AsyncRequestsCredentialsPolicy(creds))
 
-        sender = config.sender or AsyncPipelineRequestsHTTPSender(
-            config.driver or Driver(config)
-        )
+        if config.sender:
+            sender = config.sender
+        elif isinstance(driver, AiohttpHTTPSender):
+            sender = _AiohttpPipelineSender(driver)
+        else:
+            sender = AsyncPipelineRequestsHTTPSender(driver or Driver(config))
         super().__init__(policies, sender)
@@ -0,0 +1,260 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from typing import Any, Callable, Dict
+
+import aiohttp
+from msrest import Configuration
+from msrest.exceptions import ClientRequestError, raise_with_traceback
+from msrest.universal_http import ClientRequest
+from msrest.universal_http.aiohttp import AioHttpClientResponse
+from msrest.universal_http.async_abc import AsyncClientResponse, AsyncHTTPSender
+
+
+class _AiohttpClientResponse(AioHttpClientResponse):
+    def body(self) -> bytes:
+        # The msrest response treats an empty body, like the one of most errors, as not loaded.
+        if self._body is None:
+            return super().body()
+        return self._body
+
+
+class _RequestSentCallback:
+    def __init__(self, callback: Callable[[], None], has_body: bool):
+        self.has_body = has_body
+        self._callback = callback
+
+    def __call__(self):
+        # A body may be written in several chunks, and retried requests are written again.
+        if self._callback is not None:
+            callback, self._callback = self._callback, None
+            callback()
+
+
+async def _on_request_headers_sent(session, context, params):
+    # pylint: disable=unused-argument
+    request_context = context.trace_request_ctx
+    if (
+        isinstance(request_context, _RequestSentCallback)
+        and not request_context.has_body
+    ):
+        request_context()
+
+
+async def _on_request_chunk_sent(session, context, params):
+    # pylint: disable=unused-argument
+    request_context = context.trace_request_ctx
+    if isinstance(request_context, _RequestSentCallback):
+        request_context()
+
+
+class AiohttpHTTPSender(AsyncHTTPSender):
+    """
+    An msrest HTTP driver that sends requests with aiohttp, on the event loop.
+
+    .. remarks::
+        Unlike the default driver, which runs the requests library on executor threads, requests
+        are sent without a thread hop. One `aiohttp.ClientSession` is shared by every request of an
+        event loop, so connections are kept alive and reused, and DNS lookups are cached for
+        `dns_cache_seconds`. A session only works on the loop it was created on, so a driver used
+        on several loops has a session per loop, and :meth:`close` closes all of them.
+        Pass the driver to the clients that should share it, for example with
+        :meth:`ClientPool.get_http_driver`.
+
+        Pass an `on_request_sent` callback to :meth:`send`, for example as an operation keyword
+        argument, to be called once the request has been written to its connection.
+
+        Timeouts, certificate verification, proxies, redirects and retries follow the msrest
+        `config`. Failures to connect are retried for every method, and other connection errors and
+        retryable statuses only for the methods the retry policy allows, like the default driver.
+    """
+
+    def __init__(
+        self,
+        config: Configuration = None,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        dns_cache_seconds: int = 300,
+    ):
+        """
+        :param config: The configuration requests are sent with.
+        :param limit: The maximum number of open connections, or 0 for no limit.
+        :param limit_per_host: The maximum number of open connections per host, or 0 for no limit.
+        :param keepalive_timeout: How long an idle connection is kept open, in seconds.
+        :param dns_cache_seconds: How long resolved host names are cached, in seconds.
+        """
+        self.config = config
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_seconds = dns_cache_seconds
+
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+        self._trace_config = aiohttp.TraceConfig()
+        self._trace_config.on_request_headers_sent.append(_on_request_headers_sent)
+        self._trace_config.on_request_chunk_sent.append(_on_request_chunk_sent)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_details):  # pylint: disable=arguments-differ
+        # The session is shared with other clients, so it outlives any one of them. See close.
+        pass
+
+    async def close(self):
+        """
+        Closes the sessions of every event loop the driver was used on, and their connections.
+        """
+        sessions, self._sessions = self._sessions, {}
+        for loop, session in sessions.items():
+            await AiohttpHTTPSender._close_session(loop, session)
+
+    async def send(self, request: ClientRequest, **config: Any) -> AsyncClientResponse:
+        """
+        Sends a request.
+
+        :param request: The request.
+        :param config: Overrides of the configuration, like `stream`, and `on_request_sent`.
+        :return: The response, with its body loaded unless `stream` is set.
+        """
+        kwargs = self._get_request_kwargs(request, config)
+        if config.get("on_request_sent"):
+            kwargs["trace_request_ctx"] = _RequestSentCallback(
+                config["on_request_sent"], "data" in kwargs
+            )
+        retries, backoff_factor, status_forcelist, allowed_methods = self._get_retries()
+
+        attempt = 0
+        while True:
+            try:
+                session = await self._get_session()
+                response = await session.request(request.method, request.url, **kwargs)
+            except aiohttp.ClientConnectionError as err:
+                # A request that failed to connect was never sent, so it's safe to send again.
+                if attempt >= retries or (
+                    not isinstance(err, aiohttp.ClientConnectorError)
+                    and request.method.upper() not in allowed_methods
+                ):
+                    raise_with_traceback(
+                        ClientRequestError, "Error occurred in request.", err
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                raise_with_traceback(
+                    ClientRequestError, "Error occurred in request.", err
+                )
+            else:
+                if (
+                    attempt >= retries
+                    or response.status not in status_forcelist
+                    or request.method.upper() not in allowed_methods
+                ):
+                    result = _AiohttpClientResponse(request, response)
+                    if not config.get("stream", False):
+                        await result.load_body()
+                    return result
+                response.release()
+
+            attempt += 1
+            await asyncio.sleep(backoff_factor * (2 ** (attempt - 1)))
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is not None and not session.closed:
+            return session
+
+        # The sessions of loops that were closed can't be used again.
+        for other_loop in [other for other in self._sessions if other.is_closed()]:
+            await AiohttpHTTPSender._close_session(
+                other_loop, self._sessions.pop(other_loop)
+            )
+
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_seconds,
+            ),
+            trace_configs=[self._trace_config],
+            # Cookies aren't used by the Bot Framework services and would be shared across bots.
+            cookie_jar=aiohttp.DummyCookieJar(),
+            # Like requests, take proxies from the environment.
+            trust_env=getattr(
+                getattr(self.config, "proxies", None), "use_env_settings", True
+            ),
+        )
+        self._sessions[loop] = session
+        return session
+
+    @staticmethod
+    async def _close_session(
+        loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession
+    ):
+        if loop is not asyncio.get_running_loop() and loop.is_running():
+            # The loop runs in another thread, which must close the session's connections.
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            )
+        else:
+            await session.close()
+
+    def _get_request_kwargs(self, request: ClientRequest, config: dict) -> dict:
+        kwargs = {"headers": dict(request.headers)}
+
+        if request.files:
+            form = aiohttp.FormData()
+            for name, value in request.files.items():
+                if isinstance(value, tuple):
+                    form.add_field(
+                        name,
+                        value[1],
+                        filename=value[0],
+                        content_type=value[2] if len(value) > 2 else None,
+                    )
+                else:
+                    form.add_field(name, value)
+            kwargs["data"] = form
+        elif request.data is not None:
+            kwargs["data"] = request.data
+
+        connection = getattr(self.config, "connection", None)
+        timeout = config.get("timeout", getattr(connection, "timeout", None))
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        if connection is not None and not connection.verify:
+            kwargs["ssl"] = False
+
+        proxies = getattr(getattr(self.config, "proxies", None), "proxies", None)
+        if proxies:
+            proxy = proxies.get(request.url.split(":", 1)[0].lower())
+            if proxy:
+                kwargs["proxy"] = proxy
+
+        redirect_policy = getattr(self.config, "redirect_policy", None)
+        if redirect_policy is not None:
+            kwargs["allow_redirects"] = bool(redirect_policy.allow)
+            if redirect_policy.max_redirects:
+                kwargs["max_redirects"] = redirect_policy.max_redirects
+
+        return kwargs
+
+    def _get_retries(self) -> tuple:
+        # msrest describes retries with a urllib3 Retry.
+        retry = getattr(getattr(self.config, "retry_policy", None), "policy", None)
+        if retry is None:
+            return 0, 0, frozenset(), frozenset()
+
+        allowed_methods = getattr(retry, "allowed_methods", None)
+        if allowed_methods is None:
+            allowed_methods = getattr(retry, "method_whitelist", None) or ()
+        return (
+            retry.total if isinstance(retry.total, int) else 0,
+            retry.backoff_factor or 0,
+            frozenset(retry.status_forcelist or ()),
+            frozenset(method.upper() for method in allowed_methods),
+        )
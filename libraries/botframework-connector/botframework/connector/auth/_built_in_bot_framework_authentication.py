@@ -7,6 +7,7 @@ from typing import Optional
 from botbuilder.schema import Activity
 
 from ..bot_framework_sdk_client_async import BotFrameworkConnectorConfiguration
+from ..client_pool import ClientPool
 from ..http_client_factory import HttpClientFactory
 from ..skills.bot_framework_client import BotFrameworkClient
 
@@ -52,6 +53,8 @@ class _BuiltinBotFrameworkAuthentication(BotFrameworkAuthentication):
         self._http_client_factory = http_client_factory
         self._connector_client_configuration = connector_client_configuration
         self._logger = logger
+        self._connector_client_pool = ClientPool()
+        self._user_token_client_pool = ClientPool()
 
     @staticmethod
     def get_app_id(claims_identity: ClaimsIdentity) -> str:
@@ -98,6 +101,7 @@ class _BuiltinBotFrameworkAuthentication(BotFrameworkAuthentication):
             credential_factory=self._credentials_factory,
             connector_client_configuration=self._connector_client_configuration,
             logger=self._logger,
+            client_pool=self._connector_client_pool,
         )
 
         result = AuthenticateRequestResult()
@@ -157,6 +161,7 @@ class _BuiltinBotFrameworkAuthentication(BotFrameworkAuthentication):
             credential_factory=self._credentials_factory,
             connector_client_configuration=self._connector_client_configuration,
             logger=self._logger,
+            client_pool=self._connector_client_pool,
         )
 
     async def create_user_token_client(
@@ -164,14 +169,19 @@ class _BuiltinBotFrameworkAuthentication(BotFrameworkAuthentication):
     ) -> UserTokenClient:
         app_id = _BuiltinBotFrameworkAuthentication.get_app_id(claims_identity)
 
-        credentials = await self._credentials_factory.create_credentials(
-            app_id,
-            oauth_scope=self._to_channel_from_bot_oauth_scope,
-            login_endpoint=self._login_endpoint,
-            validate_authority=True,
-        )
+        async def create_client():
+            credentials = await self._credentials_factory.create_credentials(
+                app_id,
+                oauth_scope=self._to_channel_from_bot_oauth_scope,
+                login_endpoint=self._login_endpoint,
+                validate_authority=True,
+            )
+            return _UserTokenClientImpl(app_id, credentials, self._oauth_endpoint)
 
-        return _UserTokenClientImpl(app_id, credentials, self._oauth_endpoint)
+        return await self._user_token_client_pool.get_or_create(
+            (self._oauth_endpoint, self._to_channel_from_bot_oauth_scope, app_id),
+            create_client,
+        )
 
     def create_bot_framework_client(self) -> BotFrameworkClient:
         return _BotFrameworkClientImpl(
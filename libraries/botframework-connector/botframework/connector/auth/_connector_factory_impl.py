@@ -6,7 +6,9 @@ from logging import Logger
 from botframework.connector.aio import ConnectorClient
 
 from ..about import __version__
+from ..aiohttp_bf_pipeline import AsyncBfPipeline
 from ..bot_framework_sdk_client_async import BotFrameworkConnectorConfiguration
+from ..client_pool import ClientPool
 from .connector_factory import ConnectorFactory
 from .service_client_credentials_factory import ServiceClientCredentialsFactory
 
@@ -23,6 +25,7 @@ class _ConnectorFactoryImpl(ConnectorFactory):
         credential_factory: ServiceClientCredentialsFactory,
         connector_client_configuration: BotFrameworkConnectorConfiguration = None,
         logger: Logger = None,
+        client_pool: ClientPool = None,
     ) -> None:
         self._app_id = app_id
         self._to_channel_from_bot_oauth_scope = to_channel_from_bot_oauth_scope
@@ -31,12 +34,24 @@ class _ConnectorFactoryImpl(ConnectorFactory):
         self._credential_factory = credential_factory
         self._connector_client_configuration = connector_client_configuration
         self._logger = logger
+        self._client_pool = client_pool
 
     async def create(self, service_url: str, audience: str = None) -> ConnectorClient:
+        audience = audience or self._to_channel_from_bot_oauth_scope
+        if self._client_pool is None:
+            return await self._create_client(service_url, audience)
+
+        # Clients are reused across turns, keeping their credentials and connections.
+        return await self._client_pool.get_or_create(
+            (service_url, audience, self._app_id),
+            lambda: self._create_client(service_url, audience),
+        )
+
+    async def _create_client(self, service_url: str, audience: str) -> ConnectorClient:
         # Use the credentials factory to create credentails specific to this particular cloud environment.
         credentials = await self._credential_factory.create_credentials(
             self._app_id,
-            audience or self._to_channel_from_bot_oauth_scope,
+            audience,
             self._login_endpoint,
             self._validate_authority,
         )
@@ -49,6 +64,15 @@ class _ConnectorFactoryImpl(ConnectorFactory):
                 base_url=service_url,
                 custom_configuration=self._connector_client_configuration,
             )
+        elif self._client_pool is not None:
+            client = ConnectorClient(
+                credentials,
+                base_url=service_url,
+                pipeline_type=AsyncBfPipeline,
+                driver=self._client_pool.get_http_driver(
+                    BotFrameworkConnectorConfiguration(credentials, service_url)
+                ),
+            )
         else:
             client = ConnectorClient(credentials, base_url=service_url)
         client.config.add_user_agent(USER_AGENT)
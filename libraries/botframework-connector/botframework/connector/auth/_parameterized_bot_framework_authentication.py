@@ -7,6 +7,7 @@ from typing import Dict, Optional
 from botbuilder.schema import Activity, RoleTypes
 
 from ..bot_framework_sdk_client_async import BotFrameworkConnectorConfiguration
+from ..client_pool import ClientPool
 from ..http_client_factory import HttpClientFactory
 from ..channels import Channels
 from ..skills.bot_framework_client import BotFrameworkClient
@@ -64,6 +65,8 @@ class _ParameterizedBotFrameworkAuthentication(BotFrameworkAuthentication):
         self._http_client_factory = http_client_factory
         self._connector_client_configuration = connector_client_configuration
         self._logger = logger
+        self._connector_client_pool = ClientPool()
+        self._user_token_client_pool = ClientPool()
 
     async def authenticate_request(
         self, activity: Activity, auth_header: str
@@ -92,6 +95,7 @@ class _ParameterizedBotFrameworkAuthentication(BotFrameworkAuthentication):
             credential_factory=self._credentials_factory,
             connector_client_configuration=self._connector_client_configuration,
             logger=self._logger,
+            client_pool=self._connector_client_pool,
         )
 
         result = AuthenticateRequestResult()
@@ -146,6 +150,7 @@ class _ParameterizedBotFrameworkAuthentication(BotFrameworkAuthentication):
             credential_factory=self._credentials_factory,
             connector_client_configuration=self._connector_client_configuration,
             logger=self._logger,
+            client_pool=self._connector_client_pool,
         )
 
     async def create_user_token_client(
@@ -153,14 +158,19 @@ class _ParameterizedBotFrameworkAuthentication(BotFrameworkAuthentication):
     ) -> UserTokenClient:
         app_id = _BuiltinBotFrameworkAuthentication.get_app_id(claims_identity)
 
-        credentials = await self._credentials_factory.create_credentials(
-            app_id,
-            oauth_scope=self._to_channel_from_bot_oauth_scope,
-            login_endpoint=self._to_channel_from_bot_login_url,
-            validate_authority=self._validate_authority,
-        )
+        async def create_client():
+            credentials = await self._credentials_factory.create_credentials(
+                app_id,
+                oauth_scope=self._to_channel_from_bot_oauth_scope,
+                login_endpoint=self._to_channel_from_bot_login_url,
+                validate_authority=self._validate_authority,
+            )
+            return _UserTokenClientImpl(app_id, credentials, self._oauth_url)
 
-        return _UserTokenClientImpl(app_id, credentials, self._oauth_url)
+        return await self._user_token_client_pool.get_or_create(
+            (self._oauth_url, self._to_channel_from_bot_oauth_scope, app_id),
+            create_client,
+        )
 
     def create_bot_framework_client(self) -> BotFrameworkClient:
         return _BotFrameworkClientImpl(
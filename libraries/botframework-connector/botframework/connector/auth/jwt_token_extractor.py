@@ -2,7 +2,11 @@
 # Licensed under the MIT License.
 
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from hashlib import sha256
+from threading import Lock
 from typing import List
 import requests
 from jwt.algorithms import RSAAlgorithm
@@ -12,9 +16,70 @@ from .verify_options import VerifyOptions
 from .endorsements_validator import EndorsementsValidator
 
 
+class _ValidatedToken:
+    def __init__(self, claims: dict, algorithm: str, endorsements: List[str]):
+        self.claims = claims
+        self.algorithm = algorithm
+        self.endorsements = endorsements
+
+    def is_expired(self, validation_parameters: VerifyOptions) -> bool:
+        if validation_parameters.ignore_expiration:
+            return False
+        leeway = validation_parameters.clock_tolerance
+        if isinstance(leeway, timedelta):
+            leeway = leeway.total_seconds()
+        # Like jwt.decode.
+        return self.claims["exp"] <= time.time() - leeway
+
+
+class _ValidatedTokenCache:
+    """
+    The tokens whose signature was verified, by a digest of the token and of its metadata URL.
+
+    .. remarks::
+        The least recently used tokens are evicted once `max_size` is exceeded, and expired tokens
+        when they're read. Tokens stay valid until they expire even when their signing key is
+        removed from the metadata.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._tokens: "OrderedDict[bytes, _ValidatedToken]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: bytes) -> _ValidatedToken:
+        with self._lock:
+            validated_token = self._tokens.get(key)
+            if validated_token is not None:
+                self._tokens.move_to_end(key)
+            return validated_token
+
+    def add(self, key: bytes, validated_token: _ValidatedToken):
+        with self._lock:
+            self._tokens[key] = validated_token
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+
+    def remove(self, key: bytes):
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+
 class JwtTokenExtractor:
     metadataCache = {}
 
+    # The tokens whose signature was verified, shared by the extractors of every validation, since
+    # channels send the same token with many requests.
+    validatedTokenCache = _ValidatedTokenCache(max_size=1000)
+
     def __init__(
         self,
         validation_params: VerifyOptions,
@@ -56,49 +121,56 @@ class JwtTokenExtractor:
         if schema != "Bearer" or not parameter:
             return None
 
+        cache_key = sha256(
+            f"{self.open_id_metadata.url} {parameter}".encode("utf-8")
+        ).digest()
+        validated_token = JwtTokenExtractor.validatedTokenCache.get(cache_key)
+        if validated_token is not None:
+            if not validated_token.is_expired(self.validation_parameters):
+                return self._get_validated_identity(
+                    validated_token, channel_id, required_endorsements
+                )
+            JwtTokenExtractor.validatedTokenCache.remove(cache_key)
+
         # Issuer isn't allowed? No need to check signature
         if not self._has_allowed_issuer(parameter):
             return None
 
         try:
             return await self._validate_token(
-                parameter, channel_id, required_endorsements
+                parameter, channel_id, required_endorsements, cache_key
             )
         except Exception as error:
             raise error
 
     def _has_allowed_issuer(self, jwt_token: str) -> bool:
         decoded = jwt.decode(jwt_token, options={"verify_signature": False})
-        issuer = decoded.get("iss", None)
+        return self._is_allowed_issuer(decoded.get("iss", None))
+
+    def _is_allowed_issuer(self, issuer: str) -> bool:
         if issuer in self.validation_parameters.issuer:
             return True
 
         return issuer == self.validation_parameters.issuer
 
     async def _validate_token(
-        self, jwt_token: str, channel_id: str, required_endorsements: List[str] = None
+        self,
+        jwt_token: str,
+        channel_id: str,
+        required_endorsements: List[str] = None,
+        cache_key: bytes = None,
     ) -> ClaimsIdentity:
-        required_endorsements = required_endorsements or []
         headers = jwt.get_unverified_header(jwt_token)
 
         # Update the signing tokens from the last refresh
         key_id = headers.get("kid", None)
         metadata = await self.open_id_metadata.get(key_id)
 
-        if key_id and metadata.endorsements:
-            # Verify that channelId is included in endorsements
-            if not EndorsementsValidator.validate(channel_id, metadata.endorsements):
-                raise Exception("Could not validate endorsement key")
-
-            # Verify that additional endorsements are satisfied.
-            # If no additional endorsements are expected, the requirement is satisfied as well
-            for endorsement in required_endorsements:
-                if not EndorsementsValidator.validate(
-                    endorsement, metadata.endorsements
-                ):
-                    raise Exception("Could not validate endorsement key")
+        endorsements = metadata.endorsements if key_id else []
+        self._validate_endorsements(endorsements, channel_id, required_endorsements)
 
-        if headers.get("alg", None) not in self.validation_parameters.algorithms:
+        algorithm = headers.get("alg", None)
+        if algorithm not in self.validation_parameters.algorithms:
             raise Exception("Token signing algorithm not in allowed list")
 
         options = {
@@ -114,10 +186,58 @@ class JwtTokenExtractor:
             algorithms=["RS256"],
         )
 
+        # Tokens that don't expire aren't cached.
+        if cache_key is not None and isinstance(
+            decoded_payload.get("exp"), (int, float)
+        ):
+            JwtTokenExtractor.validatedTokenCache.add(
+                cache_key,
+                _ValidatedToken(dict(decoded_payload), algorithm, endorsements),
+            )
+
         claims = ClaimsIdentity(decoded_payload, True)
 
         return claims
 
+    def _get_validated_identity(
+        self,
+        validated_token: "_ValidatedToken",
+        channel_id: str,
+        required_endorsements: List[str] = None,
+    ) -> ClaimsIdentity:
+        # The checks of _validate_token that depend on the validation, without verifying the
+        # signature again.
+        if not self._is_allowed_issuer(validated_token.claims.get("iss", None)):
+            return None
+
+        self._validate_endorsements(
+            validated_token.endorsements, channel_id, required_endorsements
+        )
+
+        if validated_token.algorithm not in self.validation_parameters.algorithms:
+            raise Exception("Token signing algorithm not in allowed list")
+
+        return ClaimsIdentity(dict(validated_token.claims), True)
+
+    @staticmethod
+    def _validate_endorsements(
+        endorsements: List[str],
+        channel_id: str,
+        required_endorsements: List[str] = None,
+    ):
+        if not endorsements:
+            return
+
+        # Verify that channelId is included in endorsements
+        if not EndorsementsValidator.validate(channel_id, endorsements):
+            raise Exception("Could not validate endorsement key")
+
+        # Verify that additional endorsements are satisfied.
+        # If no additional endorsements are expected, the requirement is satisfied as well
+        for endorsement in required_endorsements or []:
+            if not EndorsementsValidator.validate(endorsement, endorsements):
+                raise Exception("Could not validate endorsement key")
+
 
 class _OpenIdMetadata:
     def __init__(self, url):
@@ -0,0 +1,123 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+from msrest import Configuration
+from msrest.universal_http.async_abc import AsyncHTTPSender as AsyncHttpDriver
+
+from .aiohttp_http_sender import AiohttpHTTPSender
+
+
+class ClientPool:
+    """
+    A bounded cache of API clients, so clients and their HTTP connections are reused across turns
+    instead of being created for every turn.
+
+    .. remarks::
+        Clients are evicted least recently used first once the pool holds more than `max_size`
+        clients, and `ttl_seconds` after they were created. Evicted clients aren't closed, since a
+        turn may still be using them.
+
+        Clients created by the pool's owner can send their requests through
+        :meth:`get_http_driver`, so every pooled client shares one set of HTTP connections. The
+        driver is an :class:`AiohttpHTTPSender` unless another one is set with `http_driver`.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl_seconds: float = 3600.0,
+        http_driver: AsyncHttpDriver = None,
+    ):
+        """
+        :param max_size: The number of clients kept.
+        :param ttl_seconds: The number of seconds a client is kept after it was created, or None
+            to keep it until it is evicted.
+        :param http_driver: The HTTP driver shared by the clients, or None for an
+            :class:`AiohttpHTTPSender`.
+        """
+        if max_size is None or max_size < 1:
+            raise ValueError("ClientPool: max_size must be at least 1.")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._clients: Dict[Hashable, Tuple[object, float]] = OrderedDict()
+        self._http_driver = http_driver
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> object:
+        """
+        Gets a pooled client.
+
+        :param key: The key the client was added with.
+        :return: The client, or None if there is none or it expired.
+        """
+        entry = self._clients.get(key)
+        if entry is None:
+            return None
+
+        client, created_at = entry
+        if (
+            self.ttl_seconds is not None
+            and monotonic() - created_at >= self.ttl_seconds
+        ):
+            del self._clients[key]
+            return None
+
+        self._clients.move_to_end(key)
+        return client
+
+    def set(self, key: Hashable, client: object):
+        """
+        Adds a client to the pool, replacing the client with the same key.
+
+        :param key: The key of the client, for example its service url, audience and app id.
+        :param client: The client.
+        """
+        self._clients[key] = (client, monotonic())
+        self._clients.move_to_end(key)
+        while len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+
+    async def get_or_create(
+        self, key: Hashable, create: Callable[[], Awaitable[object]]
+    ) -> object:
+        """
+        Gets a pooled client, or creates and adds one.
+
+        :param key: The key of the client.
+        :param create: Creates the client when the pool doesn't have it.
+        :return: The client.
+        """
+        client = self.get(key)
+        if client is None:
+            client = await create()
+            self.set(key, client)
+        return client
+
+    def get_http_driver(self, config: Configuration) -> AsyncHttpDriver:
+        """
+        Gets the HTTP driver shared by the clients of this pool.
+
+        :param config: The configuration the driver takes its connection settings from when it is
+            first created.
+        :return: The driver.
+        """
+        if self._http_driver is None:
+            self._http_driver = AiohttpHTTPSender(config)
+        return self._http_driver
+
+    def clear(self):
+        """
+        Removes every client from the pool.
+        """
+        self._clients.clear()
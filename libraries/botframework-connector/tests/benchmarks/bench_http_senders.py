@@ -0,0 +1,89 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares the aiohttp driver with the default requests driver for the async ConnectorClient,
+sending activities to a local server. The server shares the event loop with the client, so the
+numbers are mostly useful relative to each other.
+
+Run with: python tests/benchmarks/bench_http_senders.py
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from msrest.universal_http.async_requests import AsyncRequestsHTTPSender
+
+from botbuilder.schema import Activity, ActivityTypes
+from botframework.connector import (
+    AiohttpHTTPSender,
+    AsyncBfPipeline,
+    BotFrameworkConnectorConfiguration,
+)
+from botframework.connector.aio import ConnectorClient
+from botframework.connector.auth import MicrosoftAppCredentials
+
+
+async def handle_activity(request: web.Request) -> web.Response:
+    await request.read()
+    return web.json_response({"id": "reply_id"})
+
+
+async def send_activities(
+    client: ConnectorClient, count: int, concurrency: int
+) -> float:
+    activity = Activity(type=ActivityTypes.message, text="hello")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send():
+        async with semaphore:
+            await client.conversations.send_to_conversation("conversation", activity)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[send() for _ in range(count)])
+    return time.perf_counter() - start
+
+
+async def main():
+    app = web.Application()
+    app.router.add_post("/v3/conversations/{id}/activities", handle_activity)
+    server = TestServer(app)
+    await server.start_server()
+    base_url = str(server.make_url(""))
+    credentials = MicrosoftAppCredentials.empty()
+
+    drivers = {
+        "requests": AsyncRequestsHTTPSender,
+        "aiohttp": AiohttpHTTPSender,
+    }
+    for concurrency in (1, 10, 50):
+        print(f"concurrency={concurrency}")
+        for name, driver_type in drivers.items():
+            driver = driver_type(
+                BotFrameworkConnectorConfiguration(credentials, base_url)
+            )
+            client = ConnectorClient(
+                credentials,
+                base_url=base_url,
+                pipeline_type=AsyncBfPipeline,
+                driver=driver,
+            )
+            # Warm up connections.
+            await send_activities(client, 20, concurrency)
+
+            count = 1000
+            elapsed = await send_activities(client, count, concurrency)
+            print(
+                f"  {name:10s} {count / elapsed:8.0f} activities/s"
+                f"  {elapsed / count * 1e3:6.2f} ms/activity"
+            )
+            if isinstance(driver, AiohttpHTTPSender):
+                await driver.close()
+
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
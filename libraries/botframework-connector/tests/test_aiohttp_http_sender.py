@@ -0,0 +1,182 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+
+import aiounittest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from msrest.universal_http import ClientRequest
+
+from botbuilder.schema import Activity, ActivityTypes
+from botframework.connector import (
+    AiohttpHTTPSender,
+    AsyncBfPipeline,
+    BotFrameworkConnectorConfiguration,
+    ClientPool,
+)
+from botframework.connector.aio import ConnectorClient
+from botframework.connector.auth import MicrosoftAppCredentials
+from botframework.connector.models import ErrorResponseException
+
+
+class TokenCredentials(MicrosoftAppCredentials):
+    def get_access_token(self, force_refresh: bool = False) -> str:
+        return "token"
+
+
+class AiohttpHTTPSenderTests(aiounittest.AsyncTestCase):
+    async def start_server(self, handler) -> TestServer:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        server = TestServer(app)
+        await server.start_server()
+        return server
+
+    def create_client(self, server: TestServer) -> ConnectorClient:
+        base_url = str(server.make_url(""))
+        credentials = TokenCredentials("app_id", "password")
+        config = BotFrameworkConnectorConfiguration(credentials, base_url)
+        config.retry_policy.backoff_factor = 0
+        return ConnectorClient(
+            credentials,
+            base_url=base_url,
+            pipeline_type=AsyncBfPipeline,
+            driver=AiohttpHTTPSender(config),
+        )
+
+    async def test_send_to_conversation(self):
+        requests = []
+
+        async def handler(request: web.Request):
+            requests.append((request, await request.json()))
+            return web.json_response({"id": "reply_id"})
+
+        server = await self.start_server(handler)
+        client = self.create_client(server)
+        try:
+            response = await client.conversations.send_to_conversation(
+                "conversation_id",
+                Activity(type=ActivityTypes.message, text="hello"),
+            )
+        finally:
+            await client.config.driver.close()
+            await server.close()
+
+        assert response.id == "reply_id"
+        request, body = requests[0]
+        assert request.path == "/v3/conversations/conversation_id/activities"
+        assert request.headers["Authorization"] == "Bearer token"
+        assert body["text"] == "hello"
+
+    async def test_on_request_sent(self):
+        events = []
+
+        async def handler(request: web.Request):
+            events.append("received")
+            await request.read()
+            return web.json_response({"id": "reply_id"})
+
+        server = await self.start_server(handler)
+        client = self.create_client(server)
+        try:
+            await client.conversations.send_to_conversation(
+                "conversation_id",
+                Activity(type=ActivityTypes.message, text="hello"),
+                on_request_sent=lambda: events.append("sent"),
+            )
+        finally:
+            await client.config.driver.close()
+            await server.close()
+
+        assert events == ["sent", "received"]
+
+    async def test_retries_idempotent_requests(self):
+        calls = []
+
+        async def handler(request: web.Request):
+            calls.append(request.method)
+            if len(calls) < 3:
+                return web.Response(status=503)
+            return web.json_response([{"id": "member_id"}])
+
+        server = await self.start_server(handler)
+        client = self.create_client(server)
+        try:
+            members = await client.conversations.get_conversation_members(
+                "conversation_id"
+            )
+        finally:
+            await client.config.driver.close()
+            await server.close()
+
+        assert [member.id for member in members] == ["member_id"]
+        assert calls == ["GET", "GET", "GET"]
+
+    async def test_does_not_retry_posts(self):
+        calls = []
+
+        async def handler(request: web.Request):
+            calls.append(request.method)
+            return web.Response(status=503)
+
+        server = await self.start_server(handler)
+        client = self.create_client(server)
+        try:
+            with self.assertRaises(ErrorResponseException):
+                await client.conversations.send_to_conversation(
+                    "conversation_id",
+                    Activity(type=ActivityTypes.message, text="hello"),
+                )
+        finally:
+            await client.config.driver.close()
+            await server.close()
+
+        assert calls == ["POST"]
+
+    def test_closes_the_sessions_of_every_loop(self):
+        driver = AiohttpHTTPSender()
+
+        async def handler(request):  # pylint: disable=unused-argument
+            return web.Response(text="ok")
+
+        async def send():
+            server = await self.start_server(handler)
+            try:
+                response = await driver.send(
+                    ClientRequest("GET", str(server.make_url("/")))
+                )
+                assert response.status_code == 200
+            finally:
+                await server.close()
+            # pylint: disable=protected-access
+            return driver._sessions[asyncio.get_running_loop()]
+
+        def run(coroutine):
+            # Without asyncio.run, which unsets the event loop of the other tests.
+            loop = asyncio.new_event_loop()
+            try:
+                return loop.run_until_complete(coroutine)
+            finally:
+                loop.close()
+
+        first = run(send())
+        second = run(send())
+        assert first is not second
+        # closed with its loop, once a session of another loop was created
+        assert first.closed
+
+        run(driver.close())
+        assert second.closed
+        assert not driver._sessions  # pylint: disable=protected-access
+
+    async def test_client_pool_driver(self):
+        pool = ClientPool()
+        config = BotFrameworkConnectorConfiguration(
+            TokenCredentials("app_id", "password"), "https://service"
+        )
+
+        driver = pool.get_http_driver(config)
+
+        assert isinstance(driver, AiohttpHTTPSender)
+        assert pool.get_http_driver(config) is driver
@@ -0,0 +1,84 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from unittest.mock import patch
+
+import aiounittest
+from botframework.connector import ClientPool
+from botframework.connector.auth import (
+    AuthenticationConstants,
+    BotFrameworkAuthenticationFactory,
+    ClaimsIdentity,
+    PasswordServiceClientCredentialFactory,
+)
+
+
+class ClientPoolTests(aiounittest.AsyncTestCase):
+    async def test_get_or_create_reuses_clients(self):
+        pool = ClientPool()
+        created = []
+
+        async def create():
+            created.append(object())
+            return created[-1]
+
+        first = await pool.get_or_create("key", create)
+        second = await pool.get_or_create("key", create)
+
+        assert first is second
+        assert len(created) == 1
+        assert "key" in pool
+
+    async def test_evicts_least_recently_used(self):
+        pool = ClientPool(max_size=2)
+        pool.set("a", "client a")
+        pool.set("b", "client b")
+        pool.get("a")
+        pool.set("c", "client c")
+
+        assert len(pool) == 2
+        assert pool.get("a") == "client a"
+        assert pool.get("b") is None
+        assert pool.get("c") == "client c"
+
+    async def test_evicts_expired(self):
+        pool = ClientPool(ttl_seconds=10)
+        with patch("botframework.connector.client_pool.monotonic", return_value=100):
+            pool.set("a", "client a")
+        with patch("botframework.connector.client_pool.monotonic", return_value=109):
+            assert pool.get("a") == "client a"
+        with patch("botframework.connector.client_pool.monotonic", return_value=110):
+            assert pool.get("a") is None
+        assert not pool
+
+    async def test_connector_factory_reuses_clients(self):
+        auth = BotFrameworkAuthenticationFactory.create(
+            credential_factory=PasswordServiceClientCredentialFactory(
+                "app_id", "password"
+            )
+        )
+        identity = ClaimsIdentity(
+            {AuthenticationConstants.AUDIENCE_CLAIM: "app_id"}, True
+        )
+
+        first = await auth.create_connector_factory(identity).create(
+            "https://service.one"
+        )
+        second = await auth.create_connector_factory(identity).create(
+            "https://service.one"
+        )
+        other = await auth.create_connector_factory(identity).create(
+            "https://service.two"
+        )
+
+        assert first is second
+        assert other is not first
+        # Every pooled client sends through the same HTTP driver.
+        # pylint: disable=protected-access
+        assert (
+            first.config.pipeline._sender.driver is other.config.pipeline._sender.driver
+        )
+
+        first_token_client = await auth.create_user_token_client(identity)
+        second_token_client = await auth.create_user_token_client(identity)
+        assert first_token_client is second_token_client
@@ -0,0 +1,139 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import json
+import time
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import aiounittest
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from botframework.connector.auth import (
+    AuthenticationConstants,
+    JwtTokenExtractor,
+    VerifyOptions,
+)
+from botframework.connector.auth.jwt_token_extractor import (
+    _OpenIdMetadata,
+    _ValidatedToken,
+    _ValidatedTokenCache,
+)
+
+ISSUER = "https://api.botframework.com"
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def create_extractor(
+    metadata_url: str, issuer: str = ISSUER, clock_tolerance: int = 300
+) -> JwtTokenExtractor:
+    return JwtTokenExtractor(
+        VerifyOptions(
+            issuer=[issuer],
+            audience=None,
+            clock_tolerance=clock_tolerance,
+            ignore_expiration=False,
+        ),
+        metadata_url,
+        AuthenticationConstants.ALLOWED_SIGNING_ALGORITHMS,
+    )
+
+
+def create_token(**claims) -> str:
+    claims = {"iss": ISSUER, "aud": "bot", "exp": time.time() + 3600, **claims}
+    return jwt.encode(
+        {key: value for key, value in claims.items() if value is not None},
+        PRIVATE_KEY,
+        algorithm="RS256",
+        headers={"kid": "key"},
+    )
+
+
+class TestJwtTokenExtractor(aiounittest.AsyncTestCase):
+    def setUp(self):
+        # Metadata with the signing key, without requesting it.
+        self.metadata_url = f"https://login.botframework.com/{uuid.uuid4()}"
+        metadata = _OpenIdMetadata(self.metadata_url)
+        key = json.loads(RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key()))
+        metadata.keys = [dict(key, kid="key", endorsements=["msteams"])]
+        metadata.last_updated = datetime.now()
+        JwtTokenExtractor.metadataCache[self.metadata_url] = metadata
+
+        JwtTokenExtractor.validatedTokenCache.clear()
+
+    def tearDown(self):
+        del JwtTokenExtractor.metadataCache[self.metadata_url]
+        JwtTokenExtractor.validatedTokenCache.clear()
+
+    async def test_verifies_signature_once(self):
+        token = create_token()
+        identity = await create_extractor(self.metadata_url).get_identity(
+            "Bearer", token, "msteams"
+        )
+
+        with patch("jwt.decode") as decode:
+            cached_identity = await create_extractor(self.metadata_url).get_identity(
+                "Bearer", token, "msteams"
+            )
+            decode.assert_not_called()
+
+        self.assertTrue(cached_identity.is_authenticated)
+        self.assertEqual(identity.claims, cached_identity.claims)
+        self.assertIsNot(identity.claims, cached_identity.claims)
+
+    async def test_validates_cached_tokens(self):
+        token = create_token()
+        await create_extractor(self.metadata_url).get_identity(
+            "Bearer", token, "msteams"
+        )
+
+        self.assertIsNone(
+            await create_extractor(self.metadata_url, issuer="other").get_identity(
+                "Bearer", token, "msteams"
+            )
+        )
+        with self.assertRaisesRegex(Exception, "endorsement"):
+            await create_extractor(self.metadata_url).get_identity(
+                "Bearer", token, "webchat"
+            )
+        with self.assertRaisesRegex(Exception, "endorsement"):
+            await create_extractor(self.metadata_url).get_identity(
+                "Bearer", token, "msteams", ["other"]
+            )
+
+    async def test_respects_expiration(self):
+        # Expired, within the clock tolerance of the first extractor.
+        token = create_token(exp=time.time() - 60)
+        await create_extractor(self.metadata_url).get_identity(
+            "Bearer", token, "msteams"
+        )
+        self.assertEqual(1, len(JwtTokenExtractor.validatedTokenCache))
+
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            await create_extractor(self.metadata_url, clock_tolerance=0).get_identity(
+                "Bearer", token, "msteams"
+            )
+        self.assertEqual(0, len(JwtTokenExtractor.validatedTokenCache))
+
+        # Tokens that don't expire aren't cached.
+        await create_extractor(self.metadata_url).get_identity(
+            "Bearer", create_token(exp=None), "msteams"
+        )
+        self.assertEqual(0, len(JwtTokenExtractor.validatedTokenCache))
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = _ValidatedTokenCache(max_size=2)
+        tokens = [_ValidatedToken({"exp": 0}, "RS256", []) for _ in range(3)]
+
+        cache.add(b"a", tokens[0])
+        cache.add(b"b", tokens[1])
+        self.assertIs(tokens[0], cache.get(b"a"))
+        cache.add(b"c", tokens[2])
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(b"b"))
+        self.assertIs(tokens[0], cache.get(b"a"))
+        self.assertIs(tokens[2], cache.get(b"c"))